@@ -1,7 +1,7 @@
 from django.contrib import admin
 
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, Counsellor, DepressionScan, ClientInformation, Appointment, Client, Note
+from .models import CustomUser, Counsellor, DepressionScan, ClientInformation, Appointment, Client, Note, OutboxEmail, ProfileImage
 
 # 1. CustomUser Register kara (UserAdmin sobat jene karun password hashing disel)
 class CustomUserAdmin(UserAdmin):
@@ -20,4 +20,6 @@ admin.site.register(ClientInformation)
 admin.site.register(Appointment)
 admin.site.register(Client)
 admin.site.register(Note)
+admin.site.register(OutboxEmail)
+admin.site.register(ProfileImage)
 # Register your models here.
@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from .middleware import install_sql_recorder
+        from .sqlite import apply_sqlite_pragmas
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='api_sqlite_pragmas')
+        connection_created.connect(install_sql_recorder, dispatch_uid='api_sql_recorder')
+        from . import signals  # noqa: F401  (post_save/post_delete receivers)
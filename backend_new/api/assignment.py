@@ -0,0 +1,157 @@
+"""
+Least-loaded counsellor assignment.
+
+Counsellor.current_load is the load index: open appointments plus active
+assigned clients, kept up to date incrementally by api/counters.py (F()
+updates from signals, explicit deltas on bulk paths). Assignment never
+re-counts; `manage.py reconcile_counters` recomputes it if it drifts.
+
+A counsellor's score is (load + 1) / weight, where the weight comes from
+priority and doubles on a specialization match with the client's need;
+the lowest score wins.
+"""
+import heapq
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate
+from .counters import CLOSED_CLIENT_STATUSES, apply_deltas
+from .models import Client, ClientInformation, Counsellor
+
+PRIORITY_WEIGHTS = {'High': 1.5, 'Medium': 1.0, 'Low': 0.6}
+SPECIALIZATION_MATCH_WEIGHT = 2.0
+
+UNASSIGNED = 'On Hold'
+
+
+def _key(specialization):
+    return (specialization or '').strip().lower()
+
+
+class LoadIndex:
+    """
+    In-memory view of the active counsellors for one assignment pass.
+
+    One heap over everybody plus one heap per specialization (scores there
+    include the match bonus). Taking a counsellor bumps its load and pushes
+    fresh entries; stale heap entries are skipped lazily, so each pick is
+    O(log C).
+    """
+
+    def __init__(self, counsellors):
+        self.counsellors = {c.pk: c for c in counsellors}
+        self.load = {c.pk: c.current_load for c in counsellors}
+        self.version = dict.fromkeys(self.counsellors, 0)
+        self.general = []
+        self.by_specialization = {}
+        for counsellor in counsellors:
+            self._push(counsellor)
+
+    def _weight(self, counsellor, matched):
+        weight = PRIORITY_WEIGHTS.get(counsellor.priority, 1.0)
+        return weight * SPECIALIZATION_MATCH_WEIGHT if matched else weight
+
+    def _push(self, counsellor):
+        pk = counsellor.pk
+        load = self.load[pk] + 1
+        version = self.version[pk]
+        heapq.heappush(self.general, (load / self._weight(counsellor, False), pk, version))
+        heap = self.by_specialization.setdefault(_key(counsellor.specialization), [])
+        heapq.heappush(heap, (load / self._weight(counsellor, True), pk, version))
+
+    def _top(self, heap):
+        while heap and heap[0][2] != self.version[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def pick(self, need=None):
+        candidates = [self._top(self.general)]
+        if need:
+            candidates.append(self._top(self.by_specialization.get(_key(need), [])))
+        candidates = [entry for entry in candidates if entry]
+        if not candidates:
+            return None
+        _, pk, _ = min(candidates)
+        return self.counsellors[pk]
+
+    def take(self, counsellor):
+        self.load[counsellor.pk] += 1
+        self.version[counsellor.pk] += 1
+        self._push(counsellor)
+
+
+def active_counsellors():
+    return list(Counsellor.objects.filter(is_active=True).only('id', 'name', 'priority', 'specialization', 'current_load'))
+
+
+def client_needs(clients):
+    """
+    Specialization each client needs, from their latest depression
+    percentage (ClientInformation matched by email): DEPRESSION_SPECIALIST_THRESHOLD
+    and above -> 'Depression'.
+    """
+    threshold = getattr(settings, 'DEPRESSION_SPECIALIST_THRESHOLD', 50)
+    marks = dict(
+        ClientInformation.objects.filter(email__in=[c.email for c in clients]).values_list('email', 'marks')
+    )
+    needs = {}
+    for client in clients:
+        score = (marks.get(client.email) or {}).get('Depression')
+        needs[client.pk] = 'Depression' if score is not None and score >= threshold else None
+    return needs
+
+
+def assign_client(client, need=None):
+    """Assign one client (its save() moves the load index through the signals)."""
+    if need is None:
+        need = client_needs([client])[client.pk]
+    counsellor = LoadIndex(active_counsellors()).pick(need)
+    if counsellor is None:
+        return None
+    client.assigned_counsellor = counsellor
+    client.counsellor = counsellor.name
+    client.save(update_fields=['assigned_counsellor', 'counsellor', 'updated_at'])
+    return counsellor
+
+
+def waiting_clients():
+    return (
+        Client.objects.filter(assigned_counsellor__isnull=True, counsellor=UNASSIGNED)
+        .exclude(status__in=CLOSED_CLIENT_STATUSES)
+        .order_by('id')
+    )
+
+
+def assign_backlog(limit=None, batch_size=500):
+    """
+    Assign every waiting client in one pass: two reads, one in-memory
+    LoadIndex, bulk_update of the clients and one F() update per counsellor.
+    Returns {counsellor_id: clients assigned}.
+    """
+    with transaction.atomic():
+        clients = list(waiting_clients()[:limit] if limit is not None else waiting_clients())
+        index = LoadIndex(active_counsellors())
+        needs = client_needs(clients)
+        now = timezone.now()
+
+        assigned = []
+        for client in clients:
+            counsellor = index.pick(needs[client.pk])
+            if counsellor is None:
+                break
+            index.take(counsellor)
+            client.assigned_counsellor = counsellor
+            client.counsellor = counsellor.name
+            client.updated_at = now  # bulk_update auto_now लावत नाही
+            assigned.append(client)
+
+        Client.objects.bulk_update(assigned, ['assigned_counsellor', 'counsellor', 'updated_at'], batch_size=batch_size)
+        # bulk_update signals पाठवत नाही: load index स्वतः पुढे ढकला
+        per_counsellor = Counter(client.assigned_counsellor_id for client in assigned)
+        apply_deltas({('current_load', counsellor_id): count for counsellor_id, count in per_counsellor.items()})
+    if assigned:
+        invalidate('dashboard')
+    return dict(per_counsellor)
@@ -0,0 +1,287 @@
+"""
+Async (ASGI) variants of the high-traffic endpoints.
+
+DRF's APIView is sync-only, so these are plain Django async views that reuse
+the DRF serializers for validation/representation and the async ORM for
+queries. Validation that needs the DB (appointment slot checks) runs
+through sync_to_async. Run them under an ASGI server, e.g.
+
+    uvicorn backend_new.asgi:application --workers 2
+
+Under WSGI they still work, but each request gets its own event loop.
+"""
+import asyncio
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.http import JsonResponse
+from django.utils.dateparse import parse_date
+from django.views import View
+
+from .authentication import issue_token
+from .availability import SlotTaken
+from .models import CustomUser, ClientInformation, Appointment
+from .percentiles import load_table, percentile_rank
+from .serializers import (
+    UserSerializer,
+    BulkDepressionScanSerializer,
+    ClientInformationSerializer,
+    AppointmentSerializer,
+)
+from .views import save_scan
+
+# PBKDF2 hashing CPU-heavy आहे: event loop block होऊ नये म्हणून मर्यादित threads मध्ये
+_hash_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_HASH_WORKERS', 4),
+    thread_name_prefix='password-hash',
+)
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder, safe=False)
+
+
+def _is_id(value):
+    # user ids: "abc" sync views प्रमाणे 400, 500 नाही
+    try:
+        int(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _authenticate(request, username, password):
+    try:
+        return authenticate(request, username=username, password=password)
+    finally:
+        # executor thread request lifecycle बाहेर आहे: connection इथेच सोडा
+        close_old_connections()
+
+
+async def authenticate_async(request, username, password):
+    """
+    authenticate() (AUTHENTICATION_BACKENDS, dummy hash for unknown users,
+    user_login_failed) in the hashing pool, off the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, _authenticate, request, username, password)
+
+
+class AsyncAPIView(View):
+    """Base for the async views: JSON body parsing and CSRF exemption like DRF's APIView."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    def parse_json(self, request):
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+
+
+# -------------------------------
+# Keyset page for async list endpoints
+# -------------------------------
+def _encode_cursor(obj):
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(token):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(token.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+async def keyset_page(request, queryset, serializer_class, context=None):
+    """
+    (created_at, id) keyset page, newest first; ?cursor= comes from the
+    previous page's `next`.
+    """
+    page_size = settings.ASYNC_PAGE_SIZE
+    cursor = request.GET.get('cursor')
+    if cursor:
+        position = _decode_cursor(cursor)
+        if position is None:
+            return json_response({"cursor": "Invalid cursor."}, status=400)
+        created_at, pk = position
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+
+    rows = [obj async for obj in queryset.order_by('-created_at', '-id')[:page_size + 1]]
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_url = None
+    if has_more:
+        params = request.GET.copy()
+        params['cursor'] = _encode_cursor(rows[-1])
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+    return json_response({
+        "next": next_url,
+        "results": serializer_class(rows, many=True, context=context or {}).data,
+    })
+
+
+# -------------------------------
+# Async Login / Admin Login
+# -------------------------------
+def _login_payload(user):
+    # token DB मध्ये, आणि UserSerializer profile_photo (FK) वाचतो: event loop वर sync query नको
+    return issue_token(user), UserSerializer(user).data
+
+
+class AsyncLoginView(AsyncAPIView):
+    async def post(self, request):
+        data = self.parse_json(request) or {}
+        username = data.get("username")
+        password = data.get("password")
+
+        if not username or not password:
+            return json_response({"error": "Username and password are required"}, status=400)
+
+        user = await authenticate_async(request, username, password)
+        if user:
+            token, user_data = await sync_to_async(_login_payload)(user)
+            return json_response({
+                "message": "Login successful",
+                "token": token,
+                "user_id": user.id,
+                "user": user_data,
+                "first_time": not bool(user.preferred_language),
+            })
+        return json_response({"error": "Invalid credentials"}, status=401)
+
+
+class AsyncAdminLoginView(AsyncAPIView):
+    async def post(self, request):
+        data = self.parse_json(request) or {}
+        username, password = data.get("username"), data.get("password")
+        user = await authenticate_async(request, username, password) if username and password else None
+
+        if user and user.is_staff:
+            token, admin_data = await sync_to_async(_login_payload)(user)
+            return json_response({
+                "message": "Admin login successful",
+                "token": token,
+                "admin": admin_data,
+            })
+        return json_response({"error": "Invalid admin credentials"}, status=401)
+
+
+# -------------------------------
+# Async Depression Scan submit
+# -------------------------------
+class AsyncDepressionScanView(AsyncAPIView):
+    async def post(self, request):
+        data = self.parse_json(request)
+        if not isinstance(data, dict):
+            return json_response({"error": "Invalid JSON body"}, status=400)
+
+        # user आधीच async ORM ने आणला, म्हणजे validation मध्ये sync query होत नाही
+        users = {}
+        try:
+            user = await CustomUser.objects.filter(pk=int(data.get("user"))).afirst()
+            if user:
+                users[user.pk] = user
+        except (TypeError, ValueError):
+            pass
+
+        serializer = BulkDepressionScanSerializer(data=data, context={'users': users})
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status=400)
+
+        # async ORM मध्ये atomic() नाही: insert + marks update एका sync transaction मध्ये
+        scan, percentage, rank = await sync_to_async(self._save)(serializer)
+        return json_response({
+            "message": "Assessment saved successfully",
+            "total_score": scan.total_score,
+            "percentage": percentage,
+            "percentile_rank": rank,
+        }, status=201)
+
+    @staticmethod
+    def _save(serializer):
+        with transaction.atomic():
+            scan, percentage = save_scan(serializer)
+        return scan, percentage, percentile_rank('Depression', percentage)
+
+
+# -------------------------------
+# Async Client Information (read)
+# -------------------------------
+class AsyncClientInformationView(AsyncAPIView):
+    async def get(self, request):
+        user_id = request.GET.get("user_id")
+        if user_id and not _is_id(user_id):
+            return json_response({"user_id": "Must be an integer."}, status=400)
+        # serializer मध्ये sync query नको: percentile histogram आधीच आणा
+        context = {'percentiles': await sync_to_async(load_table)()}
+        if user_id:
+            info = await ClientInformation.objects.filter(user_id=user_id).order_by('id').afirst()
+            if not info:
+                return json_response({"message": "No data found for this user"}, status=404)
+            return json_response(ClientInformationSerializer(info, context=context).data)
+        return await keyset_page(request, ClientInformation.objects.all(), ClientInformationSerializer, context)
+
+
+# -------------------------------
+# Async Appointments (list + book)
+# -------------------------------
+class AsyncAppointmentView(AsyncAPIView):
+    async def get(self, request):
+        queryset = Appointment.objects.all()
+        client_id = request.GET.get('client_id') or request.GET.get('user')
+        if client_id and not _is_id(client_id):
+            return json_response({"client_id": "Must be an integer."}, status=400)
+        if client_id:
+            queryset = queryset.filter(client_id=client_id)
+        for param, lookup in (('date_from', 'date__gte'), ('date_to', 'date__lte')):
+            value = request.GET.get(param)
+            if value:
+                try:
+                    parsed = parse_date(value)
+                except ValueError:
+                    return json_response({param: "Not a valid date."}, status=400)
+                if parsed is None:
+                    return json_response({param: "Use YYYY-MM-DD format."}, status=400)
+                queryset = queryset.filter(**{lookup: parsed})
+        for param in ('status', 'mode'):
+            if request.GET.get(param):
+                queryset = queryset.filter(**{param: request.GET[param]})
+        return await keyset_page(request, queryset, AppointmentSerializer)
+
+    async def post(self, request):
+        data = self.parse_json(request)
+        if not isinstance(data, dict):
+            return json_response({"error": "Invalid JSON body"}, status=400)
+
+        serializer = AppointmentSerializer(data=data)
+        # counsellor lookup + slot check DB वापरतात
+        try:
+            valid = await sync_to_async(serializer.is_valid)()
+        except SlotTaken as exc:
+            return json_response({"detail": exc.detail}, status=exc.status_code)
+        if not valid:
+            return json_response(serializer.errors, status=400)
+        try:
+            appointment = await Appointment.objects.acreate(**serializer.validated_data)
+        except IntegrityError:
+            return json_response({"detail": SlotTaken.default_detail}, status=SlotTaken.status_code)
+        return json_response({
+            "message": "Appointment booked",
+            "appointment": AppointmentSerializer(appointment).data,
+        }, status=201)
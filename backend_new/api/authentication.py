@@ -0,0 +1,21 @@
+"""
+API token login.
+
+/api/login/ and /api/admin-login/ (and their async twins) hand out a DRF
+token; the frontend keeps it in localStorage `access_token` and sends it as
+`Authorization: Bearer <token>`. Endpoints that need to know the caller
+(notes) list BearerTokenAuthentication in their authentication_classes.
+"""
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+class BearerTokenAuthentication(TokenAuthentication):
+    # frontend "Token <key>" नाही तर "Bearer <key>" पाठवतो
+    keyword = 'Bearer'
+
+
+def issue_token(user):
+    """One token per user: a second login (other tab/device) gets the same key."""
+    token, _ = Token.objects.get_or_create(user=user)
+    return token.key
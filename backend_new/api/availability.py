@@ -0,0 +1,111 @@
+"""
+Counsellor availability.
+
+Every booking occupies one APPOINTMENT_SLOT_MINUTES slot starting at its
+`time`. New bookings with a counsellor must start on the slot grid, so two
+overlapping bookings would share (counsellor, date, time) — which the
+`appt_counsellor_slot_uniq` partial unique constraint rejects at the DB.
+Older rows may start off-grid (dashboard-entered times), so overlap checks
+and free-slot search go through an IntervalIndex rather than equality.
+"""
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Appointment
+
+# याशिवाय सगळे statuses slot अडवतात
+FREE_STATUSES = ('Cancelled',)
+
+
+class SlotTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This counsellor is already booked for that slot."
+    default_code = 'slot_taken'
+
+
+def slot_length():
+    return timedelta(minutes=settings.APPOINTMENT_SLOT_MINUTES)
+
+
+def slot_times():
+    return [time.fromisoformat(value) for value in settings.APPOINTMENT_SLOT_TIMES]
+
+
+def on_grid(start):
+    minutes = start.hour * 60 + start.minute
+    return start.second == 0 and start.microsecond == 0 and minutes % settings.APPOINTMENT_SLOT_MINUTES == 0
+
+
+class IntervalIndex:
+    """
+    Busy intervals merged and sorted by start, so "does [start, end) hit
+    anything?" is one bisect instead of a scan over every appointment.
+    """
+
+    def __init__(self, intervals):
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def overlaps(self, start, end):
+        # start पेक्षा आधी सुरू झालेला शेवटचा interval; merged असल्याने त्याच्या पुढचा end नंतरच सुरू होतो
+        i = bisect_right(self.starts, start) - 1
+        if i >= 0 and self.ends[i] > start:
+            return True
+        return i + 1 < len(self.starts) and self.starts[i + 1] < end
+
+
+def busy_appointments(counsellor_id, date_from, date_to):
+    return (
+        Appointment.objects
+        .filter(counsellor_id=counsellor_id, date__gte=date_from, date__lte=date_to)
+        .exclude(status__in=FREE_STATUSES)
+    )
+
+
+def build_index(rows):
+    length = slot_length()
+    return IntervalIndex(
+        (datetime.combine(day, start), datetime.combine(day, start) + length) for day, start in rows
+    )
+
+
+def free_slots(counsellor_id, date_from, date_to):
+    """{date: [time, ...]} of open grid slots, from a single appointments query."""
+    length = slot_length()
+    # आदल्या दिवशी उशिरा सुरू झालेली booking मध्यरात्रीनंतरही चालू असू शकते
+    rows = busy_appointments(counsellor_id, date_from - timedelta(days=1), date_to).values_list('date', 'time')
+    index = build_index(rows)
+
+    now = timezone.localtime().replace(tzinfo=None)
+    times = slot_times()
+    result = {}
+    day = date_from
+    while day <= date_to:
+        open_slots = []
+        for start_time in times:
+            start = datetime.combine(day, start_time)
+            if start > now and not index.overlaps(start, start + length):
+                open_slots.append(start_time)
+        result[day] = open_slots
+        day += timedelta(days=1)
+    return result
+
+
+def check_slot_free(counsellor_id, day, start_time, exclude_id=None):
+    """Serializer-side check (clear error message; the DB constraint closes the race)."""
+    start = datetime.combine(day, start_time)
+    rows = busy_appointments(counsellor_id, day - timedelta(days=1), day)
+    if exclude_id:
+        rows = rows.exclude(id=exclude_id)
+    return not build_index(rows.values_list('date', 'time')).overlaps(start, start + slot_length())
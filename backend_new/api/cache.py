@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import Counter
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+PREFIX = 'mindspace'
+
+
+# -------------------------------
+# Namespace versions
+# -------------------------------
+# Entries are never deleted one by one: each namespace has a version number
+# that is part of every key, and invalidation just bumps it. Old entries
+# then expire on their own. This works on locmem/file backends, which
+# can't list keys by prefix.
+def _version_key(namespace):
+    return f'{PREFIX}:ver:{namespace}'
+
+
+def namespace_version(namespace):
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # evict झाल्यावर 1 पासून सुरू केल्यास जुन्या entries परत valid होतील, म्हणून time_ns()
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(namespaces):
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.set(_version_key(namespace), time.time_ns(), None)
+
+
+def invalidate(*namespaces):
+    # commit नंतरच: आधी bump केला तर मधला GET जुना data नवीन version खाली cache करतो
+    transaction.on_commit(partial(_bump, namespaces))
+
+
+# -------------------------------
+# Hit / miss counters
+# -------------------------------
+# प्रत्येक GET ला cache write नको: process मध्ये मोजून दर RESPONSE_CACHE_STATS_FLUSH_EVERY lookups नी cache मध्ये
+_pending = Counter()
+_pending_lock = threading.Lock()
+
+
+def _count(name):
+    with _pending_lock:
+        _pending[name] += 1
+        due = sum(_pending.values()) >= getattr(settings, 'RESPONSE_CACHE_STATS_FLUSH_EVERY', 100)
+    if due:
+        flush_stats()
+
+
+def flush_stats():
+    with _pending_lock:
+        counts = dict(_pending)
+        _pending.clear()
+    for name, count in counts.items():
+        key = f'{PREFIX}:stats:{name}'
+        if not cache.add(key, count, None):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, None)
+
+
+def reset_stats():
+    with _pending_lock:
+        _pending.clear()
+    cache.delete_many([f'{PREFIX}:stats:hits', f'{PREFIX}:stats:misses'])
+
+
+def cache_stats():
+    # हा process चे अजून न लिहिलेले counts पण; इतर workers चे पुढच्या flush नंतर दिसतात
+    flush_stats()
+    hits = cache.get(f'{PREFIX}:stats:hits', 0)
+    misses = cache.get(f'{PREFIX}:stats:misses', 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+# -------------------------------
+# Read-through response cache
+# -------------------------------
+def response_cache_key(namespace, request):
+    query = '&'.join(
+        f'{name}={value}'
+        for name in sorted(request.query_params)
+        for value in request.query_params.getlist(name)
+    )
+    return f'{PREFIX}:resp:{namespace}:{namespace_version(namespace)}:{request.path}?{query}'
+
+
+def cache_response(namespace, timeout=None):
+    """
+    Cache a successful GET handler's `response.data` under `namespace`.
+
+    The key varies on the path and query string; signals.py bumps the
+    namespace when the underlying models change. ETag/Last-Modified set by
+    the handler are cached too, so a hit can answer If-None-Match with 304.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = response_cache_key(namespace, request)
+            cached = cache.get(key)
+            if cached is not None:
+                _count('hits')
+                headers = {name: value for name, value in cached['headers'].items() if value}
+                response = get_conditional_response(request, etag=headers.get('ETag'))
+                if response is None:
+                    response = Response(cached['data'])
+                for name, value in headers.items():
+                    response[name] = value
+                response['X-Cache'] = 'HIT'
+                return response
+
+            _count('misses')
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                entry = {
+                    'data': response.data,
+                    'headers': {name: response.get(name) for name in ('ETag', 'Last-Modified')},
+                }
+                cache.set(
+                    key, entry,
+                    timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT,
+                )
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
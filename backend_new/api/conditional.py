@@ -0,0 +1,71 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+# -------------------------------
+# ETag / Last-Modified for conditional GETs
+# -------------------------------
+def queryset_validators(queryset, request, salt=''):
+    """
+    (etag, last_modified) for `queryset` from one MAX(updated_at) + COUNT(*)
+    query. The full path goes into the ETag so every page and filter gets
+    its own validator; COUNT catches deletes, which don't move MAX.
+    `salt` covers response data that doesn't live in the queryset's rows.
+    """
+    stats = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'))
+    last_modified = stats['last']
+    raw = '|'.join([
+        request.get_full_path(),
+        last_modified.isoformat() if last_modified else '',
+        str(stats['count']),
+        salt,
+    ])
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest()), last_modified
+
+
+def conditional_get(request, queryset, render, check_last_modified=False, salt=''):
+    """
+    Answer If-None-Match (and, with `check_last_modified`, If-Modified-Since)
+    with a 304 before `render()` serializes anything.
+
+    If-Modified-Since is only safe for single objects: deleting a row from
+    a list doesn't change MAX(updated_at).
+    """
+    etag, last_modified = queryset_validators(queryset, request, salt)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp if check_last_modified else None,
+    )
+    if response is None:
+        response = render()
+        if response.status_code != 200:
+            return response
+
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+class ConditionalGetMixin:
+    """list/retrieve साठी ETag आणि 304 (router ViewSets)."""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_get(
+            request, queryset, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return conditional_get(
+            request, queryset, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+            check_last_modified=True,
+        )
@@ -0,0 +1,200 @@
+"""
+Maintained counters.
+
+Each tracked row "contributes" +1 to a set of counter keys depending on its
+state (an open appointment adds to its counsellor's current_load, a staff
+user to the 'counsellors' stat, ...). On every save/delete api/signals.py
+diffs the contributions of the old and new state and applies the difference
+with F() updates, inside the same transaction as the row write
+(CountedSaveMixin / the delete collector's atomic block).
+
+Keys:
+    ('stat', name)                 -> StatCounter row (dashboard numbers)
+    ('current_load', counsellor)   -> Counsellor.current_load (api/assignment.py)
+    ('total_sessions', counsellor) -> Counsellor.total_sessions (completed appointments)
+    ('score_rollup', cell)         -> ScoreRollup histogram cell (api/rollups.py)
+    ('score_histogram', cell)      -> ScoreHistogram cell (api/percentiles.py)
+
+Anything that skips signals (bulk_create, queryset.update) must call
+apply_deltas() itself; `manage.py reconcile_counters` recomputes everything.
+"""
+import copy
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .cache import invalidate
+from .models import Appointment, Client, ClientInformation, Counsellor, CustomUser, DepressionScan, StatCounter
+from .percentiles import bump_histogram, mark_cells, rebuild_histogram
+from .rollups import bump_cells, rollup_cells
+
+CLOSED_APPOINTMENT_STATUSES = ('Completed', 'Cancelled')
+CLOSED_CLIENT_STATUSES = ('Completed',)
+SESSION_STATUS = 'Completed'
+
+# model -> fields whose previous values decide what the row contributed
+TRACKED_FIELDS = {
+    CustomUser: ('is_staff',),
+    ClientInformation: ('marks',),
+    Appointment: ('counsellor_id', 'status'),
+    Client: ('assigned_counsellor_id', 'status'),
+    DepressionScan: ('user_id', 'total_score', 'created_at'),
+}
+
+DASHBOARD_STATS = ('counsellors', 'clients', 'appointments')
+
+
+def snapshot(instance):
+    # marks dict जागीच बदलला तरी जुनी state बदलू नये
+    return {field: copy.deepcopy(getattr(instance, field)) for field in TRACKED_FIELDS[type(instance)]}
+
+
+def contributions(model, state):
+    """Counter keys one row in `state` adds 1 to; `state` None means no row."""
+    keys = Counter()
+    if state is None:
+        return keys
+    if model is CustomUser:
+        if state['is_staff']:
+            keys['stat', 'counsellors'] += 1
+    elif model is ClientInformation:
+        keys['stat', 'clients'] += 1
+        for cell in mark_cells(state['marks']):
+            keys['score_histogram', cell] += 1
+    elif model is Appointment:
+        keys['stat', 'appointments'] += 1
+        counsellor_id, status = state['counsellor_id'], state['status']
+        if counsellor_id and status not in CLOSED_APPOINTMENT_STATUSES:
+            keys['current_load', counsellor_id] += 1
+        if counsellor_id and status == SESSION_STATUS:
+            keys['total_sessions', counsellor_id] += 1
+    elif model is Client:
+        if state['assigned_counsellor_id'] and state['status'] not in CLOSED_CLIENT_STATUSES:
+            keys['current_load', state['assigned_counsellor_id']] += 1
+    elif model is DepressionScan:
+        for cell in rollup_cells(state['user_id'], state['total_score'], state['created_at']):
+            keys['score_rollup', cell] += 1
+    return keys
+
+
+def diff(model, before, after):
+    deltas = defaultdict(int)
+    for key, count in contributions(model, after).items():
+        deltas[key] += count
+    for key, count in contributions(model, before).items():
+        deltas[key] -= count
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def apply_deltas(deltas):
+    """One UPDATE ... SET x = x + n per changed key (rollup/histogram cells: one upsert for all)."""
+    sessions_changed = False
+    cells, histogram = {}, {}
+    for (kind, target), delta in deltas.items():
+        if not delta:
+            continue
+        if kind == 'stat':
+            updated = StatCounter.objects.filter(name=target).update(value=F('value') + delta)
+            if not updated:
+                # पहिल्यांदाच: reconcile_counters अजून चालला नाही
+                StatCounter.objects.get_or_create(name=target, defaults={'value': max(delta, 0)})
+        elif kind == 'current_load':
+            Counsellor.objects.filter(pk=target).update(current_load=F('current_load') + delta)
+        elif kind == 'total_sessions':
+            # total_sessions counsellors list मध्ये दिसतो: ETag आणि cache दोन्ही बदलले पाहिजेत
+            Counsellor.objects.filter(pk=target).update(
+                total_sessions=F('total_sessions') + delta, updated_at=timezone.now(),
+            )
+            sessions_changed = True
+        elif kind == 'score_rollup':
+            cells[target] = delta
+        elif kind == 'score_histogram':
+            histogram[target] = delta
+    if cells:
+        bump_cells(cells)
+    if histogram:
+        bump_histogram(histogram)
+    if sessions_changed:
+        invalidate('counsellors')
+
+
+def created_deltas(objects):
+    """Deltas for rows inserted without signals (bulk_create), to pass to apply_deltas()."""
+    deltas = Counter()
+    for obj in objects:
+        deltas.update(contributions(type(obj), snapshot(obj)))
+    return deltas
+
+
+def set_mark_deltas(old_marks, assessment, value):
+    """
+    Deltas for a JSONSetKey marks update (queryset.update() skips signals):
+    every row in `old_marks` gets marks[assessment] = value.
+    """
+    deltas = Counter()
+    for marks in old_marks:
+        deltas.update(contributions(ClientInformation, {'marks': {**(marks or {}), assessment: value}}))
+        deltas.subtract(contributions(ClientInformation, {'marks': marks}))
+    return deltas
+
+
+def read_stats(names=DASHBOARD_STATS):
+    values = dict(StatCounter.objects.filter(name__in=names).values_list('name', 'value'))
+    return {name: values.get(name, 0) for name in names}
+
+
+# -------------------------------
+# Reconciliation
+# -------------------------------
+def _grouped(queryset, field):
+    return dict(queryset.values(field).annotate(n=Count('id')).values_list(field, 'n'))
+
+
+def reconcile_counters():
+    """
+    Recompute every maintained counter from the source tables. Returns
+    {counter: (old, new)} for the ones that had drifted.
+    """
+    drift = {}
+    with transaction.atomic():
+        stats = {
+            'counsellors': CustomUser.objects.filter(is_staff=True).count(),
+            'clients': ClientInformation.objects.count(),
+            'appointments': Appointment.objects.count(),
+        }
+        current = dict(StatCounter.objects.values_list('name', 'value'))
+        for name, value in stats.items():
+            if current.get(name) != value:
+                drift[f'stat:{name}'] = (current.get(name), value)
+                StatCounter.objects.update_or_create(name=name, defaults={'value': value})
+
+        loads = Counter(_grouped(
+            Client.objects.filter(assigned_counsellor__isnull=False).exclude(status__in=CLOSED_CLIENT_STATUSES),
+            'assigned_counsellor',
+        )) + Counter(_grouped(
+            Appointment.objects.filter(counsellor__isnull=False).exclude(status__in=CLOSED_APPOINTMENT_STATUSES),
+            'counsellor',
+        ))
+        sessions = _grouped(Appointment.objects.filter(counsellor__isnull=False, status=SESSION_STATUS), 'counsellor')
+
+        changed = []
+        now = timezone.now()
+        for counsellor in Counsellor.objects.only('id', 'current_load', 'total_sessions'):
+            load, total = loads.get(counsellor.pk, 0), sessions.get(counsellor.pk, 0)
+            if (counsellor.current_load, counsellor.total_sessions) != (load, total):
+                drift[f'counsellor:{counsellor.pk}'] = (
+                    (counsellor.current_load, counsellor.total_sessions), (load, total),
+                )
+                counsellor.current_load, counsellor.total_sessions = load, total
+                counsellor.updated_at = now
+                changed.append(counsellor)
+        Counsellor.objects.bulk_update(changed, ['current_load', 'total_sessions', 'updated_at'], batch_size=500)
+        for (assessment, value), counts in rebuild_histogram().items():
+            drift[f'histogram:{assessment}:{value}'] = counts
+    if changed:
+        invalidate('counsellors')
+    if drift:
+        invalidate('dashboard')
+    return drift
@@ -0,0 +1,75 @@
+import json
+
+from django.db import NotSupportedError, connection
+from django.db.models import F, Func, JSONField
+
+
+# -------------------------------
+# JSON key update in one UPDATE statement
+# -------------------------------
+class JSONSetKey(Func):
+    """
+    ClientInformation.objects.filter(...).update(marks=JSONSetKey('marks', 'Depression', 75))
+
+    Sets one top-level key of a JSONField inside the database, so the row is
+    updated in a single statement and concurrent writers can't lose each
+    other's keys the way a Python-side read/modify/save() can.
+
+    `value` may also be an expression (e.g. a Case over user_id), so rows
+    that need different values still take one UPDATE.
+    """
+    output_field = JSONField()
+
+    def __init__(self, field_name, key, value):
+        self.key = key
+        self.value = value
+        expressions = [F(field_name)]
+        if hasattr(value, 'resolve_expression'):
+            expressions.append(value)
+        super().__init__(*expressions)
+
+    def _compile(self, compiler):
+        field_sql, field_params = compiler.compile(self.source_expressions[0])
+        if len(self.source_expressions) > 1:
+            value_sql, value_params = compiler.compile(self.source_expressions[1])
+            return field_sql, field_params, value_sql, list(value_params)
+        return field_sql, field_params, None, [json.dumps(self.value)]
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f"JSONSetKey is not implemented for {connection.vendor}")
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        field_sql, field_params, value_sql, value_params = self._compile(compiler)
+        value_sql = value_sql or 'JSON(%s)'
+        sql = f"JSON_SET(COALESCE({field_sql}, '{{}}'), %s, {value_sql})"
+        return sql, [*field_params, f'$."{self.key}"', *value_params]
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        field_sql, field_params, value_sql, value_params = self._compile(compiler)
+        value_sql = f'TO_JSONB({value_sql})' if value_sql else '%s::jsonb'
+        sql = f"JSONB_SET(COALESCE({field_sql}, '{{}}'::jsonb), %s::text[], {value_sql})"
+        return sql, [*field_params, [self.key], *value_params]
+
+
+# -------------------------------
+# Counter upsert
+# -------------------------------
+def add_counts(model, key_columns, rows, conflict, batch_size=500):
+    """
+    rows: [(key values..., delta)]. Adds each delta to `count` of the row
+    with those keys, creating it if missing, with INSERT ... ON CONFLICT DO
+    UPDATE (SQLite 3.24+ and PostgreSQL share the syntax). `conflict` is
+    the conflict target, e.g. "(assessment, value)"; partial unique indexes
+    need their WHERE clause there too.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join([*key_columns, 'count'])
+    placeholder = '(' + ', '.join(['%s'] * (len(key_columns) + 1)) + ')'
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {', '.join([placeholder] * len(batch))} "
+                f"ON CONFLICT {conflict} DO UPDATE SET count = {table}.count + excluded.count",
+                [value for row in batch for value in row],
+            )
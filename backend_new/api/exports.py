@@ -0,0 +1,133 @@
+"""
+Streaming CSV / NDJSON exports of ClientInformation and DepressionScan.
+
+Rows come from values_list(...).iterator(chunk_size=EXPORT_CHUNK_SIZE), so
+neither model instances nor the full result set are ever held in memory,
+and the header line is sent before the query even runs. Output is
+flushed in chunks of rows rather than one yield per row. Timestamps are
+UTC ISO-8601 in both formats.
+"""
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import DateTimeField, JSONField
+from django.utils import timezone
+from rest_framework import renderers
+
+from .models import ClientInformation, DepressionScan
+
+# dataset -> (model, default columns)
+DATASETS = {
+    'clients': (ClientInformation, None),
+    'scans': (DepressionScan, ['id', 'user', 'q1', 'q2', 'q3', 'q4', 'total_score', 'created_at']),
+}
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+class PassthroughRenderer(renderers.BaseRenderer):
+    """Lets Accept: text/csv reach the view; the body is a StreamingHttpResponse anyway."""
+    media_type = '*/*'
+    format = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+def available_columns(model):
+    return [field.name for field in model._meta.concrete_fields]
+
+
+def select_columns(dataset, fields_param):
+    model, default = DATASETS[dataset]
+    allowed = available_columns(model)
+    if not fields_param:
+        return default or allowed
+    columns = [name.strip() for name in fields_param.split(',') if name.strip()]
+    unknown = [name for name in columns if name not in allowed]
+    if unknown or not columns:
+        raise ExportError(f"Unknown fields {unknown}; choose from {allowed}")
+    return columns
+
+
+def export_queryset(dataset, columns, date_from=None, date_to=None):
+    model, _ = DATASETS[dataset]
+    queryset = model.objects.order_by('created_at', 'pk')
+    zone = timezone.get_current_timezone()
+    # created_at__date नाही: column वर function लागला तर index वापरला जात नाही
+    if date_from:
+        queryset = queryset.filter(created_at__gte=datetime.combine(date_from, time.min, tzinfo=zone))
+    if date_to:
+        queryset = queryset.filter(created_at__lt=datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=zone))
+    return queryset.values_list(*columns)
+
+
+def utc_isoformat(value):
+    return value.astimezone(dt_timezone.utc).isoformat() if value else value
+
+
+def column_converters(model, columns, output):
+    """
+    Per-column conversion, decided once per export instead of per cell:
+    datetimes as UTC ISO-8601 (both formats, so CSV and NDJSON agree),
+    JSON fields as JSON text in CSV.
+    """
+    converters = []
+    for name in columns:
+        field = model._meta.get_field(name)
+        if isinstance(field, DateTimeField):
+            converters.append(utc_isoformat)
+        elif isinstance(field, JSONField) and output == 'csv':
+            converters.append(lambda value: json.dumps(value, ensure_ascii=False))
+        else:
+            converters.append(None)
+    return converters
+
+
+def stream_rows(queryset, columns, output, chunk_size=None):
+    """Generator of encoded chunks: header (CSV only) first, then rows in batches."""
+    chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if output == 'csv' else None
+    converted = [
+        (i, convert) for i, convert in enumerate(column_converters(queryset.model, columns, output)) if convert
+    ]
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data.encode('utf-8')
+
+    if writer:
+        writer.writerow(columns)
+        yield flush()
+
+    pending, first = 0, True
+    for row in queryset.iterator(chunk_size=chunk_size):
+        if converted:
+            row = list(row)
+            for i, convert in converted:
+                row[i] = convert(row[i])
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False))
+            buffer.write('\n')
+        pending += 1
+        # पहिली row लगेच: NDJSON ला header नाही, तरी client ला पहिला byte उशिरा मिळू नये
+        if first or pending >= chunk_size:
+            pending, first = 0, False
+            yield flush()
+    if pending:
+        yield flush()
@@ -0,0 +1,125 @@
+"""
+Profile image pipeline.
+
+Uploads are stored once per content hash (sha256) as a ProfileImage and the
+user points at it, so the same picture uploaded twice is one file on disk.
+Fixed-size square WebP thumbnails are built after the transaction commits on
+a small background thread pool, keeping Pillow off the request path;
+`manage.py build_thumbnails` finishes anything the pool didn't (restart,
+crash) and links images uploaded before this pipeline existed.
+"""
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import CustomUser, ProfileImage
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_FORMAT = 'WEBP'
+THUMBNAIL_QUALITY = 80
+
+_thumbnail_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'THUMBNAIL_WORKERS', 2),
+    thread_name_prefix='thumbnails',
+)
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def store_profile_image(upload):
+    """
+    Return the ProfileImage for `upload`, saving the bytes only if this
+    content hash hasn't been seen before.
+    """
+    sha256 = content_hash(upload)
+    existing = ProfileImage.objects.filter(sha256=sha256).first()
+    if existing:
+        return existing
+
+    ext = os.path.splitext(upload.name)[1].lower() or '.jpg'
+    photo = ProfileImage(sha256=sha256)
+    photo.image.save(f'{sha256}{ext}', upload, save=False)
+    try:
+        with transaction.atomic():
+            photo.save()
+    except IntegrityError:
+        # दुसऱ्या request ने हाच फोटो आत्ताच save केला: आपली copy काढून टाका
+        photo.image.delete(save=False)
+        return ProfileImage.objects.get(sha256=sha256)
+
+    transaction.on_commit(lambda: schedule_thumbnails(photo.pk))
+    return photo
+
+
+def schedule_thumbnails(photo_id):
+    _thumbnail_executor.submit(_build_in_background, photo_id)
+
+
+def _build_in_background(photo_id):
+    try:
+        photo = ProfileImage.objects.filter(pk=photo_id).first()
+        if photo and not photo.thumbnails:
+            build_thumbnails(photo)
+    except Exception:
+        logger.exception("Thumbnail generation failed for ProfileImage %s", photo_id)
+    finally:
+        # pool thread चे स्वतःचे DB connection असते
+        connection.close()
+
+
+def build_thumbnails(photo):
+    """Write one square thumbnail per settings.PROFILE_THUMBNAIL_SIZES and record their names."""
+    sizes = sorted(settings.PROFILE_THUMBNAIL_SIZES)
+    storage = photo.image.storage
+
+    with photo.image.open('rb') as source:
+        image = Image.open(source)
+        # JPEG थेट लहान scale वर decode होतो (पूर्ण resolution ची गरज नाही)
+        image.draft('RGB', (sizes[-1] * 2, sizes[-1] * 2))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.mode else 'RGB')
+
+    thumbnails = {}
+    for size in sizes:
+        thumb = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        buffer = BytesIO()
+        thumb.save(buffer, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=4)
+        name = f'profiles/thumbs/{photo.sha256}_{size}.webp'
+        if storage.exists(name):
+            storage.delete(name)
+        thumbnails[str(size)] = storage.save(name, ContentFile(buffer.getvalue()))
+
+    ProfileImage.objects.filter(pk=photo.pk).update(thumbnails=thumbnails)
+    # profile payload बदलला: ETag/Last-Modified साठी users चा updated_at पुढे ढकला
+    CustomUser.objects.filter(profile_photo=photo).update(updated_at=timezone.now())
+    photo.thumbnails = thumbnails
+    return thumbnails
+
+
+def thumbnail_urls(photo, request=None):
+    if photo is None or not photo.thumbnails:
+        return {}
+    storage = photo.image.storage
+    urls = {}
+    for size, name in photo.thumbnails.items():
+        url = storage.url(name)
+        urls[size] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,148 @@
+"""
+Bulk CSV import of ClientInformation.
+
+The CSV is read as a stream (csv.DictReader over the file, never the whole
+file in memory) and handled in batches of IMPORT_BATCH_SIZE rows. Per
+batch: one query for the users the rows point at, every row validated with
+the ClientInformationSerializer rules (one serializer instance per batch,
+so the fields are built once), then one transaction with bulk_create and
+the maintained counters (api/counters.py) for the rows that passed. A bad
+row never fails its batch; it ends up in the error report with its CSV
+line number.
+
+The columns are the model's, the same as /api/export/clients.csv, so an
+export can be imported back (id/created_at/updated_at are ignored).
+"""
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .cache import invalidate
+from .counters import apply_deltas, created_deltas
+from .models import ClientInformation, CustomUser
+from .serializers import BulkClientInformationSerializer
+
+# export JSON text म्हणून लिहितो; import ला list/dict हवे
+JSON_COLUMNS = ('stress_reason', 'marks')
+REPORT_COLUMNS = ['line', 'field', 'error']
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+def required_columns():
+    fields = BulkClientInformationSerializer().fields
+    return [name for name, field in fields.items() if field.required]
+
+
+def text_stream(upload):
+    """Binary file (upload / open(..., 'rb')) -> text, BOM stripped (Excel CSV)."""
+    return io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+
+
+def read_rows(stream):
+    """Yields (line number, row dict); line numbers count quoted newlines too."""
+    reader = csv.DictReader(stream)
+    missing = [name for name in required_columns() if name not in (reader.fieldnames or [])]
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(missing)}")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def prepare_row(row):
+    """CSV strings -> serializer input: blank optional cells dropped, JSON columns parsed."""
+    data = {}
+    for name, value in row.items():
+        if name is None:
+            raise ValidationError({'non_field_errors': ['More cells than columns']})
+        value = (value or '').strip()
+        if not value:
+            continue
+        if name in JSON_COLUMNS:
+            try:
+                value = json.loads(value)
+            except ValueError:
+                raise ValidationError({name: ['Not valid JSON']})
+        data[name] = value
+    return data
+
+
+def _batches(rows, size):
+    batch = []
+    for item in rows:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _prefetch_users(batch):
+    ids = {row['user'].strip() for _, row in batch if (row.get('user') or '').strip().isdigit()}
+    # instance ला फक्त user_id लागतो; पूर्ण user row (password hash वगैरे) नको
+    return CustomUser.objects.only('id').in_bulk([int(pk) for pk in ids])
+
+
+def error_entries(line, detail):
+    """ValidationError.detail -> flat [{line, field, error}] rows for the report."""
+    if not isinstance(detail, dict):
+        detail = {'non_field_errors': detail}
+    entries = []
+    for field, messages in detail.items():
+        if not isinstance(messages, list):
+            messages = [messages]
+        for message in messages:
+            # JSON/nested fields: message dict असू शकतो
+            text = message if isinstance(message, str) else json.dumps(message, ensure_ascii=False)
+            entries.append({'line': line, 'field': field, 'error': str(text)})
+    return entries
+
+
+def import_clients(stream, batch_size=None, dry_run=False, on_error=None):
+    """
+    Validate and insert every row of the CSV text stream. `on_error(entries)`
+    is called with the report rows of each rejected CSV row. Returns
+    {"rows", "valid", "failed", "created", "batches"}; with dry_run nothing
+    is written (created stays 0).
+    """
+    batch_size = batch_size or getattr(settings, 'IMPORT_BATCH_SIZE', 1000)
+    result = {"rows": 0, "valid": 0, "failed": 0, "created": 0, "batches": 0}
+
+    for batch in _batches(read_rows(stream), batch_size):
+        serializer = BulkClientInformationSerializer(context={'users': _prefetch_users(batch)})
+        instances = []
+        for line, row in batch:
+            try:
+                data = serializer.run_validation(prepare_row(row))
+            except ValidationError as e:
+                result["failed"] += 1
+                if on_error:
+                    on_error(error_entries(line, e.detail))
+                continue
+            instances.append(ClientInformation(**data))
+
+        if instances and not dry_run:
+            with transaction.atomic():
+                ClientInformation.objects.bulk_create(instances, batch_size=batch_size)
+                apply_deltas(created_deltas(instances))
+            result["created"] += len(instances)
+        result["rows"] += len(batch)
+        result["valid"] += len(instances)
+        result["batches"] += 1
+
+    if result["created"]:
+        invalidate('dashboard')
+    return result
+
+
+def write_report(entries, stream):
+    writer = csv.DictWriter(stream, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(entries)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.assignment import assign_backlog, waiting_clients
+from api.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Assign waiting ('On Hold') clients to the least-loaded active counsellors in one pass."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help="Assign at most this many clients.")
+        parser.add_argument('--rebuild-load', action='store_true',
+                            help="Run reconcile_counters first (recounts Counsellor.current_load).")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['rebuild_load']:
+            drift = reconcile_counters()
+            self.stdout.write(f"counters reconciled, {len(drift)} corrected")
+
+        per_counsellor = assign_backlog(limit=options['limit'], batch_size=options['batch_size'])
+        self.stdout.write(
+            f"assigned={sum(per_counsellor.values())} counsellors={len(per_counsellor)} "
+            f"still waiting={waiting_clients().count()}"
+        )
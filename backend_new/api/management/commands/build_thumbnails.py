@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.images import build_thumbnails, content_hash
+from api.models import CustomUser, ProfileImage
+
+
+class Command(BaseCommand):
+    help = "Build missing profile thumbnails and link pre-existing profile images to de-duplicated ProfileImages."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-backfill', action='store_true',
+                            help="Only build thumbnails; don't hash legacy CustomUser.profile_image files.")
+
+    def handle(self, *args, **options):
+        if not options['skip_backfill']:
+            self.backfill()
+
+        built = failed = 0
+        for photo in ProfileImage.objects.order_by('id').iterator():
+            if photo.thumbnails:
+                continue
+            try:
+                build_thumbnails(photo)
+                built += 1
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f"{photo.image.name}: {exc}")
+        self.stdout.write(f"thumbnails built={built} failed={failed}")
+
+    def backfill(self):
+        """Users whose profile_image predates ProfileImage: hash, de-duplicate, link."""
+        legacy = (CustomUser.objects.filter(profile_photo__isnull=True)
+                  .exclude(profile_image='').exclude(profile_image__isnull=True))
+        linked = 0
+        for name in legacy.values_list('profile_image', flat=True).distinct():
+            photo = self.photo_for(name)
+            if photo is None:
+                continue
+            with transaction.atomic():
+                # एकाच फाईलच्या सगळ्या copies एका canonical फाईलकडे
+                linked += legacy.filter(profile_image=name).update(
+                    profile_photo=photo, profile_image=photo.image.name, updated_at=timezone.now(),
+                )
+        self.stdout.write(f"legacy profile images linked={linked}")
+
+    def photo_for(self, name):
+        field = CustomUser._meta.get_field('profile_image')
+        if not field.storage.exists(name):
+            self.stderr.write(f"{name}: file missing, skipped")
+            return None
+        with field.storage.open(name, 'rb') as file:
+            sha256 = content_hash(file)
+        photo = ProfileImage.objects.filter(sha256=sha256).first()
+        if photo is None:
+            photo = ProfileImage(sha256=sha256, image=name)
+            photo.image.field.update_dimension_fields(photo, force=True)
+            photo.save()
+        return photo
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import ImportFileError, import_clients, text_stream, write_report
+
+
+class Command(BaseCommand):
+    help = "Import ClientInformation rows from a CSV file (same columns as /api/export/clients.csv)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV file, or - for stdin")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--errors', help="Write the row-level error report (CSV) here")
+        parser.add_argument('--dry-run', action='store_true', help="Validate only, insert nothing")
+
+    def handle(self, *args, **options):
+        errors = []
+        source = sys.stdin.buffer if options['path'] == '-' else open(options['path'], 'rb')
+        try:
+            with text_stream(source) as stream:
+                result = import_clients(
+                    stream, batch_size=options['batch_size'], dry_run=options['dry_run'], on_error=errors.extend,
+                )
+        except (ImportFileError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+
+        if options['errors']:
+            with open(options['errors'], 'w', newline='', encoding='utf-8') as report:
+                write_report(errors, report)
+        else:
+            for entry in errors[:20]:
+                self.stderr.write(f"line {entry['line']}: {entry['field']}: {entry['error']}")
+
+        verb = "Validated" if options['dry_run'] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['valid']} of {result['rows']} rows in {result['batches']} batches; "
+            f"{result['failed']} rejected"
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the notes full-text index (api_note_fts) from api_note."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--optimize', action='store_true', help="Merge the index b-trees after rebuilding.")
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError("Notes full-text index is only used on SQLite.")
+        indexed = rebuild_index(optimize=options['optimize'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} notes"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the maintained counters (dashboard stats, counsellor load, total_sessions, score histogram) from scratch."
+
+    def handle(self, *args, **options):
+        drift = reconcile_counters()
+        for name, (old, new) in sorted(drift.items()):
+            self.stdout.write(f"{name}: {old} -> {new}")
+        self.stdout.write(self.style.SUCCESS(f"{len(drift)} counters corrected"))
@@ -0,0 +1,262 @@
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.counters import reconcile_counters
+from api.rollups import rebuild_rollups
+from api.models import (
+    CustomUser,
+    Counsellor,
+    UserSetting,
+    DepressionScan,
+    ClientInformation,
+    Appointment,
+    Client,
+    Note,
+)
+
+SEED_PASSWORD = 'mindspace123'
+
+FIRST_NAMES = ['Aarav', 'Vihaan', 'Aditya', 'Sai', 'Arjun', 'Rohan', 'Ananya', 'Diya', 'Isha', 'Kavya',
+               'Meera', 'Priya', 'Sneha', 'Pooja', 'Rahul', 'Vaibhav', 'Neha', 'Siddharth', 'Tanvi', 'Omkar']
+LAST_NAMES = ['Patil', 'Deshmukh', 'Kulkarni', 'Joshi', 'Pawar', 'Shinde', 'Jadhav', 'More', 'Gaikwad',
+              'Bawaskar', 'Sharma', 'Iyer', 'Nair', 'Reddy', 'Gupta']
+DISTRICTS = [('Maharashtra', 'Pune'), ('Maharashtra', 'Mumbai'), ('Maharashtra', 'Nagpur'),
+             ('Maharashtra', 'Nashik'), ('Karnataka', 'Bengaluru'), ('Gujarat', 'Ahmedabad')]
+STRESS_REASONS = ['Work', 'Family', 'Finance', 'Health', 'Studies', 'Relationship']
+SPECIALIZATIONS = ['Depression', 'Anxiety', 'Family Therapy', 'CBT', 'Addiction', 'General']
+TAGS = ['General', 'Urgent', 'Follow-up', 'Session', 'Admin']
+# AppointmentPage.js मधले slots
+TIME_SLOTS = [time(10), time(11), time(12), time(14), time(17)]
+
+# बहुतेक उत्तरे कमी स्कोअरकडे झुकलेली (0 जास्त, 3 कमी)
+ANSWER_WEIGHTS = [0.45, 0.3, 0.17, 0.08]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    auto_now/auto_now_add तात्पुरते बंद करा, म्हणजे seed data ला भूतकाळातील
+    created_at देता येतात (bulk_create नाहीतर सगळ्यांना now() देतो).
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Generate production-sized fake data (users, counsellors, scans, client info, appointments, notes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--counsellors', type=int, default=25)
+        parser.add_argument('--scans-per-user', type=float, default=4.0, help="Mean scans per user (Poisson-ish).")
+        parser.add_argument('--appointments', type=int, default=5000)
+        parser.add_argument('--notes', type=int, default=5000)
+        parser.add_argument('--days', type=int, default=365, help="History window for created_at.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if CustomUser.objects.filter(username__startswith='seed_').exists():
+            raise CommandError("Seed data already present (users named seed_*). Use a fresh database.")
+
+        self.rng = random.Random(options['seed'])
+        self.batch = options['batch_size']
+        self.now = timezone.now()
+        self.window = timedelta(days=options['days'])
+        # प्रत्येक user साठी hashing 0.5s घेईल; एकच hash सगळ्यांना
+        self.password = make_password(SEED_PASSWORD)
+
+        models = (CustomUser, Counsellor, DepressionScan, ClientInformation, Appointment, Client, Note)
+        with transaction.atomic(), explicit_timestamps(*models):
+            counsellors = self.seed_counsellors(options['counsellors'])
+            users = self.seed_users(options['users'])
+            scans = self.seed_scans(users, options['scans_per_user'])
+            self.seed_client_info(users, scans)
+            self.seed_clients(users, counsellors)
+            self.seed_appointments(users, counsellors, options['appointments'])
+            self.seed_notes(counsellors, options['notes'])
+            # bulk_create signals पाठवत नाही: counters, load index आणि score rollups एकदाच मोजा
+            reconcile_counters()
+            rebuild_rollups()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users, {len(counsellors)} counsellors, {len(scans)} scans, "
+            f"{options['appointments']} appointments, {options['notes']} notes "
+            f"(password for every seeded account: {SEED_PASSWORD})"
+        ))
+
+    # -------------------------------
+    # helpers
+    # -------------------------------
+    def past(self, after=None):
+        start = after or (self.now - self.window)
+        span = max((self.now - start).total_seconds(), 1)
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    def name(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    # -------------------------------
+    # tables
+    # -------------------------------
+    def seed_counsellors(self, count):
+        accounts = []
+        for i in range(count):
+            first, last = self.name()
+            joined = self.past()
+            accounts.append(CustomUser(
+                username=f'seed_counsellor{i}', email=f'seed_counsellor{i}@mindspace.test',
+                first_name=first, last_name=last, password=self.password, is_staff=True,
+                date_joined=joined, updated_at=joined,
+            ))
+        CustomUser.objects.bulk_create(accounts, batch_size=self.batch)
+        accounts = list(CustomUser.objects.filter(username__startswith='seed_counsellor').order_by('id'))
+
+        counsellors = []
+        for i, account in enumerate(accounts):
+            counsellors.append(Counsellor(
+                user=account, counsellor_id=f'CNSL-S{i:04d}',
+                name=f'Dr. {account.first_name} {account.last_name}', email=account.email,
+                specialization=self.rng.choice(SPECIALIZATIONS),
+                priority=self.rng.choices(['High', 'Medium', 'Low'], [0.2, 0.6, 0.2])[0],
+                is_active=self.rng.random() < 0.9,
+                created_at=account.date_joined, updated_at=account.date_joined,
+            ))
+        Counsellor.objects.bulk_create(counsellors, batch_size=self.batch)
+        counsellors = list(Counsellor.objects.filter(counsellor_id__startswith='CNSL-S').order_by('id'))
+        UserSetting.objects.bulk_create([UserSetting(counsellor=c) for c in counsellors], batch_size=self.batch)
+        return counsellors
+
+    def seed_users(self, count):
+        users = []
+        for i in range(count):
+            first, last = self.name()
+            joined = self.past()
+            users.append(CustomUser(
+                username=f'seed_user{i}', email=f'seed_user{i}@mindspace.test',
+                first_name=first, last_name=last, password=self.password,
+                country='India', preferred_language=self.rng.choice(['en', 'mr', 'hi', None]),
+                date_joined=joined, updated_at=joined,
+            ))
+        CustomUser.objects.bulk_create(users, batch_size=self.batch)
+        return list(CustomUser.objects.filter(username__startswith='seed_user').order_by('id'))
+
+    def seed_scans(self, users, mean_per_user):
+        scans = []
+        for user in users:
+            # काही users नी एकही scan केला नाही, काहींनी बरेच
+            count = min(int(self.rng.expovariate(1 / mean_per_user)), int(mean_per_user * 6)) if mean_per_user else 0
+            taken_at = sorted(self.past(user.date_joined) for _ in range(count))
+            for created in taken_at:
+                answers = self.rng.choices(range(4), ANSWER_WEIGHTS, k=4)
+                scans.append(DepressionScan(
+                    user=user, q1=answers[0], q2=answers[1], q3=answers[2], q4=answers[3],
+                    total_score=sum(answers), created_at=created,
+                ))
+        DepressionScan.objects.bulk_create(scans, batch_size=self.batch)
+        return scans
+
+    def seed_client_info(self, users, scans):
+        latest = {}
+        for scan in scans:
+            latest[scan.user_id] = scan  # scans per user chronological आहेत
+
+        infos = []
+        for user in users:
+            # ~80% users नी client form भरलेला असतो
+            if user.id not in latest and self.rng.random() > 0.8:
+                continue
+            state, district = self.rng.choice(DISTRICTS)
+            age = self.rng.randint(16, 70)
+            scan = latest.get(user.id)
+            created = self.past(user.date_joined)
+            infos.append(ClientInformation(
+                user=user, first_name=user.first_name, last_name=user.last_name, age=age,
+                dob=date(self.now.year - age, self.rng.randint(1, 12), self.rng.randint(1, 28)),
+                email=user.email, mobile=f'9{self.rng.randint(100000000, 999999999)}',
+                marital_status=self.rng.choice(['Single', 'Married', 'Divorced']),
+                address=f'{self.rng.randint(1, 500)}, MG Road', pin_code=f'{self.rng.randint(400001, 499999)}',
+                state=state, district=district, job=self.rng.choice(['Engineer', 'Student', 'Teacher', None]),
+                stress_reason=self.rng.sample(STRESS_REASONS, self.rng.randint(0, 3)),
+                marks={'Depression': DepressionScan.score_percentage(scan.total_score)} if scan else {},
+                created_at=created, updated_at=scan.created_at if scan else created,
+            ))
+        ClientInformation.objects.bulk_create(infos, batch_size=self.batch)
+
+    def seed_clients(self, users, counsellors):
+        clients = []
+        for user in users:
+            if self.rng.random() > 0.6:
+                continue
+            counsellor = self.rng.choice(counsellors).name if counsellors and self.rng.random() < 0.7 else 'On Hold'
+            clients.append(Client(
+                name=f'{user.first_name} {user.last_name}', email=user.email, counsellor=counsellor,
+                status=self.rng.choices(['Confirmed', 'Pending', 'Completed'], [0.4, 0.35, 0.25])[0],
+                updated_at=self.past(user.date_joined),
+            ))
+        Client.objects.bulk_create(clients, batch_size=self.batch)
+
+    def seed_appointments(self, users, counsellors, count):
+        if not users:
+            return
+        today = timezone.localdate()
+        appointments = []
+        booked = set()
+        for _ in range(count):
+            user = self.rng.choice(users)
+            created = self.past(user.date_joined)
+            day = created.date() + timedelta(days=self.rng.randint(0, 21))
+            status = 'Completed' if day < today and self.rng.random() < 0.8 else self.rng.choice(['Pending', 'Confirmed'])
+            slot = self.rng.choice(TIME_SLOTS)
+            counsellor = self.rng.choice(counsellors) if counsellors else None
+            # appt_counsellor_slot_uniq: एका counsellor चा एक slot एकदाच
+            if counsellor and (counsellor.id, day, slot) in booked:
+                counsellor = None
+            elif counsellor:
+                booked.add((counsellor.id, day, slot))
+            appointments.append(Appointment(
+                client_id=str(user.id), counsellor=counsellor, name=f'{user.first_name} {user.last_name}',
+                appointment_spec=self.rng.choice(['Consultation', 'Follow-up', 'Anxiety', 'Sleep issues']),
+                date=day, time=slot,
+                mode=self.rng.choices(['Audio', 'Video', 'In-person'], [0.5, 0.35, 0.15])[0],
+                status=status,
+                set_by=counsellor.name if counsellor else 'Counselor',
+                created_at=created, updated_at=created,
+            ))
+        Appointment.objects.bulk_create(appointments, batch_size=self.batch)
+
+    def seed_notes(self, counsellors, count):
+        if not counsellors:
+            return
+        notes = []
+        for i in range(count):
+            counsellor = self.rng.choice(counsellors)
+            created = self.past(counsellor.created_at)
+            notes.append(Note(
+                user_id=counsellor.user_id, title=f'Session note {i}',
+                content=self.rng.choice([
+                    'Client reported better sleep this week.',
+                    'Discussed coping strategies for work stress.',
+                    'Follow up on medication adherence.',
+                    'Family session planned for next week.',
+                ]),
+                tag=self.rng.choices(TAGS, [0.4, 0.1, 0.25, 0.2, 0.05])[0],
+                created_at=created, updated_at=created,
+            ))
+        Note.objects.bulk_create(notes, batch_size=self.batch)
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails (password reset etc.) over one SMTP connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting when the outbox is empty.")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds to sleep between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_pending(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            if sent or failed:
+                self.stdout.write(f"sent={sent} failed={failed}")
+
+            # batch पूर्ण भरली असेल तर अजून मेल्स बाकी असू शकतात, लगेच पुढची batch
+            if sent + failed >= options['batch_size']:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,135 @@
+"""
+MEDIA_URL serving that works with DEBUG off.
+
+Files are streamed in chunks (FileResponse -> wsgi.file_wrapper/sendfile
+for whole files), single byte ranges get 206 responses, ETag/Last-Modified
+come from the file's stat, and content-hashed names (api/images.py stores
+profile images as <sha256>.<ext>) are cached for a year as immutable.
+
+With MEDIA_ACCEL = 'nginx' or 'sendfile' the view only checks the path and
+headers and lets the front proxy send the bytes (X-Accel-Redirect /
+X-Sendfile); ranges are then the proxy's job.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# <sha256>.png, thumbs/<sha256>_64.webp
+_HASHED_NAME = re.compile(r'(^|/)[0-9a-f]{64}(_\d+)?\.\w+$')
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def cache_control_for(path):
+    if _HASHED_NAME.search(path):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}"
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to send the
+    whole file (no/multi/garbled range), or False if unsatisfiable.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        # "bytes=-500": शेवटचे 500 bytes; रिकाम्या फाईलचे शेवटचे bytes नसतात (RFC 9110: 416)
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _range_iterator(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404("File not found")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found")
+
+    size = stat.st_size
+    etag = f'"{size:x}-{stat.st_mtime_ns:x}"'
+    last_modified = int(stat.st_mtime)
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    def finish(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = cache_control_for(path)
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return finish(not_modified)
+
+    accel = getattr(settings, 'MEDIA_ACCEL', None)
+    if accel:
+        response = HttpResponse(content_type=content_type)
+        if accel == 'nginx':
+            prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + path.lstrip('/')
+        else:
+            response['X-Sendfile'] = full_path
+        return finish(response)
+
+    byte_range = parse_range(request.headers.get('Range'), size)
+    if_range = request.headers.get('If-Range')
+    if byte_range and if_range and if_range != etag and parse_http_date_safe(if_range) != last_modified:
+        # If-Range जुन्या version चा आहे: पूर्ण फाईल पाठवा
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return finish(response)
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+        response['Content-Length'] = str(size)
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _range_iterator(full_path, start, end - start + 1), status=206, content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        response.block_size = CHUNK_SIZE
+    response['Accept-Ranges'] = 'bytes'
+    return finish(response)
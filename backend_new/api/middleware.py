@@ -0,0 +1,167 @@
+"""
+Per-request SQL / timing instrumentation.
+
+RequestMetricsMiddleware records the number of SQL queries, DB time,
+response render (JSON serialization) time and total time of a request. A
+fraction of requests (REQUEST_METRICS_SAMPLE_RATE) get the numbers as a
+`Server-Timing` header, and only those keep the per-statement breakdown.
+Any request slower than SLOW_REQUEST_MS is logged to the `api.requests`
+logger as one JSON record. Whether a request is slow is only known at the
+end, so while SLOW_REQUEST_MS is set every request keeps the query count and
+DB time (two additions per query). The most repeated SQL statements (N+1
+loops show up there) are only in the records of sampled requests.
+
+SQL is captured by an execute_wrapper installed on every connection
+(connection_created). It reads the active request from a contextvar, so it
+also sees queries run through sync_to_async in the async views, and costs a
+single contextvar lookup when nothing is being recorded.
+"""
+import json
+import logging
+import random
+import re
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger('api.requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+# "IN (%s, %s, %s)" वेगवेगळ्या लांबीचे असले तरी एकच statement म्हणून मोजा
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+class RequestMetrics:
+    __slots__ = ('sampled', 'queries', 'db_time', 'statements', 'statement_time',
+                 'render_started', 'render_time')
+
+    def __init__(self, sampled=True):
+        self.sampled = sampled
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.statement_time = defaultdict(float)
+        self.render_started = None
+        self.render_time = 0.0
+
+    def add_query(self, sql, elapsed):
+        self.queries += 1
+        self.db_time += elapsed
+        if self.sampled:
+            sql = _IN_LIST.sub('(%s, ...)', sql)
+            self.statements[sql] += 1
+            self.statement_time[sql] += elapsed
+
+    def top_statements(self, limit):
+        return [
+            {'sql': sql, 'count': count, 'ms': round(self.statement_time[sql] * 1000, 2)}
+            for sql, count in self.statements.most_common(limit) if count > 1
+        ]
+
+
+def record_sql(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, perf_counter() - started)
+
+
+def install_sql_recorder(sender, connection, **kwargs):
+    """connection_created handler; wrappers survive reconnects, so add once."""
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = perf_counter()
+        metrics = self._start()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, started, metrics)
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        metrics = self._start()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, started, metrics)
+
+    def process_template_response(self, request, response):
+        # DRF Response इथे render होण्याआधी येतो: render (JSON encode) वेळ वेगळा मोजा
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.render_started = perf_counter()
+            response.add_post_render_callback(lambda rendered: self._rendered(metrics))
+        return response
+
+    @staticmethod
+    def _rendered(metrics):
+        metrics.render_time = perf_counter() - metrics.render_started
+
+    @staticmethod
+    def _start():
+        rate = getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 0)
+        sampled = rate >= 1 or (rate > 0 and random.random() < rate)
+        # request slow आहे का ते शेवटीच कळते: slow log चालू असेल तर प्रत्येक request चे totals
+        # (statements फक्त sampled requests चे, RequestMetrics.add_query)
+        if sampled or getattr(settings, 'SLOW_REQUEST_MS', None) is not None:
+            return RequestMetrics(sampled)
+        return None
+
+    def _finish(self, request, response, started, metrics):
+        if metrics is None:
+            return response
+        total = perf_counter() - started
+        if metrics.sampled:
+            app = max(total - metrics.db_time - metrics.render_time, 0)
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+                f'render;dur={metrics.render_time * 1000:.1f}',
+                f'app;dur={app * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ])
+        slow_ms = getattr(settings, 'SLOW_REQUEST_MS', None)
+        if slow_ms is not None and total * 1000 >= slow_ms:
+            self._log_slow(request, response, total, metrics)
+        return response
+
+    @staticmethod
+    def _log_slow(request, response, total, metrics):
+        record = {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 1),
+            'render_ms': round(metrics.render_time * 1000, 1),
+        }
+        if metrics.sampled:
+            record['top_sql'] = metrics.top_statements(getattr(settings, 'SLOW_REQUEST_TOP_SQL', 5))
+        logger.warning(json.dumps(record))
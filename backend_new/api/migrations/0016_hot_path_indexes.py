@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_appointment_filter_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['created_at'], name='appt_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['date', 'time'], name='appt_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientinformation',
+            index=models.Index(fields=['user', 'created_at'], name='clientinfo_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientinformation',
+            index=models.Index(fields=['created_at'], name='clientinfo_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['email'], name='user_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depressionscan',
+            index=models.Index(fields=['user', 'created_at'], name='scan_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='depressionscan',
+            index=models.Index(fields=['created_at'], name='scan_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['created_at'], name='note_created_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_profile_images'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='counsellor',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='appointments', to='api.counsellor'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(condition=models.Q(('counsellor__isnull', False), models.Q(('status', 'Cancelled'), _negated=True)), fields=('counsellor', 'date', 'time'), name='appt_counsellor_slot_uniq'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_appointment_counsellor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='assigned_counsellor',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='clients', to='api.counsellor'),
+        ),
+        migrations.AddField(
+            model_name='counsellor',
+            name='current_load',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:22
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    # सध्याच्या data वरून सुरुवातीचे counters; नंतर signals incrementally सांभाळतात
+    StatCounter = apps.get_model('api', 'StatCounter')
+    Counsellor = apps.get_model('api', 'Counsellor')
+    Appointment = apps.get_model('api', 'Appointment')
+    StatCounter.objects.bulk_create([
+        StatCounter(name='counsellors', value=apps.get_model('api', 'CustomUser').objects.filter(is_staff=True).count()),
+        StatCounter(name='clients', value=apps.get_model('api', 'ClientInformation').objects.count()),
+        StatCounter(name='appointments', value=Appointment.objects.count()),
+    ])
+    sessions = (Appointment.objects.filter(counsellor__isnull=False, status='Completed')
+                .values('counsellor').annotate(n=Count('id')).values_list('counsellor', 'n'))
+    for counsellor_id, total in sessions:
+        Counsellor.objects.filter(pk=counsellor_id).update(total_sessions=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_counsellor_load'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# External-content FTS5 table over api_note + triggers that keep it in sync
+# (triggers, not signals, so bulk_create/update() are covered too).
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS api_note_fts USING fts5(
+        title, content, tag,
+        content='api_note', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_note_fts_ai AFTER INSERT ON api_note BEGIN
+        INSERT INTO api_note_fts(rowid, title, content, tag)
+        VALUES (new.id, new.title, new.content, new.tag);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_note_fts_ad AFTER DELETE ON api_note BEGIN
+        INSERT INTO api_note_fts(api_note_fts, rowid, title, content, tag)
+        VALUES ('delete', old.id, old.title, old.content, old.tag);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS api_note_fts_au AFTER UPDATE OF title, content, tag ON api_note BEGIN
+        INSERT INTO api_note_fts(api_note_fts, rowid, title, content, tag)
+        VALUES ('delete', old.id, old.title, old.content, old.tag);
+        INSERT INTO api_note_fts(rowid, title, content, tag)
+        VALUES (new.id, new.title, new.content, new.tag);
+    END
+    """,
+    "INSERT INTO api_note_fts(api_note_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS api_note_fts_ai",
+    "DROP TRIGGER IF EXISTS api_note_fts_ad",
+    "DROP TRIGGER IF EXISTS api_note_fts_au",
+    "DROP TABLE IF EXISTS api_note_fts",
+]
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        # FTS5 फक्त SQLite वर; बाकी DBs वर api/search.py icontains fallback वापरतो
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_stat_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE_SQL), run(DROP_SQL)),
+    ]
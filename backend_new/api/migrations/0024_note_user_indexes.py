@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_note_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='note_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', 'tag', '-created_at', '-id'], name='note_user_tag_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth, TruncWeek
+
+# DepressionScan.MAX_SCORE (historical model ला class attributes नसतात)
+MAX_SCORE = 12
+
+
+def fill_rollups(apps, schema_editor):
+    # जुन्या scans वरून सुरुवातीचे cells; नंतर signals incrementally सांभाळतात (backfill_score_rollups सारखेच)
+    DepressionScan = apps.get_model('api', 'DepressionScan')
+    ScoreRollup = apps.get_model('api', 'ScoreRollup')
+    for period, trunc in (('week', TruncWeek), ('month', TruncMonth)):
+        for fields in (['bucket', 'total_score', 'user'], ['bucket', 'total_score']):
+            # range बाहेरचे जुने scores वगळा (api/rollups.py प्रमाणे); score PositiveSmallIntegerField आहे
+            rows = (DepressionScan.objects.order_by()
+                    .filter(total_score__gte=0, total_score__lte=MAX_SCORE)
+                    .annotate(bucket=trunc('created_at'))
+                    .values(*fields).annotate(n=Count('id')))
+            ScoreRollup.objects.bulk_create([
+                ScoreRollup(period=period, bucket_start=row['bucket'].date(), user_id=row.get('user'),
+                            score=row['total_score'], count=row['n'])
+                for row in rows
+            ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_note_user_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('bucket_start', models.DateField()),
+                ('score', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='score_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('period', 'user', 'bucket_start', 'score'), name='rollup_user_cell_uniq'), models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('period', 'bucket_start', 'score'), name='rollup_population_cell_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
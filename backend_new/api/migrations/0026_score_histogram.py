@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:42
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def fill_histogram(apps, schema_editor):
+    # सध्याच्या marks वरून; नंतर signals आणि scan endpoints incrementally सांभाळतात (api/percentiles.py)
+    ClientInformation = apps.get_model('api', 'ClientInformation')
+    ScoreHistogram = apps.get_model('api', 'ScoreHistogram')
+    counts = Counter()
+    for marks in ClientInformation.objects.values_list('marks', flat=True).iterator(chunk_size=2000):
+        for assessment, value in (marks or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                counts[assessment, round(value)] += 1
+    ScoreHistogram.objects.bulk_create(
+        [ScoreHistogram(assessment=a, value=v, count=c) for (a, v), c in counts.items()], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_score_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assessment', models.CharField(max_length=50)),
+                ('value', models.SmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('assessment', 'value'), name='histogram_cell_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_histogram, migrations.RunPython.noop),
+    ]
@@ -1,16 +1,41 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 import uuid # फाईलच्या सर्वात वरती ॲड करा
+
+
+class CountedSaveMixin:
+    """
+    save() आणि त्याच्या post_save counter updates (api/counters.py) एकाच
+    transaction मध्ये: row लिहिली गेली तर counters पण, नाहीतर दोन्ही नाही.
+    """
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
 # --------------------------
 # Custom User Model
 # --------------------------
-class CustomUser(AbstractUser):
+class CustomUser(CountedSaveMixin, AbstractUser):
     first_name = models.CharField(max_length=50, blank=True)
     last_name = models.CharField(max_length=50, blank=True)
     country = models.CharField(max_length=50, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
     preferred_language = models.CharField(max_length=10, blank=True, null=True)
     profile_image = models.ImageField(upload_to="profiles/", blank=True, null=True)
+    # content-hash ने dedupe केलेला फोटो + त्याचे thumbnails (api/images.py)
+    profile_photo = models.ForeignKey(
+        'ProfileImage', on_delete=models.SET_NULL, related_name='users', null=True, blank=True,
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # ForgotPasswordView आणि AdminUserListView email ने शोधतात
+            models.Index(fields=['email'], name='user_email_idx'),
+        ]
 
     def __str__(self):
         return self.username
@@ -45,12 +70,25 @@ class Counsellor(models.Model):
     # ३. काही अतिरिक्त उपयुक्त फील्ड्स
     phone = models.CharField(max_length=15, blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # open appointments + active assigned clients; api/assignment.py incrementally सांभाळते
+    current_load = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # api/counters.py F() ने सांभाळते; instance मधली जुनी value save() ने परत लिहू नये
+    COUNTER_FIELDS = ('current_load', 'total_sessions')
 
     def save(self, *args, **kwargs):
         # जर counsellor_id नसेल, तर तो आपोआप तयार होईल (उदा: CNSL-A1B2)
         if not self.counsellor_id:
             self.counsellor_id = f"CNSL-{str(uuid.uuid4())[:4].upper()}"
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Django सारखेच: .only() ने न वाचलेले fields पण लिहू नका
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -59,7 +97,11 @@ class Counsellor(models.Model):
 # --------------------------
 # Depression Scanning Model
 # --------------------------
-class DepressionScan(models.Model):
+class DepressionScan(CountedSaveMixin, models.Model):
+    # 4 questions x max 3 marks each
+    MAX_ANSWER = 3
+    MAX_SCORE = 12
+
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="depression_scans")
     q1 = models.IntegerField()
     q2 = models.IntegerField()
@@ -68,13 +110,26 @@ class DepressionScan(models.Model):
     total_score = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='scan_user_created_idx'),
+            models.Index(fields=['created_at'], name='scan_created_idx'),
+        ]
+
+    @classmethod
+    def score_percentage(cls, total_score):
+        """Convert a total_score (out of 12) into a percentage."""
+        if total_score is None:
+            return 0
+        return round((total_score / cls.MAX_SCORE) * 100)
+
     def __str__(self):
         return f"{self.user.username} - Score: {self.total_score}"
 
 # --------------------------
 # Client Information Model
 # --------------------------
-class ClientInformation(models.Model):
+class ClientInformation(CountedSaveMixin, models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="client_info")
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
@@ -100,6 +155,13 @@ class ClientInformation(models.Model):
     brother = models.CharField(max_length=50, blank=True, null=True)
     marks = models.JSONField(default=dict, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='clientinfo_user_created_idx'),
+            models.Index(fields=['created_at'], name='clientinfo_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.first_name} {self.last_name}"
@@ -107,9 +169,13 @@ class ClientInformation(models.Model):
 # --------------------------
 # Appointment Model
 # --------------------------
-class Appointment(models.Model):
+class Appointment(CountedSaveMixin, models.Model):
     # React ला लागणारी सर्व फील्ड्स इथे ॲड केली आहेत
     client_id = models.CharField(max_length=50, blank=True, null=True)
+    # कोणत्या counsellor कडे booking (set_by हा फक्त text होता); availability साठी आवश्यक
+    counsellor = models.ForeignKey(
+        Counsellor, on_delete=models.SET_NULL, related_name='appointments', null=True, blank=True,
+    )
     name = models.CharField(max_length=255) # patient_name ऐवजी 'name' ठेवा म्हणजे मॅपिंग सोपे जाईल
     appointment_spec = models.TextField(blank=True, null=True)
     date = models.DateField()
@@ -118,11 +184,30 @@ class Appointment(models.Model):
     status = models.CharField(max_length=50, default='Pending')
     set_by = models.CharField(max_length=100, default='Counselor')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # पेशंटची history (?client_id=) आणि तारखेनुसार फिल्टर
+            models.Index(fields=['client_id', 'created_at'], name='appt_client_created_idx'),
+            models.Index(fields=['client_id', 'date'], name='appt_client_date_idx'),
+            models.Index(fields=['status', 'date'], name='appt_status_date_idx'),
+            models.Index(fields=['created_at'], name='appt_created_idx'),
+            models.Index(fields=['date', 'time'], name='appt_date_time_idx'),
+        ]
+        constraints = [
+            # slots grid वर असतात (api/availability.py), म्हणून overlap = एकच (counsellor, date, time)
+            models.UniqueConstraint(
+                fields=['counsellor', 'date', 'time'],
+                condition=models.Q(counsellor__isnull=False) & ~models.Q(status='Cancelled'),
+                name='appt_counsellor_slot_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.date}"
 
-class Client(models.Model):
+class Client(CountedSaveMixin, models.Model):
     STATUS_CHOICES = [
         ('Confirmed', 'Confirmed'),
         ('Pending', 'Pending'),
@@ -132,9 +217,14 @@ class Client(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
     counsellor = models.CharField(max_length=255, default='On Hold')
+    # counsellor (नाव) display साठी तसेच राहते; assignment service हे FK भरते
+    assigned_counsellor = models.ForeignKey(
+        Counsellor, on_delete=models.SET_NULL, related_name='clients', null=True, blank=True,
+    )
     last_session = models.CharField(max_length=100, default='--')
     next_session = models.CharField(max_length=100, default='Today')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
@@ -156,6 +246,15 @@ class Note(models.Model):
     content = models.TextField()
     tag = models.CharField(max_length=50, default="General")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='note_created_idx'),
+            # user चा feed (cursor: -created_at, -id) आणि tag filter/facets; इतर users च्या notes वाचल्या जात नाहीत
+            models.Index(fields=['user', '-created_at', '-id'], name='note_user_created_idx'),
+            models.Index(fields=['user', 'tag', '-created_at', '-id'], name='note_user_tag_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -170,4 +269,119 @@ class UserSetting(models.Model):
     date_format = models.CharField(max_length=50, default="DD/MM/YYYY")
 
     def __str__(self):
-        return f"Settings for {self.counsellor.name}"
\ No newline at end of file
+        return f"Settings for {self.counsellor.name}"
+
+# --------------------------
+# Outgoing Email Outbox
+# --------------------------
+class OutboxEmail(models.Model):
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Sending', 'Sending'),
+        ('Sent', 'Sent'),
+        ('Failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    # Sending मध्ये गेल्याची वेळ (lease): worker मेला तर OUTBOX_LEASE_SECONDS नंतर मेल परत उचलली जाते
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # worker फक्त due झालेल्या Pending मेल्स उचलतो
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+
+# --------------------------
+# Profile Image (content-addressed upload + thumbnails)
+# --------------------------
+class ProfileImage(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    image = models.ImageField(upload_to="profiles/", width_field='width', height_field='height')
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    # {"64": "profiles/thumbs/<sha>_64.webp", ...}; background step भरतो
+    thumbnails = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.width}x{self.height})"
+
+
+# --------------------------
+# Maintained counters (api/counters.py)
+# --------------------------
+class StatCounter(models.Model):
+    # 'counsellors', 'clients', 'appointments': DashboardSummaryView COUNT(*) ऐवजी हे वाचतो
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
+# --------------------------
+# Score trend rollups (api/rollups.py)
+# --------------------------
+class ScoreRollup(models.Model):
+    """
+    One histogram cell: how many DepressionScans with `score` fall in the
+    week/month starting `bucket_start`, for one user (user NULL = everybody).
+    count/sum/min/max/distribution of a bucket all come from its cells.
+    """
+    PERIOD_CHOICES = [('week', 'Week'), ('month', 'Month')]
+
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    bucket_start = models.DateField()
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="score_rollups", null=True, blank=True,
+    )
+    score = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # NULL user unique मध्ये वेगळा मोजला जातो, म्हणून population साठी वेगळा constraint
+            models.UniqueConstraint(
+                fields=['period', 'user', 'bucket_start', 'score'],
+                condition=models.Q(user__isnull=False), name='rollup_user_cell_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['period', 'bucket_start', 'score'],
+                condition=models.Q(user__isnull=True), name='rollup_population_cell_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.bucket_start} user={self.user_id} score={self.score}: {self.count}"
+
+
+# --------------------------
+# Population score histogram (api/percentiles.py)
+# --------------------------
+class ScoreHistogram(models.Model):
+    # किती ClientInformation rows मध्ये marks[assessment] == value आहे
+    assessment = models.CharField(max_length=50)
+    value = models.SmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['assessment', 'value'], name='histogram_cell_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.assessment}={self.value}: {self.count}"
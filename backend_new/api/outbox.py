@@ -0,0 +1,110 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# पहिला retry 30 सेकंदांनी, नंतर प्रत्येक वेळी दुप्पट (जास्तीत जास्त 1 तास)
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """
+    Drop-in replacement for send_mail() inside a request: the mail is only
+    written to the outbox and the send_outbox worker delivers it later.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        recipients=list(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def claimable(now):
+    """Due Pending mails, plus Sending ones whose worker's lease ran out (it crashed mid-batch)."""
+    lease = timedelta(seconds=getattr(settings, 'OUTBOX_LEASE_SECONDS', 300))
+    return Q(status='Pending', next_attempt_at__lte=now) | Q(status='Sending', claimed_at__lt=now - lease)
+
+
+def deliver_pending(batch_size=100, max_attempts=None, connection=None):
+    """
+    Send up to `batch_size` due outbox mails over a single mail connection.
+    Returns (sent, failed) counts for this batch.
+
+    A mail whose worker died after claiming it is sent again once the lease
+    expires, so delivery is at-least-once.
+    """
+    if max_attempts is None:
+        max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+
+    now = timezone.now()
+    due_ids = list(
+        OutboxEmail.objects.filter(claimable(now))
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not due_ids:
+        return 0, 0
+
+    # -> Sending + claimed_at: दोन workers एकच मेल दोनदा पाठवणार नाहीत (नवीन claimed_at lease बाहेर नसतो)
+    claimed = []
+    for email_id in due_ids:
+        if OutboxEmail.objects.filter(claimable(now), id=email_id).update(status='Sending', claimed_at=now):
+            claimed.append(email_id)
+
+    sent = failed = 0
+    emails = list(OutboxEmail.objects.filter(id__in=claimed).order_by('id'))
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        # SMTP relay उपलब्धच नाही: सगळ्या मेल्स नंतर पुन्हा try होतील
+        for email in emails:
+            _record_failure(email, exc, max_attempts)
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, email.recipients,
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as exc:
+                failed += 1
+                _record_failure(email, exc, max_attempts)
+            else:
+                sent += 1
+                OutboxEmail.objects.filter(id=email.id).update(
+                    status='Sent',
+                    attempts=email.attempts + 1,
+                    last_error="",
+                    sent_at=timezone.now(),
+                )
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _record_failure(email, exc, max_attempts):
+    attempts = email.attempts + 1
+    logger.warning("Outbox mail %s failed (attempt %s): %s", email.id, attempts, exc)
+    OutboxEmail.objects.filter(id=email.id).update(
+        status='Failed' if attempts >= max_attempts else 'Pending',
+        attempts=attempts,
+        last_error=str(exc),
+        next_attempt_at=timezone.now() + retry_delay(attempts),
+    )
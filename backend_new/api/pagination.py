@@ -0,0 +1,45 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+# -------------------------------
+# Cursor (keyset) pagination
+# -------------------------------
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination on (created_at, id), newest first.
+
+    Requests without ?cursor= get the first page, so old clients still see a
+    bounded list. `id` breaks ties between rows saved in the same instant.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+
+class IdCursorPagination(CreatedAtCursorPagination):
+    # Client has no created_at, so page on id alone
+    ordering = ('-id',)
+
+
+class UserCursorPagination(CreatedAtCursorPagination):
+    ordering = ('-date_joined', '-id')
+
+
+# -------------------------------
+# Counsellor Dashboard pagination
+# -------------------------------
+class DashboardClientPagination(PageNumberPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def paginated_response(view, request, queryset, serializer_class, **serializer_kwargs):
+    """
+    Paginate `queryset` for a plain APIView using `view.pagination_class`.
+    """
+    paginator = view.pagination_class()
+    page = paginator.paginate_queryset(queryset, request, view=view)
+    serializer = serializer_class(page, many=True, **serializer_kwargs)
+    return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,108 @@
+"""
+Population percentile ranks for ClientInformation.marks.
+
+ScoreHistogram holds, per assessment ('Depression', 'Anxiety', ...), how
+many client records currently have each mark value. Marks are integer
+percentages, so an assessment has at most 101 cells (Depression: 13, one
+per total_score). The histogram is a maintained counter (api/counters.py):
+ClientInformation saves move it through signals, and the scan endpoints,
+which change marks with queryset.update(), apply the deltas themselves.
+
+A percentile rank is then a cumulative-sum lookup on those few cells
+instead of a pass over every client.
+"""
+import hashlib
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+
+from django.db import transaction
+
+from .db_functions import add_counts
+from .models import ClientInformation, ScoreHistogram
+
+
+def mark_cells(marks):
+    """(assessment, value) cells one marks dict contributes 1 to."""
+    cells = []
+    for assessment, value in (marks or {}).items():
+        # bool हा int चा subclass आहे, पण mark नाही
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append((assessment, round(value)))
+    return cells
+
+
+def bump_histogram(deltas):
+    rows = [(*cell, delta) for cell, delta in deltas.items() if delta]
+    if rows:
+        add_counts(ScoreHistogram, ('assessment', 'value'), rows, '(assessment, value)')
+
+
+class PercentileTable:
+    """Sorted values and running counts per assessment, loaded in one query."""
+
+    def __init__(self, rows):
+        cells = {}
+        for assessment, value, count in sorted(rows):
+            if count > 0:
+                cells.setdefault(assessment, []).append((value, count))
+        self.tables = {}
+        for assessment, pairs in cells.items():
+            values = [value for value, _ in pairs]
+            counts = [count for _, count in pairs]
+            self.tables[assessment] = (values, counts, [0, *accumulate(counts)])
+        self.digest = hashlib.md5(repr(sorted(rows)).encode()).hexdigest()
+
+    def rank(self, assessment, value):
+        """
+        Share (0-100) of clients below `value`, counting ties as half, so
+        the median client sits at 50.
+        """
+        if assessment not in self.tables or value is None:
+            return None
+        values, counts, cumulative = self.tables[assessment]
+        i = bisect_left(values, value)
+        equal = counts[i] if i < len(values) and values[i] == value else 0
+        return round((cumulative[i] + equal / 2) / cumulative[-1] * 100, 1)
+
+    def ranks(self, marks):
+        return {assessment: self.rank(assessment, value) for assessment, value in mark_cells(marks)}
+
+
+def load_table(assessments=None):
+    rows = ScoreHistogram.objects.all()
+    if assessments:
+        rows = rows.filter(assessment__in=assessments)
+    return PercentileTable(rows.values_list('assessment', 'value', 'count'))
+
+
+def percentile_rank(assessment, value):
+    return load_table([assessment]).rank(assessment, value)
+
+
+# -------------------------------
+# Reconciliation
+# -------------------------------
+def count_marks():
+    counts = Counter()
+    for marks in ClientInformation.objects.values_list('marks', flat=True).iterator(chunk_size=2000):
+        counts.update(mark_cells(marks))
+    return counts
+
+
+def rebuild_histogram():
+    """Recompute from ClientInformation.marks; returns {cell: (old, new)} for the ones that drifted."""
+    with transaction.atomic():
+        actual = count_marks()
+        stored = {(a, v): c for a, v, c in ScoreHistogram.objects.values_list('assessment', 'value', 'count')}
+        drift = {
+            cell: (stored.get(cell, 0), actual.get(cell, 0))
+            for cell in set(actual) | set(stored)
+            if stored.get(cell, 0) != actual.get(cell, 0)
+        }
+        if drift:
+            ScoreHistogram.objects.all().delete()
+            ScoreHistogram.objects.bulk_create(
+                [ScoreHistogram(assessment=a, value=v, count=c) for (a, v), c in actual.items()], batch_size=1000,
+            )
+    return drift
@@ -0,0 +1,107 @@
+"""
+Depression-score trend rollups.
+
+ScoreRollup rows are histogram cells keyed by (period, bucket_start, user,
+score). Every DepressionScan contributes +1 to four cells: its week and its
+month, once for its user and once for the population (user NULL). The
+cells move with the other maintained counters (api/counters.py: signals on
+save/delete, apply_deltas() on bulk paths), and `manage.py
+backfill_score_rollups` rebuilds them from the scans table.
+
+Readers (api/trends.py) never touch DepressionScan.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .db_functions import add_counts
+from .models import DepressionScan, ScoreRollup
+
+PERIODS = ('week', 'month')
+
+
+def period_start(period, day):
+    """First day of the week (Monday) or month containing `day`."""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def bucket_start(period, moment):
+    return period_start(period, timezone.localtime(moment).date())
+
+
+def rollup_cells(user_id, total_score, created_at):
+    """Cells one scan adds 1 to: (period, bucket_start, user_id or None, score)."""
+    # range बाहेरचे जुने (validation आधीचे) scans trends मध्ये मोजत नाही
+    if created_at is None or total_score is None or not 0 <= total_score <= DepressionScan.MAX_SCORE:
+        return []
+    cells = []
+    for period in PERIODS:
+        start = bucket_start(period, created_at)
+        cells.append((period, start, user_id, total_score))
+        cells.append((period, start, None, total_score))
+    return cells
+
+
+# (user cells, population cells): partial unique indexes, म्हणून conflict target मध्ये WHERE
+_CONFLICT_TARGETS = (
+    (True, '(period, user_id, bucket_start, score) WHERE user_id IS NOT NULL'),
+    (False, '(period, bucket_start, score) WHERE user_id IS NULL'),
+)
+
+
+def bump_cells(deltas):
+    """
+    Add {cell: delta} to the cells with one INSERT ... ON CONFLICT DO UPDATE
+    per kind of cell (user / population), however many scans are involved.
+    """
+    for is_user, conflict in _CONFLICT_TARGETS:
+        rows = [(*cell, delta) for cell, delta in deltas.items() if delta and (cell[2] is not None) == is_user]
+        if rows:
+            add_counts(ScoreRollup, ('period', 'bucket_start', 'user_id', 'score'), rows, conflict)
+
+
+# -------------------------------
+# Backfill
+# -------------------------------
+TRUNC = {'week': TruncWeek, 'month': TruncMonth}
+
+
+def _grouped_cells(period, per_user):
+    fields = ['bucket', 'total_score'] + (['user'] if per_user else [])
+    rows = (
+        DepressionScan.objects.order_by()
+        .filter(total_score__gte=0, total_score__lte=DepressionScan.MAX_SCORE)
+        .annotate(bucket=TRUNC[period]('created_at'))
+        .values(*fields).annotate(n=Count('id'))
+    )
+    for row in rows.iterator(chunk_size=2000):
+        # TruncWeek/TruncMonth current time zone (TIME_ZONE) मध्ये truncate करतात, bucket_start() सारखेच
+        yield ScoreRollup(
+            period=period, bucket_start=row['bucket'].date(), user_id=row['user'] if per_user else None,
+            score=row['total_score'], count=row['n'],
+        )
+
+
+def rebuild_rollups(batch_size=1000):
+    """
+    Recompute every cell with GROUP BY queries over DepressionScan and
+    replace the table in one transaction. Returns the number of cells.
+    """
+    with transaction.atomic():
+        ScoreRollup.objects.all().delete()
+        created = 0
+        for period in PERIODS:
+            for per_user in (True, False):
+                batch = []
+                for cell in _grouped_cells(period, per_user):
+                    batch.append(cell)
+                    if len(batch) >= batch_size:
+                        created += len(ScoreRollup.objects.bulk_create(batch))
+                        batch = []
+                created += len(ScoreRollup.objects.bulk_create(batch))
+    return created
@@ -0,0 +1,132 @@
+"""
+Full-text search over notes (SQLite FTS5).
+
+`api_note_fts` is an external-content FTS5 table over api_note(title,
+content, tag), created in migration 0023. Triggers on api_note keep it in
+step with every insert/update/delete (including bulk_create and
+queryset.update(), which bypass model signals). `manage.py
+rebuild_note_index` repopulates it from api_note.
+
+On other databases search falls back to icontains, unranked.
+"""
+import html
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from .models import Note
+
+FTS_TABLE = 'api_note_fts'
+
+# highlight()/snippet() markers: html escape नंतर <mark> मध्ये बदलतात
+_OPEN, _CLOSE = '\x02', '\x03'
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def query_tokens(query):
+    # whitespace वर split: \w मराठी मात्रांवर शब्द तोडतो; बाकी tokenizing FTS5 करतो
+    return [token for token in (query or '').split() if any(ch.isalnum() for ch in token)]
+
+
+def match_expression(query):
+    """
+    User text -> safe FTS5 MATCH expression: every word quoted (no FTS
+    syntax from the user), all words required, last word as a prefix so
+    results show up while typing.
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return None
+    quoted = ['"' + token.replace('"', '""') + '"' for token in tokens]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _marked_html(text):
+    return html.escape(text or '').replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+
+def search_notes(query, limit=20, offset=0, user_id=None):
+    """
+    Best-ranked (bm25, title weighted over content over tag) notes for
+    `query`. Returns (notes, has_more, truncated); each note carries
+    `rank`, `title_highlight` and `snippet` (HTML-escaped, matches in
+    <mark>).
+
+    Only the newest NOTE_SEARCH_WINDOW matches are ranked: bm25 has to
+    score every candidate before the ORDER BY, so a word that is in half
+    the notes would otherwise cost a full doclist scan per keystroke. The
+    window is a rowid bound, which FTS5 applies while reading the index.
+    `truncated` says older matches exist that were left out, so the
+    caller can tell the user to narrow the query.
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return [], False, False
+    if not fts_available():
+        return _search_fallback(query, limit, offset, user_id)
+
+    owner_join = 'JOIN api_note n ON n.id = f.rowid AND n.user_id = %s' if user_id else ''
+    owner = [user_id] if user_id else []
+    window = getattr(settings, 'NOTE_SEARCH_WINDOW', 5000)
+    with connection.cursor() as cursor:
+        # window बाहेरचा पहिला (सर्वात नवीन) match: असेल तर bound, आणि truncated
+        cursor.execute(
+            f"SELECT f.rowid FROM {FTS_TABLE} f {owner_join} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY f.rowid DESC LIMIT 1 OFFSET %s",
+            [*owner, expression, window],
+        )
+        outside = cursor.fetchone()
+        bound = outside[0] if outside else 0
+        cursor.execute(f"""
+            SELECT f.rowid,
+                   bm25({FTS_TABLE}, 10.0, 1.0, 3.0) AS rank,
+                   highlight({FTS_TABLE}, 0, %s, %s) AS title_highlight,
+                   snippet({FTS_TABLE}, 1, %s, %s, '…', 16) AS snippet
+            FROM {FTS_TABLE} f {owner_join}
+            WHERE {FTS_TABLE} MATCH %s AND f.rowid > %s
+            ORDER BY rank
+            LIMIT %s OFFSET %s
+        """, [_OPEN, _CLOSE, _OPEN, _CLOSE, *owner, expression, bound, limit + 1, offset])
+        rows = cursor.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    notes = Note.objects.in_bulk([row[0] for row in rows])
+    results = []
+    for note_id, rank, title_highlight, snippet in rows:
+        note = notes.get(note_id)
+        if note is None:
+            continue
+        note.rank = rank
+        note.title_highlight = _marked_html(title_highlight)
+        note.snippet = _marked_html(snippet)
+        results.append(note)
+    return results, has_more, outside is not None
+
+
+def _search_fallback(query, limit, offset, user_id):
+    queryset = Note.objects.order_by('-created_at', '-id')
+    for token in query_tokens(query):
+        queryset = queryset.filter(Q(title__icontains=token) | Q(content__icontains=token))
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+    rows = list(queryset[offset:offset + limit + 1])
+    for note in rows:
+        note.rank = None
+        note.title_highlight = html.escape(note.title)
+        note.snippet = html.escape(note.content[:200])
+    return rows[:limit], len(rows) > limit, False
+
+
+def rebuild_index(optimize=False):
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        if optimize:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
@@ -2,7 +2,11 @@
 # --------------------------
 # User Serializer
 # --------------------------
+from django.conf import settings
 from rest_framework import serializers
+from .availability import FREE_STATUSES, SlotTaken, check_slot_free, on_grid
+from .images import store_profile_image, thumbnail_urls
+from .percentiles import load_table
 from .models import CustomUser, DepressionScan, ClientInformation, Appointment,Counsellor,Client,Note
 
 # --------------------------
@@ -11,6 +15,8 @@ from .models import CustomUser, DepressionScan, ClientInformation, Appointment,C
 class UserSerializer(serializers.ModelSerializer):
     # इमेजचा पूर्ण URL मिळवण्यासाठी हे उपयुक्त ठरू शकते
     profile_image = serializers.ImageField(required=False, allow_null=True)
+    # {"64": url, "128": url, "256": url}; background step पूर्ण होईपर्यंत रिकामा
+    profile_thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = CustomUser
@@ -25,6 +31,7 @@ class UserSerializer(serializers.ModelSerializer):
             'bio',
             'preferred_language',
             'profile_image',
+            'profile_thumbnails',
         ]
         extra_kwargs = {
             'password': {'write_only': True}
@@ -41,12 +48,38 @@ class UserSerializer(serializers.ModelSerializer):
             country=validated_data.get('country', ''),
             bio=validated_data.get('bio', ''),
             preferred_language=validated_data.get('preferred_language', ''),
-            profile_image=validated_data.get('profile_image', None) # फोटो इथेही ॲड केला
         )
+        if validated_data.get('profile_image'):  # फोटो इथेही ॲड केला
+            self._set_photo(user, validated_data['profile_image'])
+            user.save(update_fields=['profile_photo', 'profile_image', 'updated_at'])
         return user
 
-    # टीप: update() मेथड इथे लिहिण्याची गरज नाही,
-    # कारण ModelSerializer ती आपोआप हाताळतो.
+    def update(self, instance, validated_data):
+        if 'profile_image' in validated_data:
+            self._set_photo(instance, validated_data.pop('profile_image'))
+        return super().update(instance, validated_data)
+
+    @staticmethod
+    def _set_photo(user, upload):
+        # एकसारखे फोटो (content hash) एकदाच store होतात
+        photo = store_profile_image(upload) if upload else None
+        user.profile_photo = photo
+        user.profile_image = photo.image.name if photo else None
+
+    def validate_profile_image(self, image):
+        if image is None:
+            return image
+        if image.size > settings.PROFILE_IMAGE_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"Image must be {settings.PROFILE_IMAGE_MAX_BYTES // (1024 * 1024)} MB or smaller."
+            )
+        width, height = image.image.size
+        if width * height > settings.PROFILE_IMAGE_MAX_PIXELS:
+            raise serializers.ValidationError("Image dimensions are too large.")
+        return image
+
+    def get_profile_thumbnails(self, user):
+        return thumbnail_urls(user.profile_photo, self.context.get('request'))
 
 # --------------------------
 # 🔥 Counsellor Serializer (हे असं डाव्या बाजूला चिकटवून लिहा)
@@ -54,7 +87,10 @@ class UserSerializer(serializers.ModelSerializer):
 class CounsellorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Counsellor
-        fields = '__all__'
+        # current_load सतत बदलतो; तो list मध्ये असता तर counsellors cache सारखा invalidate झाला असता
+        exclude = ['current_load']
+        # appointments वरून मोजला जातो (api/counters.py), API मधून लिहिता येत नाही
+        read_only_fields = ['total_sessions']
 
 # --------------------------
 # Depression Scan Serializer ✅
@@ -64,6 +100,10 @@ class DepressionScanSerializer(serializers.ModelSerializer):
         model = DepressionScan
         fields = ['id', 'user', 'q1', 'q2', 'q3', 'q4', 'total_score', 'created_at']
         read_only_fields = ['total_score', 'created_at']
+        # प्रत्येक उत्तर 0..3; rollups/trends total 0..MAX_SCORE गृहीत धरतात
+        extra_kwargs = {
+            q: {'min_value': 0, 'max_value': DepressionScan.MAX_ANSWER} for q in ('q1', 'q2', 'q3', 'q4')
+        }
 
     def create(self, validated_data):
         # बेरीज करताना चुका होऊ नयेत म्हणून हे लॉजिक वापरा
@@ -75,15 +115,61 @@ class DepressionScanSerializer(serializers.ModelSerializer):
         validated_data['total_score'] = q1 + q2 + q3 + q4
         return super().create(validated_data)
 
+# --------------------------
+# Bulk Depression Scan Serializer (offline camps/kiosks)
+# --------------------------
+class PrefetchedUserField(serializers.PrimaryKeyRelatedField):
+    """
+    context['users'] मध्ये {id: user} आधीच असेल तर प्रत्येक row साठी DB query होत नाही.
+    """
+    def to_internal_value(self, data):
+        users = self.context.get('users')
+        if users is None:
+            return super().to_internal_value(data)
+        try:
+            return users[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class BulkDepressionScanSerializer(DepressionScanSerializer):
+    user = PrefetchedUserField(queryset=CustomUser.objects.all())
+
+    def build_instance(self):
+        # bulk_create साठी: save() न करता instance तयार करा (create() सारखीच बेरीज)
+        data = self.validated_data
+        return DepressionScan(
+            total_score=sum(data.get(q, 0) for q in ('q1', 'q2', 'q3', 'q4')),
+            **data,
+        )
+
+
 # --------------------------
 # Client Information Serializer ✅
 # --------------------------
 class ClientInformationSerializer(serializers.ModelSerializer):
+    # marks मधल्या प्रत्येक assessment चा population percentile (api/percentiles.py)
+    percentile_ranks = serializers.SerializerMethodField()
+
     class Meta:
         model = ClientInformation
         fields = '__all__'  # include all fields from model
         read_only_fields = ['created_at']  # auto-managed timestamp
 
+    def get_percentile_ranks(self, obj):
+        # context['percentiles'] नसेल तर पूर्ण list साठी एकदाच load (async views आधीच देतात)
+        table = self.context.get('percentiles')
+        if table is None:
+            table = self.context['percentiles'] = load_table()
+        return table.ranks(obj.marks)
+
+
+class BulkClientInformationSerializer(ClientInformationSerializer):
+    # CSV import (api/imports.py): chunk चे users आधीच context['users'] मध्ये
+    user = PrefetchedUserField(queryset=CustomUser.objects.all())
+
 
 # ==========================
 # 🔥 Appointment Serializer ✅ (नवीन जोडले)
@@ -94,6 +180,24 @@ class AppointmentSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['created_at']
 
+    def validate(self, attrs):
+        # partial update (उदा. फक्त status) साठी बाकीची values instance मधून
+        def current(name):
+            return attrs.get(name, getattr(self.instance, name, None))
+
+        counsellor = current('counsellor')
+        if counsellor is None or current('status') in FREE_STATUSES:
+            return attrs
+
+        day, start = current('date'), current('time')
+        if not on_grid(start):
+            raise serializers.ValidationError(
+                {"time": f"Bookings start on {settings.APPOINTMENT_SLOT_MINUTES}-minute slots."}
+            )
+        if not check_slot_free(counsellor.pk, day, start, exclude_id=getattr(self.instance, 'pk', None)):
+            raise SlotTaken()
+        return attrs
+
 class ClientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Client
@@ -114,6 +218,16 @@ class NoteSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'title', 'content', 'tag', 'created_at']
 
 
+class NoteSearchResultSerializer(NoteSerializer):
+    # api/search.py ने भरलेले: HTML-escaped, match <mark> मध्ये
+    rank = serializers.FloatField(read_only=True, allow_null=True)
+    title_highlight = serializers.CharField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(NoteSerializer.Meta):
+        fields = NoteSerializer.Meta.fields + ['rank', 'title_highlight', 'snippet']
+
+
 # serializers.py मध्ये खालीलप्रमाणे ॲड करा
 
 class UserSettingUpdateSerializer(serializers.Serializer):
@@ -145,4 +259,37 @@ class UserSettingUpdateSerializer(serializers.Serializer):
         instance.date_format = validated_data.get('date_format', instance.date_format)
         instance.save()
 
-        return instance
\ No newline at end of file
+        return instance
+
+# --------------------------
+# Dashboard Client Row Serializer
+# --------------------------
+class DashboardClientSerializer(serializers.ModelSerializer):
+    # these come from the annotate() in DashboardClientListView
+    latest_score = serializers.IntegerField(read_only=True, allow_null=True)
+    latest_scan_at = serializers.DateTimeField(read_only=True, allow_null=True)
+    today_appointments = serializers.IntegerField(read_only=True)
+    percentage = serializers.SerializerMethodField()
+    percentile_rank = serializers.SerializerMethodField()
+    status = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ClientInformation
+        fields = [
+            'id', 'user', 'first_name', 'last_name', 'email', 'marks', 'created_at',
+            'latest_score', 'latest_scan_at', 'percentage', 'percentile_rank', 'status', 'today_appointments',
+        ]
+
+    def get_percentage(self, obj):
+        return DepressionScan.score_percentage(obj.latest_score)
+
+    def get_percentile_rank(self, obj):
+        if obj.latest_score is None:
+            return None
+        table = self.context.get('percentiles')
+        if table is None:
+            table = self.context['percentiles'] = load_table(['Depression'])
+        return table.rank('Depression', self.get_percentage(obj))
+
+    def get_status(self, obj):
+        return "Analyzed" if obj.latest_score is not None else "Pending"
@@ -0,0 +1,83 @@
+import copy
+
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete, pre_save
+
+from .cache import invalidate
+from .counters import TRACKED_FIELDS, apply_deltas, diff, snapshot
+from .models import CustomUser, Counsellor, ClientInformation, Appointment
+
+
+# -------------------------------
+# Response cache invalidation
+# -------------------------------
+# model -> त्यावर अवलंबून असलेले cache namespaces
+CACHE_DEPENDENCIES = {
+    Counsellor: ('counsellors', 'dashboard'),
+    ClientInformation: ('dashboard',),
+    Appointment: ('dashboard',),
+    # DashboardSummaryView staff users मोजतो
+    CustomUser: ('dashboard',),
+}
+
+
+def invalidate_response_cache(sender, **kwargs):
+    invalidate(*CACHE_DEPENDENCIES[sender])
+
+
+for model in CACHE_DEPENDENCIES:
+    post_save.connect(invalidate_response_cache, sender=model, dispatch_uid=f'cache_save_{model.__name__}')
+    post_delete.connect(invalidate_response_cache, sender=model, dispatch_uid=f'cache_delete_{model.__name__}')
+
+
+# -------------------------------
+# Maintained counters + counsellor load index (api/counters.py)
+# -------------------------------
+UNKNOWN = object()
+
+
+def remember_state(sender, instance, **kwargs):
+    fields = TRACKED_FIELDS[sender]
+    if not instance.pk:
+        instance._counted_state = None
+    elif set(fields) & instance.get_deferred_fields():
+        # .only()/.defer(): इथे query करू नका; save होणार असेल तर pre_save मध्ये वाचू
+        instance._counted_state = UNKNOWN
+    else:
+        instance._counted_state = snapshot(instance)
+
+
+def load_deferred_state(sender, instance, **kwargs):
+    # deferred instance save होतोय: जुनी tracked values एका query ने (row अजून जुनीच आहे)
+    if getattr(instance, '_counted_state', None) is not UNKNOWN:
+        return
+    instance._counted_state = (
+        sender._base_manager.using(kwargs.get('using')).filter(pk=instance.pk)
+        .values(*TRACKED_FIELDS[sender]).first()
+    )
+
+
+def count_on_save(sender, instance, created, **kwargs):
+    before = None if created else getattr(instance, '_counted_state', None)
+    deferred = instance.get_deferred_fields()
+    # अजूनही deferred असलेले fields save मध्ये लिहिले गेले नाहीत: DB मधली (जुनी) value तशीच
+    after = {
+        field: before[field] if before and field in deferred else copy.deepcopy(getattr(instance, field))
+        for field in TRACKED_FIELDS[sender]
+    }
+    apply_deltas(diff(sender, before, after))
+    instance._counted_state = after
+
+
+def count_on_delete(sender, instance, **kwargs):
+    # pre_delete: row अजून आहे आणि delete चा atomic block चालू आहे
+    before = getattr(instance, '_counted_state', UNKNOWN)
+    if before is UNKNOWN or before is None:
+        before = snapshot(instance)
+    apply_deltas(diff(sender, before, None))
+
+
+for model in TRACKED_FIELDS:
+    post_init.connect(remember_state, sender=model, dispatch_uid=f'counted_init_{model.__name__}')
+    pre_save.connect(load_deferred_state, sender=model, dispatch_uid=f'counted_pre_save_{model.__name__}')
+    post_save.connect(count_on_save, sender=model, dispatch_uid=f'counted_save_{model.__name__}')
+    pre_delete.connect(count_on_delete, sender=model, dispatch_uid=f'counted_delete_{model.__name__}')
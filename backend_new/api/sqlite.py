@@ -0,0 +1,16 @@
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    connection_created handler: apply settings.SQLITE_PRAGMAS to every new
+    SQLite connection (empty unless the production profile is enabled).
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -1,3 +1,1318 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.signals import user_login_failed
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from .models import (
+    CustomUser, DepressionScan, ClientInformation, Appointment, Note, Client, OutboxEmail, Counsellor, ProfileImage,
+    StatCounter, ScoreRollup,
+)
+from .assignment import assign_client, waiting_clients
+from .counters import reconcile_counters
+from .availability import IntervalIndex
+from .images import build_thumbnails
+
+# password hashing मुळे काही tests SLOW_REQUEST_MS ओलांडतात; slow log फक्त
+# RequestMetricsMiddlewareTests मध्ये (assertLogs ने) चालू करा
+_quiet_slow_log = override_settings(SLOW_REQUEST_MS=None)
+
+
+def setUpModule():
+    _quiet_slow_log.enable()
+
+
+def tearDownModule():
+    _quiet_slow_log.disable()
+
+
+def make_client_info(user, **extra):
+    data = dict(
+        user=user, first_name=user.username, last_name='Test', age=30,
+        dob=date(1995, 1, 1), email=user.email or 'test@mail.com',
+        mobile='9999999999', marital_status='Single', address='Pune',
+        pin_code='411001', state='MH', district='Pune',
+    )
+    data.update(extra)
+    return ClientInformation.objects.create(**data)
+
+
+class DashboardClientListTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.user = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+        self.other = CustomUser.objects.create_user(username='sita', email='sita@mail.com', password='pass12345')
+        make_client_info(self.user)
+        make_client_info(self.other)
+
+    def test_rows_carry_latest_scan_and_todays_appointments(self):
+        DepressionScan.objects.create(user=self.user, q1=1, q2=1, q3=1, q4=1, total_score=4)
+        DepressionScan.objects.create(user=self.user, q1=3, q2=3, q3=3, q4=0, total_score=9)
+        Appointment.objects.create(client_id=str(self.user.id), name='Ravi', date=timezone.localdate(), time='10:00')
+
+        response = self.api.get('/api/dashboard-clients/')
+        self.assertEqual(response.status_code, 200)
+        rows = {row['user']: row for row in response.data['results']}
+
+        self.assertEqual(rows[self.user.id]['latest_score'], 9)
+        self.assertEqual(rows[self.user.id]['percentage'], 75)
+        self.assertEqual(rows[self.user.id]['today_appointments'], 1)
+        self.assertEqual(rows[self.other.id]['status'], 'Pending')
+        self.assertEqual(response.data['stats']['today_appointments'], 1)
+
+    def test_severity_covers_every_client_not_just_the_page(self):
+        for i, total in enumerate((12, 9, 8, 5, 4)):
+            extra = CustomUser.objects.create_user(username=f'user{i}', password='pass12345')
+            make_client_info(extra)
+            DepressionScan.objects.create(user=extra, q1=0, q2=0, q3=0, q4=0, total_score=total)
+
+        response = self.api.get('/api/dashboard-clients/', {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        # 9/12 = 75 %, 8/12 = 67 %, 5/12 = 42 %; scan नसलेले दोघे Healthy
+        self.assertEqual(response.data['stats']['severity'], {'Severe': 2, 'Moderate': 2, 'Healthy': 3})
+
+    def test_query_count_does_not_grow_with_clients(self):
+        for i in range(5):
+            extra = CustomUser.objects.create_user(username=f'user{i}', password='pass12345')
+            make_client_info(extra)
+            DepressionScan.objects.create(user=extra, q1=1, q2=0, q3=0, q4=0, total_score=1)
+
+        # + एकदाच percentile histogram, + severity aggregate
+        with self.assertNumQueries(6):
+            self.api.get('/api/dashboard-clients/')
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        owner = CustomUser.objects.create_user(username='owner', password='x')
+        self.api.force_authenticate(owner)
+        Note.objects.bulk_create(
+            [Note(user=owner, title=f'Note {i}', content='...') for i in range(7)]
+        )
+
+    def test_first_page_is_bounded_without_cursor(self):
+        response = self.api.get('/api/notes/', {'page_size': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_walking_cursors_returns_every_row_once(self):
+        seen = []
+        url = '/api/notes/?page_size=3'
+        while url:
+            response = self.api.get(url)
+            seen.extend(note['id'] for note in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(sorted(seen), sorted(Note.objects.values_list('id', flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+
+class AdminUserListTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+
+    def add_users(self, start, count):
+        for i in range(start, start + count):
+            email = f'user{i}@mail.com'
+            CustomUser.objects.create_user(username=f'user{i}', email=email, password='pass12345')
+            Client.objects.create(name=f'User {i}', email=email, counsellor='Dr. Patil', status='Confirmed')
+
+    def test_roster_joins_client_by_email(self):
+        self.add_users(0, 1)
+        CustomUser.objects.create_user(username='loner', email='loner@mail.com', password='pass12345')
+
+        rows = {row['username']: row for row in self.api.get('/api/admin-users/').data['results']}
+        self.assertEqual(rows['user0']['counsellor'], 'Dr. Patil')
+        self.assertEqual(rows['user0']['status'], 'Confirmed')
+        self.assertEqual(rows['loner']['counsellor'], 'Not Assigned')
+
+    def test_query_count_is_independent_of_user_count(self):
+        self.add_users(0, 2)
+        with self.assertNumQueries(2):
+            self.api.get('/api/admin-users/')
+
+        self.add_users(2, 20)
+        with self.assertNumQueries(2):
+            response = self.api.get('/api/admin-users/')
+        self.assertEqual(len(response.data['results']), 22)
+
+
+class AppointmentFilterTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        Appointment.objects.create(client_id='7', name='A', date=date(2026, 3, 1), time='10:00', status='Pending')
+        Appointment.objects.create(client_id='7', name='A', date=date(2026, 3, 9), time='11:00', status='Confirmed', mode='Video')
+        Appointment.objects.create(client_id='8', name='B', date=date(2026, 3, 5), time='10:00')
+
+    def dates(self, **params):
+        response = self.api.get('/api/appointments/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['date'] for row in response.data['results']]
+
+    def test_filters_by_client_and_legacy_user_param(self):
+        self.assertEqual(len(self.dates(client_id='7')), 2)
+        self.assertEqual(len(self.dates(user='8')), 1)
+
+    def test_filters_by_date_range_status_and_mode(self):
+        self.assertEqual(sorted(self.dates(date_from='2026-03-02', date_to='2026-03-09')), ['2026-03-05', '2026-03-09'])
+        self.assertEqual(self.dates(client_id='7', status='Confirmed'), ['2026-03-09'])
+        self.assertEqual(self.dates(mode='Video'), ['2026-03-09'])
+
+    def test_invalid_date_is_rejected(self):
+        response = self.api.get('/api/appointments/', {'date_from': '01-03-2026'})
+        self.assertEqual(response.status_code, 400)
+        response = self.api.get('/api/appointments/', {'date_to': '2026-02-30'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('date_to', response.json())
+
+
+class PasswordResetOutboxTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+
+    def test_forgot_password_only_enqueues(self):
+        response = self.api.post('/api/forgot-password/', {'email': 'ravi@mail.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().status, 'Pending')
+
+        call_command('send_outbox', stdout=mock.MagicMock())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('/reset-password/', mail.outbox[0].body)
+        self.assertEqual(OutboxEmail.objects.get().status, 'Sent')
+
+    def test_failed_send_is_retried_with_backoff(self):
+        from .outbox import deliver_pending, enqueue_mail
+
+        enqueue_mail("Subject", "Body", "support@mindspace.com", ['ravi@mail.com'])
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError("relay down")):
+            self.assertEqual(deliver_pending(), (0, 1))
+
+        queued = OutboxEmail.objects.get()
+        self.assertEqual((queued.status, queued.attempts), ('Pending', 1))
+        self.assertGreater(queued.next_attempt_at, queued.created_at)
+        # backoff संपेपर्यंत पुन्हा पाठवली जात नाही
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    def test_mail_of_crashed_worker_is_reclaimed_after_lease(self):
+        from .outbox import deliver_pending, enqueue_mail
+
+        enqueue_mail("Subject", "Body", "support@mindspace.com", ['ravi@mail.com'])
+        # worker claim करून पाठवतानाच मेला: मेल Sending मध्ये अडकली
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=SystemExit):
+            with self.assertRaises(SystemExit):
+                deliver_pending()
+        self.assertEqual(OutboxEmail.objects.get().status, 'Sending')
+
+        # lease चालू असताना दुसरा worker ती उचलत नाही
+        self.assertEqual(deliver_pending(), (0, 0))
+        with override_settings(OUTBOX_LEASE_SECONDS=60):
+            OutboxEmail.objects.update(claimed_at=timezone.now() - timedelta(seconds=61))
+            self.assertEqual(deliver_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboxEmail.objects.get().status, 'Sent')
+
+
+class CounsellorSignupTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+
+    def signup(self, username, email):
+        return self.api.post('/api/counsellor-signup/', {
+            'username': username, 'email': email, 'password': 'pass12345',
+            'name': 'Asha Kulkarni', 'specialization': 'CBT',
+        }, format='json')
+
+    def test_signup_creates_user_counsellor_and_settings(self):
+        self.assertEqual(self.signup('asha', 'asha@mail.com').status_code, 201)
+        counsellor = Counsellor.objects.get(email='asha@mail.com')
+        self.assertTrue(counsellor.user.check_password('pass12345'))
+        self.assertTrue(counsellor.user.is_staff)
+        self.assertIsNotNone(counsellor.settings)
+
+    def test_failed_counsellor_insert_rolls_back_user(self):
+        self.signup('asha', 'asha@mail.com')
+        # Counsellor.email unique आहे, त्यामुळे दुसरा signup fail होतो
+        self.assertEqual(self.signup('asha2', 'asha@mail.com').status_code, 400)
+        self.assertFalse(CustomUser.objects.filter(username='asha2').exists())
+
+
+class DepressionScanSubmitTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.user = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+
+    def submit(self, q1=1, q2=2, q3=3, q4=3):
+        return self.api.post('/api/depression-scan/', {'user': self.user.id, 'q1': q1, 'q2': q2, 'q3': q3, 'q4': q4}, format='json')
+
+    def test_first_scan_creates_placeholder_client_info(self):
+        response = self.submit()
+        self.assertEqual(response.data['percentage'], 75)
+        self.assertEqual(ClientInformation.objects.get(user=self.user).marks, {'Depression': 75})
+
+    def test_marks_update_keeps_other_assessments(self):
+        make_client_info(self.user, marks={'Anxiety': 40})
+        # validation user lookup + scan insert + 2 rollup upserts + old marks + marks UPDATE
+        # + histogram upsert + percentile lookup (+ savepoint)
+        with self.assertNumQueries(10):
+            self.submit(q1=0, q2=0, q3=0, q4=3)
+        self.assertEqual(ClientInformation.objects.get(user=self.user).marks, {'Anxiety': 40, 'Depression': 25})
+
+
+class ScoreTrendTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.ravi = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='x')
+        self.sita = CustomUser.objects.create_user(username='sita', email='sita@mail.com', password='x')
+
+    def scan(self, user, total):
+        answers = [min(3, max(0, total - 3 * i)) for i in range(4)]
+        row = {'user': user.id, **{f'q{i + 1}': answer for i, answer in enumerate(answers)}}
+        self.api.post('/api/depression-scan/', row, format='json')
+
+    def cells(self):
+        return set(ScoreRollup.objects.filter(count__gt=0).values_list('period', 'bucket_start', 'user', 'score', 'count'))
+
+    def test_rollups_follow_saves_bulk_and_deletes(self):
+        self.scan(self.ravi, 3)
+        self.scan(self.ravi, 9)
+        self.api.post('/api/depression-scan/bulk/', [{'user': self.sita.id, 'q1': 3, 'q2': 3, 'q3': 0, 'q4': 0}], format='json')
+        DepressionScan.objects.get(user=self.ravi, total_score=9).delete()
+
+        maintained = self.cells()
+        self.assertEqual(sum(count for period, _, user, _, count in maintained if period == 'week' and user is None), 2)
+        call_command('backfill_score_rollups', stdout=StringIO())
+        self.assertEqual(self.cells(), maintained)
+
+    def test_trends_read_rollups(self):
+        self.scan(self.ravi, 3)
+        self.scan(self.ravi, 9)
+        self.scan(self.sita, 6)
+        # ravi चा पहिला scan दोन आठवडे आधीचा
+        DepressionScan.objects.filter(total_score=3).update(created_at=timezone.now() - timedelta(days=14))
+        call_command('backfill_score_rollups', stdout=StringIO())
+
+        with self.assertNumQueries(1):
+            data = self.api.get('/api/score-trends/', {'period': 'week'}).json()
+        self.assertEqual([b['count'] for b in data['buckets']], [1, 2])
+        self.assertEqual(data['buckets'][1]['mean'], 7.5)
+        overall = data['overall']
+        self.assertEqual((overall['count'], overall['mean'], overall['min'], overall['max'], overall['p50']), (3, 6.0, 3, 9, 6))
+        self.assertEqual(sum(overall['distribution']), 3)
+        self.assertGreater(overall['slope_per_week'], 0)
+
+        cohort = self.api.get('/api/score-trends/', {'period': 'month', 'user': f'{self.sita.id}'}).json()
+        self.assertEqual(cohort['overall']['count'], 1)
+        self.assertEqual(self.api.get('/api/score-trends/', {'period': 'year'}).status_code, 400)
+        for user in ('x', '\u00b2', '-1'):
+            self.assertEqual(self.api.get('/api/score-trends/', {'user': user}).status_code, 400)
+        for dates in ({'date_from': '2026-02-30'}, {'date_to': '2026-02-30'}, {'date_to': 'soon'}):
+            self.assertEqual(self.api.get('/api/score-trends/', dates).status_code, 400)
+
+    def test_answers_out_of_range_are_rejected(self):
+        for answer in (-3, 4):
+            response = self.api.post('/api/depression-scan/', {'user': self.ravi.id, 'q1': answer, 'q2': 0, 'q3': 0, 'q4': 0}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('q1', response.json())
+        response = self.api.post('/api/depression-scan/bulk/', [{'user': self.ravi.id, 'q1': 30, 'q2': 0, 'q3': 0, 'q4': 0}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(DepressionScan.objects.exists())
+
+    def test_legacy_out_of_range_rows_do_not_break_trends(self):
+        self.scan(self.ravi, 6)
+        # validation आधी save झालेला scan: rollups मध्ये मोजला जात नाही
+        DepressionScan.objects.create(user=self.sita, q1=30, q2=0, q3=0, q4=0, total_score=30)
+        call_command('backfill_score_rollups', stdout=StringIO())
+        # आधीच साठलेला range बाहेरचा cell
+        ScoreRollup.objects.create(period='week', bucket_start=timezone.localdate(), user=None, score=30, count=1)
+
+        response = self.api.get('/api/score-trends/', {'period': 'week'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['overall']['count'], 1)
+
+
+class RollupMigrationTests(TransactionTestCase):
+    before = [('api', '0024_note_user_indexes')]
+    after = [('api', '0025_score_rollups')]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill_skips_out_of_range_scores(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        user = apps.get_model('api', 'CustomUser').objects.create(username='ravi', password='x')
+        for score in (-1, 5, 13):
+            apps.get_model('api', 'DepressionScan').objects.create(
+                user_id=user.id, q1=0, q2=0, q3=0, q4=0, total_score=score,
+            )
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        scores = set(apps.get_model('api', 'ScoreRollup').objects.values_list('score', flat=True))
+        self.assertEqual(scores, {5})
+
+
+class PercentileRankTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.users = [
+            CustomUser.objects.create_user(username=name, email=f'{name}@mail.com', password='x')
+            for name in ('ravi', 'sita', 'asha')
+        ]
+
+    def scan(self, user, q1, q2=0, q3=0, q4=0):
+        return self.api.post('/api/depression-scan/', {'user': user.id, 'q1': q1, 'q2': q2, 'q3': q3, 'q4': q4}, format='json')
+
+    def test_rank_follows_rescans(self):
+        ravi, sita, asha = self.users
+        self.assertEqual(self.scan(ravi, 3).data['percentile_rank'], 50.0)
+        self.scan(sita, 3, 3)
+        self.assertEqual(self.scan(asha, 3, 3, 3).data['percentile_rank'], 83.3)
+        # ravi चा जुना 25% histogram मधून निघतो
+        response = self.scan(ravi, 3, 3, 3, 3)
+        self.assertEqual((response.data['percentage'], response.data['percentile_rank']), (100, 83.3))
+        self.assertEqual(reconcile_counters(), {})
+
+    def test_client_information_payload_and_etag(self):
+        ravi, sita, _ = self.users
+        make_client_info(ravi, marks={'Anxiety': 40})
+        self.scan(ravi, 3)
+        url = f'/api/client-information/?user_id={ravi.id}'
+        response = self.api.get(url)
+        self.assertEqual(response.json()['percentile_ranks'], {'Anxiety': 50.0, 'Depression': 50.0})
+
+        # दुसऱ्या client चा scan: ravi ची row तशीच, पण rank बदलतो
+        self.scan(sita, 3, 3)
+        changed = self.api.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()['percentile_ranks']['Depression'], 25.0)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(CustomUser.objects.create_user(username='admin', password='x', is_staff=True))
+        self.ravi = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='x')
+        make_client_info(self.ravi, marks={'Depression': 25})
+        for total in (1, 2, 3):
+            DepressionScan.objects.create(user=self.ravi, q1=total, q2=0, q3=0, q4=0, total_score=total)
+        DepressionScan.objects.filter(total_score=1).update(created_at=timezone.now() - timedelta(days=10))
+
+    def body(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_with_fields_and_date_range(self):
+        since = (timezone.localdate() - timedelta(days=1)).isoformat()
+        response = self.api.get('/api/export/scans.csv', {'fields': 'user,total_score', 'date_from': since})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="scans-', response['Content-Disposition'])
+        self.assertEqual(self.body(response).splitlines(), ['user,total_score', f'{self.ravi.id},2', f'{self.ravi.id},3'])
+
+    def test_ndjson_clients(self):
+        lines = self.body(self.api.get('/api/export/clients.ndjson', HTTP_ACCEPT='application/x-ndjson')).splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual((row['user'], row['marks']), (self.ravi.id, {'Depression': 25}))
+
+    def test_timestamps_are_utc_in_both_formats(self):
+        params = {'fields': 'id,created_at'}
+        csv_rows = self.body(self.api.get('/api/export/scans.csv', params)).splitlines()[1:]
+        ndjson_rows = self.body(self.api.get('/api/export/scans.ndjson', params)).splitlines()
+        from_csv = [row.split(',')[1] for row in csv_rows]
+        self.assertEqual(from_csv, [json.loads(row)['created_at'] for row in ndjson_rows])
+        self.assertTrue(all(value.endswith('+00:00') for value in from_csv))
+
+    def test_rows_are_streamed_in_chunks(self):
+        with self.settings(EXPORT_CHUNK_SIZE=2):
+            chunks = list(self.api.get('/api/export/scans.csv').streaming_content)
+        # header, पहिली row लगेच, मग 2 rows चा chunk
+        self.assertEqual(len(chunks), 3)
+
+    def test_validation_and_permission(self):
+        self.assertEqual(self.api.get('/api/export/scans.csv', {'fields': 'password'}).status_code, 400)
+        self.assertEqual(self.api.get('/api/export/scans.csv', {'date_to': '18-10-2026'}).status_code, 400)
+        self.assertEqual(self.api.get('/api/export/clients.csv', {'date_from': '2026-02-30'}).status_code, 400)
+        self.assertEqual(self.api.get('/api/export/users.csv').status_code, 404)
+        self.assertEqual(APIClient().get('/api/export/scans.csv').status_code, 403)
+
+
+class ClientImportTests(TestCase):
+    HEADER = 'user,first_name,last_name,age,dob,email,mobile,marital_status,address,pin_code,state,district,job,marks\n'
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(CustomUser.objects.create_user(username='admin', password='x', is_staff=True))
+        self.ravi = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='x')
+
+    def row(self, user=None, age='30', email='ravi@mail.com', marks='"{""Depression"": 40}"'):
+        user = self.ravi.id if user is None else user
+        return f'{user},Ravi,Patil,{age},1995-01-01,{email},9999999999,Single,Pune,411001,MH,Pune,,{marks}\n'
+
+    def upload(self, text, **data):
+        data['file'] = SimpleUploadedFile('clients.csv', text.encode(), content_type='text/csv')
+        return self.api.post('/api/import/clients/', data, format='multipart')
+
+    def test_valid_rows_inserted_and_bad_rows_reported(self):
+        text = self.HEADER + self.row() + self.row(age='old') + self.row(user=999) + self.row(marks='{bad') + self.row()
+        response = self.upload(text, batch_size=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {k: response.data[k] for k in ('rows', 'valid', 'failed', 'created', 'batches')},
+            {'rows': 5, 'valid': 2, 'failed': 3, 'created': 2, 'batches': 3},
+        )
+        self.assertEqual(
+            [(e['line'], e['field']) for e in response.data['errors']],
+            [(3, 'age'), (4, 'user'), (5, 'marks')],
+        )
+        self.assertEqual(ClientInformation.objects.filter(user=self.ravi, marks={'Depression': 40}).count(), 2)
+        # bulk_create signals टाळतो: counters आणि histogram apply_deltas ने
+        self.assertEqual(reconcile_counters(), {})
+
+    def test_dry_run_and_missing_columns(self):
+        response = self.upload(self.HEADER + self.row(), dry_run='true')
+        self.assertEqual((response.data['valid'], response.data['created']), (1, 0))
+        self.assertFalse(ClientInformation.objects.exists())
+        response = self.upload('user,first_name\n1,Ravi\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('last_name', response.data['error'])
+        self.assertEqual(APIClient().post('/api/import/clients/').status_code, 403)
+
+    def test_export_round_trip_with_command_report(self):
+        make_client_info(self.ravi, marks={'Anxiety': 10}, stress_reason=['Work'])
+        export = b''.join(self.api.get('/api/export/clients.csv').streaming_content).decode()
+        with tempfile.TemporaryDirectory() as folder:
+            source, report = f'{folder}/clients.csv', f'{folder}/errors.csv'
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(export + export.splitlines()[1].replace('ravi@mail.com', 'not-an-email') + '\n')
+            out = StringIO()
+            call_command('import_clients', source, '--errors', report, stdout=out)
+            with open(report, encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines()[1:], ['3,email,Enter a valid email address.'])
+        self.assertIn('Imported 1 of 2 rows', out.getvalue())
+        copy = ClientInformation.objects.order_by('id').last()
+        self.assertEqual((copy.marks, copy.stress_reason), ({'Anxiety': 10}, ['Work']))
+        self.assertEqual(reconcile_counters(), {})
+
+
+class ParallelScanSubmitTests(TransactionTestCase):
+    def test_parallel_submissions_lose_no_updates(self):
+        user = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+        make_client_info(user, marks={'Anxiety': 40})
+        errors = []
+
+        def submit(n):
+            try:
+                response = APIClient().post('/api/depression-scan/', {
+                    'user': user.id, 'q1': n % 4, 'q2': 1, 'q3': 0, 'q4': 0,
+                }, format='json')
+                if response.status_code != 201:
+                    errors.append(response.status_code)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=submit, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(DepressionScan.objects.filter(user=user).count(), 8)
+        # शेवटचा commit झालेला scan आणि marks जुळले पाहिजेत
+        last_scan = DepressionScan.objects.filter(user=user).latest('id')
+        marks = ClientInformation.objects.get(user=user).marks
+        self.assertEqual(marks, {'Anxiety': 40, 'Depression': DepressionScan.score_percentage(last_scan.total_score)})
+
+
+class DepressionScanBulkTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.ravi = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+        self.sita = CustomUser.objects.create_user(username='sita', email='sita@mail.com', password='pass12345')
+        make_client_info(self.ravi, marks={'Anxiety': 40})
+
+    def test_valid_rows_are_saved_and_bad_rows_reported(self):
+        response = self.api.post('/api/depression-scan/bulk/', {'scans': [
+            {'user': self.ravi.id, 'q1': 1, 'q2': 1, 'q3': 1, 'q4': 1},
+            {'user': 9999, 'q1': 1, 'q2': 1, 'q3': 1, 'q4': 1},
+            {'user': self.ravi.id, 'q1': 3, 'q2': 3, 'q3': 3, 'q4': 3},
+            {'user': self.sita.id, 'q1': 'x', 'q2': 0, 'q3': 0, 'q4': 0},
+            {'user': self.sita.id, 'q1': 0, 'q2': 0, 'q3': 0, 'q4': 3},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (3, 2))
+        self.assertEqual([e['index'] for e in response.data['errors']], [1, 3])
+        self.assertEqual(DepressionScan.objects.filter(user=self.ravi).count(), 2)
+        # batch मधला शेवटचा scan marks मध्ये
+        self.assertEqual(ClientInformation.objects.get(user=self.ravi).marks, {'Anxiety': 40, 'Depression': 100})
+        self.assertEqual(ClientInformation.objects.get(user=self.sita).marks, {'Depression': 25})
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        users = [self.ravi]
+        for i in range(5):
+            users.append(CustomUser.objects.create_user(username=f'user{i}', password='x'))
+            make_client_info(users[-1], marks={'Anxiety': i})
+        # users वेगवेगळे आणि percentages वेगवेगळे: तरी marks साठी एकच UPDATE
+        rows = [{'user': users[i % 6].id, 'q1': i % 4, 'q2': i % 3, 'q3': 0, 'q4': 0} for i in range(60)]
+        # users lookup + savepoint + bulk insert + 2 rollup upserts + existing client info + marks update
+        # + histogram upsert + savepoint release
+        with self.assertNumQueries(9):
+            self.api.post('/api/depression-scan/bulk/', rows, format='json')
+
+        last = {row['user']: row for row in rows}
+        for user in users:
+            expected = DepressionScan.score_percentage(last[user.id]['q1'] + last[user.id]['q2'])
+            self.assertEqual(ClientInformation.objects.get(user=user).marks['Depression'], expected)
+        self.assertEqual(reconcile_counters(), {})
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        Counsellor.objects.create(name='Asha', email='asha@mail.com', specialization='CBT')
+
+    def test_counsellor_list_is_served_from_cache_until_a_counsellor_changes(self):
+        first = self.api.get('/api/counsellors/')
+        second = self.api.get('/api/counsellors/')
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.json(), second.json())
+
+        # query params वेगळे = वेगळी entry
+        self.assertEqual(self.api.get('/api/counsellors/', {'page_size': 1})['X-Cache'], 'MISS')
+
+        # invalidation commit नंतर होते
+        with self.captureOnCommitCallbacks(execute=True):
+            Counsellor.objects.create(name='Ravi', email='ravi@mail.com', specialization='Family')
+            self.assertEqual(self.api.get('/api/counsellors/')['X-Cache'], 'HIT')
+        third = self.api.get('/api/counsellors/')
+        self.assertEqual(third['X-Cache'], 'MISS')
+        self.assertEqual(len(third.json()['results']), 2)
+
+    def test_dashboard_summary_is_invalidated_by_new_client_info(self):
+        self.api.get('/api/dashboard-summary/')
+        self.assertEqual(self.api.get('/api/dashboard-summary/')['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_client_info(CustomUser.objects.create_user(username='ravi', password='pass12345'))
+        response = self.api.get('/api/dashboard-summary/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['stats']['clients'], 1)
+
+    def test_hit_ratio_is_exposed(self):
+        from .cache import cache_stats, reset_stats
+
+        reset_stats()
+        with self.settings(RESPONSE_CACHE_STATS_FLUSH_EVERY=3):
+            self.api.get('/api/counsellors/')
+            self.api.get('/api/counsellors/')
+            # अजून flush झाले नाही: GET मागे cache write नाही
+            self.assertIsNone(cache.get('mindspace:stats:hits'))
+            self.api.get('/api/counsellors/')
+            self.assertEqual(cache.get('mindspace:stats:hits'), 2)
+        self.assertEqual(cache_stats(), {'hits': 2, 'misses': 1, 'hit_ratio': 0.6667})
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.owner = CustomUser.objects.create_user(username='owner', password='x')
+        self.api.force_authenticate(self.owner)
+        self.note = Note.objects.create(user=self.owner, title='Call Ravi', content='Follow up on sleep')
+
+    def test_unchanged_list_returns_304_without_serializing(self):
+        etag = self.api.get('/api/notes/')['ETag']
+        with mock.patch('api.serializers.NoteSerializer.to_representation') as to_repr:
+            response = self.api.get('/api/notes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        to_repr.assert_not_called()
+
+    def test_etag_changes_on_update_delete_and_query(self):
+        etag = self.api.get('/api/notes/')['ETag']
+        self.assertNotEqual(self.api.get('/api/notes/', {'page_size': 5})['ETag'], etag)
+
+        Note.objects.create(user=self.owner, title='Second', content='...')
+        changed = self.api.get('/api/notes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+
+        Note.objects.filter(title='Second').delete()
+        self.assertEqual(self.api.get('/api/notes/', HTTP_IF_NONE_MATCH=changed['ETag']).status_code, 200)
+
+    def test_detail_honours_if_modified_since(self):
+        first = self.api.get(f'/api/notes/{self.note.id}/')
+        response = self.api.get(f'/api/notes/{self.note.id}/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_counsellor_list_answers_304_from_cache(self):
+        Counsellor.objects.create(name='Asha', email='asha@mail.com', specialization='CBT')
+        etag = self.api.get('/api/counsellors/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.api.get('/api/counsellors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_profile_and_client_information(self):
+        user = CustomUser.objects.create_user(username='ravi', password='pass12345')
+        make_client_info(user)
+        for url in (f'/api/profile/{user.id}/', f'/api/client-information/?user_id={user.id}'):
+            etag = self.api.get(url)['ETag']
+            self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class AsyncEndpointTests(TransactionTestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+
+    async def test_login_and_scan(self):
+        from django.test import AsyncClient
+
+        client = AsyncClient()
+        response = await client.post('/api/async/login/', {'username': 'ravi', 'password': 'pass12345'},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user_id'], self.user.id)
+        self.assertTrue(response.json()['token'])
+
+        failed = []
+        user_login_failed.connect(lambda **kwargs: failed.append(kwargs['credentials']['username']), weak=False,
+                                  dispatch_uid='test_async_login_failed')
+        try:
+            for username in ('ravi', 'nobody'):
+                wrong = await client.post('/api/async/login/', {'username': username, 'password': 'nope'},
+                                          content_type='application/json')
+                self.assertEqual(wrong.status_code, 401)
+            admin = await client.post('/api/async/admin-login/', {'username': 'ravi', 'password': 'pass12345'},
+                                      content_type='application/json')
+            self.assertEqual(admin.status_code, 401)
+        finally:
+            user_login_failed.disconnect(dispatch_uid='test_async_login_failed')
+        # authenticate() मधूनच: unknown user पण signal (आणि dummy hash) मधून जातो
+        self.assertEqual(failed, ['ravi', 'nobody'])
+
+        response = await client.post('/api/async/depression-scan/',
+                                     {'user': self.user.id, 'q1': 3, 'q2': 3, 'q3': 0, 'q4': 0},
+                                     content_type='application/json')
+        self.assertEqual(response.json()['percentage'], 50)
+        info = await client.get('/api/async/client-information/', {'user_id': self.user.id})
+        self.assertEqual(info.json()['marks'], {'Depression': 50})
+
+    async def test_login_with_profile_photo(self):
+        from django.test import AsyncClient
+
+        photo = await ProfileImage.objects.acreate(sha256='a' * 64, image='profiles/a.png', width=64, height=64)
+        self.user.profile_photo = photo
+        self.user.is_staff = True
+        await self.user.asave(update_fields=['profile_photo', 'is_staff'])
+
+        client = AsyncClient()
+        for url, key in (('/api/async/login/', 'user'), ('/api/async/admin-login/', 'admin')):
+            response = await client.post(url, {'username': 'ravi', 'password': 'pass12345'},
+                                         content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()[key]['id'], self.user.id)
+
+    async def test_appointment_keyset_pages(self):
+        from django.test import AsyncClient
+
+        client = AsyncClient()
+        for hour in range(3):
+            response = await client.post('/api/async/appointments/', {
+                'client_id': str(self.user.id), 'name': 'Ravi', 'date': '2026-03-01', 'time': f'1{hour}:00',
+            }, content_type='application/json')
+            self.assertEqual(response.status_code, 201)
+
+        with self.settings(ASYNC_PAGE_SIZE=2):
+            first = (await client.get('/api/async/appointments/', {'client_id': self.user.id})).json()
+            second = (await client.get(first['next'])).json()
+        self.assertEqual(len(first['results']), 2)
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next'])
+        invalid = await client.get('/api/async/appointments/', {'date_from': '2026-02-30'})
+        self.assertEqual(invalid.status_code, 400)
+        invalid = await client.get('/api/async/appointments/', {'client_id': 'abc'})
+        self.assertEqual(invalid.status_code, 400)
+        invalid = await client.get('/api/async/client-information/', {'user_id': 'abc'})
+        self.assertEqual(invalid.status_code, 400)
+
+    async def test_appointment_slot_conflict(self):
+        from django.test import AsyncClient
+
+        client = AsyncClient()
+        counsellor = await Counsellor.objects.acreate(name='Dr. Patil', email='patil@mail.com', specialization='CBT')
+        body = {'client_id': str(self.user.id), 'name': 'Ravi', 'counsellor': counsellor.id,
+                'date': '2026-03-02', 'time': '10:00'}
+        first = await client.post('/api/async/appointments/', body, content_type='application/json')
+        second = await client.post('/api/async/appointments/', body, content_type='application/json')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 409)
+
+
+class SeedDataCommandTests(TestCase):
+    def test_seeds_backdated_rows_and_refuses_to_run_twice(self):
+        from django.core.management.base import CommandError
+
+        call_command('seed_data', users=20, counsellors=2, appointments=30, notes=10, stdout=StringIO())
+
+        self.assertEqual(CustomUser.objects.filter(username__startswith='seed_user').count(), 20)
+        self.assertEqual(Counsellor.objects.count(), 2)
+        self.assertEqual(Appointment.objects.count(), 30)
+        # auto_now_add बंद असल्याने created_at भूतकाळात पसरलेले असतात
+        self.assertLess(Appointment.objects.earliest('created_at').created_at, timezone.now() - timedelta(days=1))
+        with self.assertRaises(CommandError):
+            call_command('seed_data', users=1)
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+
+    def test_server_timing_header_counts_queries(self):
+        with self.settings(REQUEST_METRICS_SAMPLE_RATE=1.0, SLOW_REQUEST_MS=None):
+            response = self.client.get('/api/client-information/', {'user_id': self.user.id})
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        self.assertIn('render;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_unsampled_requests_have_no_header(self):
+        with self.settings(REQUEST_METRICS_SAMPLE_RATE=0, SLOW_REQUEST_MS=None):
+            response = self.client.get('/api/counsellors/')
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_slow_request_logged_with_query_breakdown(self):
+        with self.settings(REQUEST_METRICS_SAMPLE_RATE=1.0, SLOW_REQUEST_MS=0):
+            with self.assertLogs('api.requests', level='WARNING') as logs:
+                self.client.get('/api/depression-scan/', {'user_id': self.user.id})
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], f'/api/depression-scan/?user_id={self.user.id}')
+        self.assertGreater(record['queries'], 0)
+        self.assertIsInstance(record['top_sql'], list)
+
+    def test_unsampled_slow_request_logged_with_query_totals(self):
+        with self.settings(REQUEST_METRICS_SAMPLE_RATE=0, SLOW_REQUEST_MS=0):
+            with self.assertLogs('api.requests', level='WARNING') as logs:
+                response = self.client.get('/api/depression-scan/', {'user_id': self.user.id})
+        self.assertFalse(response.has_header('Server-Timing'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertGreater(record['queries'], 0)
+        # per-statement breakdown फक्त sampled requests साठी
+        self.assertNotIn('top_sql', record)
+
+    def test_in_lists_of_any_length_count_as_one_statement(self):
+        from .middleware import RequestMetrics
+
+        metrics = RequestMetrics()
+        metrics.add_query('SELECT * FROM t WHERE id IN (%s, %s)', 0.001)
+        metrics.add_query('SELECT * FROM t WHERE id IN (%s, %s, %s)', 0.001)
+        metrics.add_query('SELECT 1', 0.001)
+        self.assertEqual(metrics.top_statements(5), [
+            {'sql': 'SELECT * FROM t WHERE id IN (%s, ...)', 'count': 2, 'ms': 2.0},
+        ])
+
+
+class ProfileImagePipelineTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = self.settings(MEDIA_ROOT=media.name, PROFILE_THUMBNAIL_SIZES=(32, 64))
+        override.enable()
+        self.addCleanup(override.disable)
+        self.media_root = media.name
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='pass12345')
+        self.other = CustomUser.objects.create_user(username='asha', email='asha@mail.com', password='pass12345')
+
+    def png(self, size=(300, 200), color='teal', name='avatar.png'):
+        buffer = BytesIO()
+        Image.new('RGB', size, color).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def upload(self, user, image):
+        with mock.patch('api.images.schedule_thumbnails') as schedule, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/profile/{user.id}/', {'profile_image': image}, format='multipart')
+        return response, schedule
+
+    def test_identical_uploads_are_stored_once(self):
+        first, schedule = self.upload(self.user, self.png())
+        second, schedule_again = self.upload(self.other, self.png(name='copy.png'))
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(ProfileImage.objects.count(), 1)
+        photo = ProfileImage.objects.get()
+        self.assertEqual((photo.width, photo.height), (300, 200))
+        schedule.assert_called_once_with(photo.pk)
+        schedule_again.assert_not_called()
+        self.user.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, self.other.profile_image.name)
+
+    def test_thumbnails_built_and_returned(self):
+        response, _ = self.upload(self.user, self.png())
+        self.assertEqual(response.json()['profile_thumbnails'], {})
+
+        photo = ProfileImage.objects.get()
+        build_thumbnails(photo)
+        with Image.open(photo.image.storage.path(photo.thumbnails['64'])) as thumb:
+            self.assertEqual((thumb.format, thumb.size), ('WEBP', (64, 64)))
+
+        thumbnails = self.client.get(f'/api/profile/{self.user.id}/').json()['profile_thumbnails']
+        self.assertEqual(set(thumbnails), {'32', '64'})
+        self.assertTrue(thumbnails['32'].endswith(f'/media/profiles/thumbs/{photo.sha256}_32.webp'))
+
+    def test_oversized_upload_rejected(self):
+        with self.settings(PROFILE_IMAGE_MAX_BYTES=100):
+            response, schedule = self.upload(self.user, self.png())
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('profile_image', response.json())
+        schedule.assert_not_called()
+
+    def test_build_thumbnails_command_links_legacy_duplicates(self):
+        data = self.png().read()
+        for user, name in ((self.user, 'profiles/a.png'), (self.other, 'profiles/a_copy.png')):
+            user.profile_image = default_storage.save(name, ContentFile(data))
+            user.save()
+
+        call_command('build_thumbnails', stdout=StringIO())
+
+        photo = ProfileImage.objects.get()
+        self.assertEqual(set(photo.thumbnails), {'32', '64'})
+        self.assertEqual(CustomUser.objects.filter(profile_photo=photo).count(), 2)
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = self.settings(MEDIA_ROOT=media.name, DEBUG=False, MEDIA_ACCEL=None)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.body = bytes(range(256)) * 40
+        self.hashed = default_storage.save(f"profiles/{'a' * 64}.png", ContentFile(self.body))
+        self.legacy = default_storage.save('profiles/avatar.png', ContentFile(self.body))
+
+    def get(self, path, **headers):
+        return self.client.get(f'/media/{path}', headers=headers)
+
+    def test_streams_file_with_validators_and_cache_headers(self):
+        response = self.get(self.hashed)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertNotIn('immutable', self.get(self.legacy)['Cache-Control'])
+
+        not_modified = self.get(self.hashed, if_none_match=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_byte_ranges(self):
+        response = self.get(self.hashed, range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.body)}')
+        self.assertEqual(b''.join(response.streaming_content), self.body[100:200])
+
+        suffix = self.get(self.hashed, range='bytes=-10')
+        self.assertEqual(b''.join(suffix.streaming_content), self.body[-10:])
+
+        self.assertEqual(self.get(self.hashed, range=f'bytes={len(self.body)}-').status_code, 416)
+        empty = default_storage.save('profiles/empty.png', ContentFile(b''))
+        unsatisfiable = self.get(empty, range='bytes=-10')
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(unsatisfiable['Content-Range'], 'bytes */0')
+        # If-Range जुना असेल तर पूर्ण फाईल
+        stale = self.get(self.hashed, range='bytes=0-9', if_range='"stale"')
+        self.assertEqual(stale.status_code, 200)
+
+    def test_missing_and_traversal_paths_404(self):
+        self.assertEqual(self.get('profiles/nope.png').status_code, 404)
+        self.assertEqual(self.get('../settings.py').status_code, 404)
+
+    def test_accel_redirect_hands_off_to_proxy(self):
+        with self.settings(MEDIA_ACCEL='nginx', MEDIA_ACCEL_PREFIX='/protected-media/'):
+            response = self.get(self.hashed)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.hashed}')
+        self.assertEqual(response.content, b'')
+
+
+class CounsellorAvailabilityTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.counsellor = Counsellor.objects.create(name='Dr. Patil', email='patil@mail.com', specialization='CBT')
+        self.day = timezone.localdate() + timedelta(days=3)
+
+    def book(self, hour_minute, **extra):
+        return self.client.post('/api/appointments/', {
+            'client_id': '7', 'name': 'Ravi', 'counsellor': self.counsellor.id,
+            'date': self.day.isoformat(), 'time': hour_minute, **extra,
+        }, format='json')
+
+    def test_double_booking_rejected_until_cancelled(self):
+        first = self.book('10:00')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(self.book('10:00').status_code, 409)
+
+        self.client.patch(f"/api/appointments/{first.json()['id']}/", {'status': 'Cancelled'}, format='json')
+        self.assertEqual(self.book('10:00').status_code, 201)
+        # रद्द झालेली booking पुन्हा सुरू केली तर slot आधीच गेला आहे
+        reopened = self.client.patch(f"/api/appointments/{first.json()['id']}/", {'status': 'Pending'}, format='json')
+        self.assertEqual(reopened.status_code, 409)
+
+    def test_off_grid_times_rejected(self):
+        response = self.book('10:30')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('time', response.json())
+
+    def test_database_constraint_blocks_overlap(self):
+        Appointment.objects.create(name='A', counsellor=self.counsellor, date=self.day, time='11:00')
+        with self.assertRaises(IntegrityError):
+            Appointment.objects.create(name='B', counsellor=self.counsellor, date=self.day, time='11:00')
+
+    def test_free_slots_skip_booked_and_overlapping_legacy_rows(self):
+        Appointment.objects.create(name='A', counsellor=self.counsellor, date=self.day, time='12:00')
+        # जुनी off-grid booking 10:30-11:30: 10:00 आणि 11:00 दोन्ही अडवते
+        Appointment.objects.create(name='B', counsellor=self.counsellor, date=self.day, time='10:30')
+        Appointment.objects.create(name='C', counsellor=self.counsellor, date=self.day, time='14:00', status='Cancelled')
+
+        response = self.client.get(f'/api/counsellors/{self.counsellor.id}/free-slots/', {
+            'date_from': self.day.isoformat(), 'date_to': (self.day + timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        days = response.json()['days']
+        self.assertEqual(days[0], {'date': self.day.isoformat(), 'slots': ['14:00:00', '17:00:00']})
+        self.assertEqual(len(days[1]['slots']), 5)
+
+        self.assertEqual(self.book('11:00').status_code, 409)
+
+    def test_free_slots_range_validated(self):
+        url = f'/api/counsellors/{self.counsellor.id}/free-slots/'
+        self.assertEqual(self.client.get(url, {'date_from': 'soon'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'date_from': '2026-02-30'}).status_code, 400)
+        too_long = {'date_from': self.day.isoformat(), 'date_to': (self.day + timedelta(days=40)).isoformat()}
+        self.assertEqual(self.client.get(url, too_long).status_code, 400)
+
+    def test_interval_index(self):
+        def at(hour, minute=0):
+            return datetime(2026, 1, 1, hour, minute)
+
+        index = IntervalIndex([(at(10), at(11)), (at(10, 30), at(11, 30)), (at(14), at(15))])
+        self.assertTrue(index.overlaps(at(11), at(12)))
+        self.assertFalse(index.overlaps(at(11, 30), at(12, 30)))
+        self.assertTrue(index.overlaps(at(13, 30), at(14, 30)))
+        self.assertFalse(index.overlaps(at(15), at(16)))
+        self.assertFalse(index.overlaps(at(9), at(10)))
+
+
+class CounsellorAssignmentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.cbt = Counsellor.objects.create(name='Dr. Patil', email='patil@mail.com', specialization='CBT')
+        self.depression = Counsellor.objects.create(name='Dr. Joshi', email='joshi@mail.com', specialization='Depression')
+
+    def load(self, counsellor):
+        counsellor.refresh_from_db()
+        return counsellor.current_load
+
+    def test_load_index_follows_appointments(self):
+        day = timezone.localdate() + timedelta(days=2)
+        appointment = Appointment.objects.create(name='A', counsellor=self.cbt, date=day, time='10:00')
+        self.assertEqual(self.load(self.cbt), 1)
+
+        appointment.counsellor = self.depression
+        appointment.save()
+        self.assertEqual((self.load(self.cbt), self.load(self.depression)), (0, 1))
+
+        appointment.status = 'Cancelled'
+        appointment.save()
+        self.assertEqual(self.load(self.depression), 0)
+
+        Appointment.objects.get(pk=appointment.pk).delete()
+        self.assertEqual(self.load(self.depression), 0)
+
+    def test_new_client_goes_to_least_loaded_counsellor(self):
+        Counsellor.objects.filter(pk=self.cbt.pk).update(current_load=3)
+        response = self.client.post('/api/clients/', {'name': 'Ravi', 'email': 'ravi@mail.com'}, format='json')
+        self.assertEqual(response.json()['counsellor'], 'Dr. Joshi')
+        self.assertEqual(self.load(self.depression), 1)
+
+    def test_specialization_match_outweighs_small_load_gap(self):
+        Counsellor.objects.filter(pk=self.cbt.pk).update(current_load=1)
+        Counsellor.objects.filter(pk=self.depression.pk).update(current_load=2)
+        client = Client.objects.create(name='Asha', email='asha@mail.com')
+        make_client_info(CustomUser.objects.create_user(username='asha', email='asha@mail.com', password='x'),
+                         marks={'Depression': 75})
+        self.assertEqual(assign_client(client), Counsellor.objects.get(pk=self.depression.pk))
+
+    def test_backlog_assigned_in_one_pass_and_load_consistent(self):
+        Counsellor.objects.create(name='Dr. Off', email='off@mail.com', specialization='CBT', is_active=False)
+        Client.objects.bulk_create([Client(name=f'C{i}', email=f'c{i}@mail.com') for i in range(10)])
+
+        admin = CustomUser.objects.create_user(username='admin', password='x', is_staff=True)
+        self.client.force_authenticate(admin)
+        response = self.client.post('/api/clients/assign-backlog/', {}, format='json')
+        self.assertEqual(response.json()['assigned'], 10)
+        self.assertEqual(response.json()['waiting'], 0)
+        self.assertEqual(self.load(self.cbt) + self.load(self.depression), 10)
+        self.assertLessEqual(abs(self.load(self.cbt) - self.load(self.depression)), 1)
+        self.assertEqual(reconcile_counters(), {})
+
+    def test_backlog_limit_must_be_positive(self):
+        Client.objects.bulk_create([Client(name=f'C{i}', email=f'c{i}@mail.com') for i in range(3)])
+        self.client.force_authenticate(CustomUser.objects.create_user(username='admin', password='x', is_staff=True))
+        for limit in (0, -1, 'x'):
+            response = self.client.post('/api/clients/assign-backlog/', {'limit': limit}, format='json')
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(waiting_clients().count(), 3)
+        response = self.client.post('/api/clients/assign-backlog/', {'limit': 2}, format='json')
+        self.assertEqual(response.json()['assigned'], 2)
+
+
+class MaintainedCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.staff = CustomUser.objects.create_user(username='dr', email='dr@mail.com', password='x', is_staff=True)
+        self.user = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='x')
+        self.counsellor = Counsellor.objects.create(name='Dr. Patil', email='patil@mail.com', specialization='CBT')
+
+    def stats(self):
+        cache.clear()
+        return self.api.get('/api/dashboard-summary/').json()['stats']
+
+    def test_dashboard_stats_follow_creates_deletes_and_staff_changes(self):
+        make_client_info(self.user)
+        appointment = Appointment.objects.create(name='A', date=date(2026, 5, 1), time='10:00')
+        self.assertEqual(self.stats(), {'counsellors': 1, 'clients': 1, 'appointments': 1})
+
+        self.user.is_staff = True
+        self.user.save()
+        appointment.delete()
+        self.assertEqual(self.stats(), {'counsellors': 2, 'clients': 1, 'appointments': 0})
+
+        # cascade: user delete केल्यावर त्याची client info पण जाते
+        CustomUser.objects.get(pk=self.user.pk).delete()
+        self.assertEqual(self.stats(), {'counsellors': 1, 'clients': 0, 'appointments': 0})
+        self.assertEqual(reconcile_counters(), {})
+
+    def test_bulk_scan_placeholders_counted(self):
+        self.api.post('/api/depression-scan/bulk/', {'scans': [
+            {'user': self.user.id, 'q1': 1, 'q2': 1, 'q3': 1, 'q4': 1},
+        ]}, format='json')
+        self.assertEqual(self.stats()['clients'], 1)
+
+    def test_total_sessions_counts_completed_appointments(self):
+        appointment = Appointment.objects.create(
+            name='A', counsellor=self.counsellor, date=date(2026, 5, 1), time='10:00',
+        )
+        before = self.api.get('/api/counsellors/').json()['results'][0]['total_sessions']
+
+        appointment.status = 'Completed'
+        with self.captureOnCommitCallbacks(execute=True):
+            appointment.save()
+        self.assertEqual(before, 0)
+        self.assertEqual(self.api.get('/api/counsellors/').json()['results'][0]['total_sessions'], 1)
+
+        appointment.status = 'Confirmed'
+        appointment.save()
+        self.counsellor.refresh_from_db()
+        self.assertEqual(self.counsellor.total_sessions, 0)
+
+    def test_counsellor_saves_never_write_counters(self):
+        self.api.force_authenticate(self.staff)
+        stale = Counsellor.objects.get(pk=self.counsellor.pk)
+        Appointment.objects.create(
+            name='A', counsellor=self.counsellor, date=date(2026, 5, 1), time='10:00', status='Completed',
+        )
+        response = self.api.patch(f'/api/counsellors/{self.counsellor.pk}/', {'total_sessions': 999}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # हातातल्या जुन्या instance चा save पण F() increments पुसत नाही
+        stale.specialization = 'Family'
+        stale.save()
+
+        self.counsellor.refresh_from_db()
+        self.assertEqual((self.counsellor.total_sessions, self.counsellor.current_load), (1, 0))
+        self.assertEqual(self.counsellor.specialization, 'Family')
+        self.assertEqual(reconcile_counters(), {})
+
+    def test_deferred_instance_saves_are_counted(self):
+        appointment = Appointment.objects.create(
+            name='A', counsellor=self.counsellor, date=date(2026, 5, 1), time='10:00',
+        )
+        for status in ('Completed', 'Confirmed', 'Completed'):
+            deferred = Appointment.objects.only('id', 'name').get(pk=appointment.pk)
+            deferred.status = status
+            deferred.save()
+        renamed = Appointment.objects.only('id', 'name').get(pk=appointment.pk)
+        renamed.name = 'B'
+        renamed.save()
+
+        self.counsellor.refresh_from_db()
+        self.assertEqual((self.counsellor.total_sessions, self.counsellor.current_load), (1, 0))
+        self.assertEqual(reconcile_counters(), {})
+
+    def test_reconcile_repairs_drift(self):
+        make_client_info(self.user)
+        StatCounter.objects.filter(name='clients').update(value=42)
+        Counsellor.objects.filter(pk=self.counsellor.pk).update(total_sessions=7)
+
+        out = StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('stat:clients: 42 -> 1', out.getvalue())
+        self.assertEqual(self.stats()['clients'], 1)
+        self.counsellor.refresh_from_db()
+        self.assertEqual(self.counsellor.total_sessions, 0)
+
+
+class NoteFeedTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.asha = CustomUser.objects.create_user(username='asha', email='asha@mail.com', password='x')
+        self.ravi = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='x')
+        Note.objects.bulk_create(
+            [Note(user=self.asha, title=f'A{i}', content='x', tag='Urgent' if i < 2 else 'General') for i in range(5)]
+            + [Note(user=self.ravi, title=f'R{i}', content='x', tag='Urgent') for i in range(4)]
+            + [Note(title='orphan', content='x')]
+        )
+        self.api.force_authenticate(self.asha)
+
+    def test_list_scoped_to_user_with_tag_filter(self):
+        ids = {r['user'] for r in self.api.get('/api/notes/').json()['results']}
+        self.assertEqual(ids, {self.asha.id})
+        urgent = self.api.get('/api/notes/', {'tag': 'Urgent'}).json()['results']
+        self.assertEqual(len(urgent), 2)
+
+        # ?user= ने दुसऱ्याच्या notes दिसत नाहीत
+        results = self.api.get('/api/notes/', {'user': self.ravi.id}).json()['results']
+        self.assertEqual({r['user'] for r in results}, {self.asha.id})
+        other = Note.objects.filter(user=self.ravi).first()
+        self.assertEqual(self.api.get(f'/api/notes/{other.id}/').status_code, 404)
+        self.assertEqual(self.api.delete(f'/api/notes/{other.id}/').status_code, 404)
+
+    def test_anonymous_callers_get_nothing(self):
+        anonymous = APIClient()
+        for url in ('/api/notes/', f'/api/notes/?user={self.asha.id}', '/api/notes/facets/'):
+            self.assertEqual(anonymous.get(url).status_code, 401)
+        self.assertEqual(anonymous.post('/api/notes/', {'title': 'x', 'content': 'x'}, format='json').status_code, 401)
+        anonymous.credentials(HTTP_AUTHORIZATION='Bearer undefined')
+        self.assertEqual(anonymous.get('/api/notes/').status_code, 401)
+
+    def test_login_token_opens_own_notes(self):
+        client = APIClient()
+        response = client.post('/api/login/', {'username': 'ravi', 'password': 'x'}, format='json')
+        token = response.json()['token']
+        # दुसऱ्या login ला तोच token
+        self.assertEqual(client.post('/api/login/', {'username': 'ravi', 'password': 'x'}, format='json').json()['token'], token)
+
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        results = client.get('/api/notes/').json()['results']
+        self.assertEqual({r['user'] for r in results}, {self.ravi.id})
+        self.assertEqual(client.post('/api/notes/', {'title': 'Mine', 'content': 'x'}, format='json').status_code, 201)
+        self.assertEqual(Note.objects.get(title='Mine').user, self.ravi)
+        # बाकीचे public endpoints header असूनही चालतात
+        self.assertEqual(client.get('/api/counsellors/').status_code, 200)
+
+    def test_facets_one_group_by(self):
+        with self.assertNumQueries(1):
+            data = self.api.get('/api/notes/facets/', {'tag': 'Urgent'}).json()
+        self.assertEqual(data, {"total": 5, "tags": [{"tag": "General", "count": 3}, {"tag": "Urgent", "count": 2}]})
+
+    def test_create_sets_owner(self):
+        self.api.post('/api/notes/', {'title': 'New', 'content': 'x', 'user': self.ravi.id}, format='json')
+        self.assertEqual(Note.objects.get(title='New').user, self.asha)
+
+
+class NoteSearchTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.ravi = CustomUser.objects.create_user(username='ravi', email='ravi@mail.com', password='x')
+        self.api.force_authenticate(self.ravi)
+        self.sleep = Note.objects.create(user=self.ravi, title='Sleep hygiene', content='Client reports better sleep after routine changes.')
+        self.work = Note.objects.create(user=self.ravi, title='Work stress', content='Discussed <b>deadlines</b>; sleep is poor.', tag='Urgent')
+        Note.objects.bulk_create([Note(user=self.ravi, title=f'Other {i}', content='Nothing relevant here.') for i in range(5)])
+
+    def search(self, **params):
+        return self.api.get('/api/notes/search/', params)
+
+    def test_ranked_highlighted_matches(self):
+        data = self.search(q='sleep').json()
+        results = data['results']
+        self.assertFalse(data['truncated'])
+        # title मधला match जास्त weight
+        self.assertEqual([r['id'] for r in results], [self.sleep.id, self.work.id])
+        self.assertEqual(results[0]['title_highlight'], '<mark>Sleep</mark> hygiene')
+        self.assertIn('&lt;b&gt;deadlines&lt;/b&gt;', results[1]['snippet'])
+        self.assertIn('<mark>sleep</mark>', results[1]['snippet'])
+
+    def test_prefix_tag_and_user_filter(self):
+        self.assertEqual([r['id'] for r in self.search(q='dead').json()['results']], [self.work.id])
+        self.assertEqual([r['id'] for r in self.search(q='urgent').json()['results']], [self.work.id])
+        # दुसऱ्याची note (आणि owner नसलेली) search मध्ये येत नाही; ?user= ने पण नाही
+        sita = CustomUser.objects.create_user(username='sita', email='sita@mail.com', password='x')
+        Note.objects.create(user=sita, title='Sleep diary', content='x')
+        Note.objects.create(title='Sleep log', content='x')
+        ids = [r['id'] for r in self.search(q='sleep', user=sita.id).json()['results']]
+        self.assertEqual(ids, [self.sleep.id, self.work.id])
+        self.assertEqual(APIClient().get('/api/notes/search/', {'q': 'sleep'}).status_code, 401)
+
+    def test_index_follows_updates_deletes_and_bulk_inserts(self):
+        self.work.title = 'Workload review'
+        self.work.content = 'Nothing about rest.'
+        self.work.save()
+        self.assertEqual([r['id'] for r in self.search(q='sleep').json()['results']], [self.sleep.id])
+
+        self.sleep.delete()
+        self.assertEqual(self.search(q='sleep').json()['results'], [])
+        self.assertEqual(len(self.search(q='relevant', page_size=10).json()['results']), 5)
+
+    def test_pagination_and_unsafe_query_text(self):
+        first = self.search(q='relevant', page_size=2).json()
+        second = self.api.get(first['next']).json()
+        self.assertEqual(len(first['results']), 2)
+        self.assertFalse({r['id'] for r in first['results']} & {r['id'] for r in second['results']})
+
+        # FTS5 syntax user कडून आला तरी error नाही
+        self.assertEqual(self.search(q='sleep" OR title:*').status_code, 200)
+        self.assertEqual(self.search(q='   ').status_code, 400)
+
+    @override_settings(NOTE_SEARCH_WINDOW=1)
+    def test_ranking_window_keeps_newest_matches(self):
+        # window 1: फक्त सर्वात नवीन match (work) rank होतो, आणि response तसे सांगतो
+        data = self.search(q='sleep').json()
+        self.assertEqual([r['id'] for r in data['results']], [self.work.id])
+        self.assertTrue(data['truncated'])
+        self.assertFalse(self.search(q='hygiene').json()['truncated'])
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command('rebuild_note_index', '--optimize', stdout=out)
+        self.assertIn('Indexed 7 notes', out.getvalue())
+        self.assertEqual(len(self.search(q='sleep').json()['results']), 2)
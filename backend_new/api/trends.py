@@ -0,0 +1,120 @@
+"""
+Depression-score trends from the ScoreRollup cells (api/rollups.py).
+
+The cells of the requested range are loaded with one query and scattered
+into a (buckets x scores) count matrix; every statistic is then array math
+over that matrix, so the cost depends on the number of buckets, not scans.
+"""
+import math
+
+import numpy as np
+from django.conf import settings
+
+from .models import DepressionScan, ScoreRollup
+
+SCORES = np.arange(DepressionScan.MAX_SCORE + 1)
+
+
+def load_cells(period, date_from, date_to, user_ids=None):
+    cells = ScoreRollup.objects.filter(
+        period=period, bucket_start__gte=date_from, bucket_start__lte=date_to, count__gt=0,
+    )
+    # user_ids नसेल तर population cells (user NULL)
+    cells = cells.filter(user_id__in=user_ids) if user_ids else cells.filter(user__isnull=True)
+    return list(cells.values_list('bucket_start', 'score', 'count'))
+
+
+def histogram_matrix(cells):
+    """(bucket starts, counts[bucket, score]); a cohort's users are summed per cell."""
+    # 0..MAX_SCORE बाहेरचा legacy cell पूर्ण trend बिघडवू नये: तो वगळा
+    cells = [cell for cell in cells if 0 <= cell[1] < len(SCORES)]
+    if not cells:
+        return np.array([], dtype='datetime64[D]'), np.zeros((0, len(SCORES)), dtype=np.int64)
+    starts, scores, counts = zip(*cells)
+    buckets, row = np.unique(np.array(starts, dtype='datetime64[D]'), return_inverse=True)
+    matrix = np.zeros((len(buckets), len(SCORES)), dtype=np.int64)
+    np.add.at(matrix, (row, np.array(scores)), np.array(counts))
+    return buckets, matrix
+
+
+def high_score_threshold():
+    # DEPRESSION_SPECIALIST_THRESHOLD (%) -> किमान total_score
+    percent = getattr(settings, 'DEPRESSION_SPECIALIST_THRESHOLD', 50)
+    return math.ceil(percent * DepressionScan.MAX_SCORE / 100)
+
+
+def summarize(matrix):
+    """Per-row count, mean, std, min, max, p50, p90 and high-score share."""
+    counts = matrix.sum(axis=1)
+    safe = np.maximum(counts, 1)
+    means = (matrix @ SCORES) / safe
+    variance = (matrix @ SCORES ** 2) / safe - means ** 2
+    seen = matrix > 0
+    cumulative = matrix.cumsum(axis=1)
+
+    def percentile(q):
+        # nearest-rank: cumulative count ceil(q * n) पर्यंत पोहोचणारा पहिला score
+        return (cumulative >= np.ceil(q * counts)[:, None]).argmax(axis=1)
+
+    return {
+        "count": counts,
+        "mean": means,
+        "std": np.sqrt(np.maximum(variance, 0)),
+        "min": seen.argmax(axis=1),
+        "max": SCORES[-1] - seen[:, ::-1].argmax(axis=1),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "high_share": matrix[:, high_score_threshold():].sum(axis=1) / safe,
+    }
+
+
+def _period_index(period, buckets):
+    if period == 'month':
+        return buckets.astype('datetime64[M]').astype(np.int64)
+    return buckets.astype(np.int64) // 7
+
+
+def slope(period, buckets, means, counts):
+    """Least-squares change of the mean score per week/month, weighted by scans per bucket."""
+    if len(buckets) < 2:
+        return None
+    x = _period_index(period, buckets).astype(float)
+    weights = counts / counts.sum()
+    x_mean, y_mean = weights @ x, weights @ means
+    spread = weights @ (x - x_mean) ** 2
+    if not spread:
+        return None
+    return float(weights @ ((x - x_mean) * (means - y_mean)) / spread)
+
+
+def _row(stats, i):
+    return {
+        "count": int(stats["count"][i]),
+        "mean": round(float(stats["mean"][i]), 2),
+        "std": round(float(stats["std"][i]), 2),
+        "min": int(stats["min"][i]),
+        "max": int(stats["max"][i]),
+        "p50": int(stats["p50"][i]),
+        "p90": int(stats["p90"][i]),
+        "high_share": round(float(stats["high_share"][i]), 4),
+    }
+
+
+def score_trends(period, date_from, date_to, user_ids=None):
+    buckets, matrix = histogram_matrix(load_cells(period, date_from, date_to, user_ids))
+    per_bucket = summarize(matrix)
+    overall_matrix = matrix.sum(axis=0, keepdims=True)
+    overall = summarize(overall_matrix)
+
+    rows = []
+    for i, start in enumerate(buckets):
+        row = {"start": str(start), **_row(per_bucket, i)}
+        row["distribution"] = matrix[i].tolist()
+        rows.append(row)
+
+    summary = _row(overall, 0) if matrix.size else None
+    if summary:
+        summary["distribution"] = overall_matrix[0].tolist()
+        trend = slope(period, buckets, per_bucket["mean"], per_bucket["count"])
+        summary["slope_per_" + period] = round(trend, 4) if trend is not None else None
+    return {"buckets": rows, "overall": summary}
@@ -1,6 +1,4 @@
 from django.urls import path, include  # ✅ 'include' ॲड केले आहे
-from django.conf import settings
-from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter  # ✅ हे इंपोर्ट करणे गरजेचे आहे
 
 from .views import (
@@ -10,6 +8,8 @@ from .views import (
     LoginView,
     SaveLanguageView,
     DepressionScanView,
+    DepressionScanBulkView,
+    ScoreTrendView,
     ClientInformationView,
     AdminLoginView,
     AdminRegisterView,
@@ -17,14 +17,25 @@ from .views import (
     ResetPasswordConfirmView,
     AppointmentViewSet,
     DashboardSummaryView,
+    DashboardClientListView,
+    CacheStatsView,
     CounsellorViewSet,
     ClientViewSet,
     NoteViewSet,
     AdminClientInfoListView,
+    ExportView,
+    ClientImportView,
     AdminUserListView,
     CounsellorSignupView,
     UserSettingView,
 )
+from .async_views import (
+    AsyncLoginView,
+    AsyncAdminLoginView,
+    AsyncDepressionScanView,
+    AsyncClientInformationView,
+    AsyncAppointmentView,
+)
 
 # १. ViewSet साठी Router सेटअप करा
 router = DefaultRouter()
@@ -49,24 +60,35 @@ urlpatterns = [
 
     path('save-language/', SaveLanguageView.as_view(), name='save_language'),
     path('depression-scan/', DepressionScanView.as_view(), name='depression_scan'),
+    path('depression-scan/bulk/', DepressionScanBulkView.as_view(), name='depression_scan_bulk'),
+    path('score-trends/', ScoreTrendView.as_view(), name='score_trends'),
     path('client-information/', ClientInformationView.as_view(), name='client_information'),
 
     # ---------------- Admin & Dashboard ----------------
     path('admin-register/', AdminRegisterView.as_view(), name='admin_register'),
     path('admin-login/', AdminLoginView.as_view(), name='admin_login'),
+    path('counsellor-signup/', CounsellorSignupView.as_view(), name='counsellor_signup'),
     path("profile/<int:user_id>/", ProfileView.as_view(), name='profile'),
     path("change-password/<int:user_id>/", ChangePasswordView.as_view(), name='change_password'),
     path('admin-users/', AdminUserListView.as_view(), name='admin_user_list'),
     path('dashboard-summary/', DashboardSummaryView.as_view(), name='dashboard_summary'),
+    path('dashboard-clients/', DashboardClientListView.as_view(), name='dashboard_clients'),
+    path('cache-stats/', CacheStatsView.as_view(), name='cache_stats'),
     # ✅ हे नवीन ॲड करा: यामुळे क्लायंट लिस्टमध्ये मार्क्स दिसतील
         path('admin/all-clients/', AdminClientInfoListView.as_view(), name='admin_all_clients'),
+    # पूर्ण export stream: /api/export/clients.csv, /api/export/scans.ndjson
+    path('export/<slug:dataset>.<slug:output>', ExportView.as_view(), name='export'),
+    # CSV import (export/clients.csv सारखेच columns)
+    path('import/clients/', ClientImportView.as_view(), name='import_clients'),
 
        path('user-settings/', UserSettingView.as_view(), name='user-settings'),
+
+    # ---------------- Async (ASGI) variants ----------------
+    path('async/login/', AsyncLoginView.as_view(), name='async_login'),
+    path('async/admin-login/', AsyncAdminLoginView.as_view(), name='async_admin_login'),
+    path('async/depression-scan/', AsyncDepressionScanView.as_view(), name='async_depression_scan'),
+    path('async/client-information/', AsyncClientInformationView.as_view(), name='async_client_information'),
+    path('async/appointments/', AsyncAppointmentView.as_view(), name='async_appointments'),
 ]
 
-# ✅ MEDIA FILES (profile images)
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT
-    )
\ No newline at end of file
+# MEDIA FILES (profile images) आता backend_new/urls.py मधून api.media.serve_media ने
@@ -4,13 +4,23 @@ from rest_framework import status, viewsets  # <--- इथे 'viewsets' ॲड
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import IsAdminUser
+from rest_framework.authentication import SessionAuthentication
 import random # फाईलच्या वरती इंपोर्ट करा
-from django.core.mail import send_mail
 from django.contrib.auth import authenticate
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from django.http import StreamingHttpResponse
+from django.db.models import OuterRef, Subquery, Case, Count, CharField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework.decorators import action
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
 from .models import CustomUser, Counsellor, UserSetting  # ✅ 'UserSetting' ॲड करा
 
 from .models import (
@@ -26,12 +36,35 @@ from .models import (
 from .serializers import (
     UserSerializer,
     NoteSerializer,
+    NoteSearchResultSerializer,
     DepressionScanSerializer,
     ClientInformationSerializer,
     AppointmentSerializer,
     CounsellorSerializer,
     ClientSerializer,
-
+    DashboardClientSerializer,
+    BulkDepressionScanSerializer,
+)
+from .outbox import enqueue_mail
+from .availability import SlotTaken, free_slots
+from .counters import apply_deltas, created_deltas, read_stats, set_mark_deltas
+from .percentiles import load_table, percentile_rank
+from .search import search_notes
+from .rollups import PERIODS, period_start
+from .trends import score_trends
+from .imports import ImportFileError, import_clients, text_stream
+from .exports import DATASETS, FORMATS, ExportError, PassthroughRenderer, export_queryset, select_columns, stream_rows
+from .assignment import UNASSIGNED, assign_backlog, assign_client, waiting_clients
+from .db_functions import JSONSetKey
+from .cache import cache_response, cache_stats, invalidate
+from .conditional import ConditionalGetMixin, conditional_get
+from .authentication import BearerTokenAuthentication, issue_token
+from .pagination import (
+    CreatedAtCursorPagination,
+    IdCursorPagination,
+    UserCursorPagination,
+    DashboardClientPagination,
+    paginated_response,
 )
 
 
@@ -70,6 +103,7 @@ class LoginView(APIView):
                     first_time = not bool(user.preferred_language)
                     return Response({
                         "message": "Login successful",
+                        "token": issue_token(user),  # Auth.js हा access_token म्हणून ठेवतो
                         "user_id": user.id,  # React ला थेट आयडी मिळण्यासाठी ही ओळ सोपी पडते
                         "user": UserSerializer(user).data,
                         "first_time": first_time
@@ -122,8 +156,60 @@ class SaveLanguageView(APIView):
 # -------------------------------
 # Depression Scan API
 # -------------------------------
-from datetime import date
+from collections import Counter
+from datetime import date, timedelta
+
+
+def placeholder_client_info(user, percentage):
+    """Scan आधी client form भरला नसेल तर वापरायची (unsaved) ClientInformation."""
+    return ClientInformation(
+        user=user,
+        first_name=user.username,
+        last_name='Pending',
+        age=0,
+        dob=date(2000, 1, 1),
+        email=user.email or "example@mail.com",
+        mobile='0000000000',
+        marital_status='Single',
+        address='Pending',
+        pin_code='000000',
+        state='Pending',
+        district='Pending',
+        marks={"Depression": percentage},
+    )
+
+
+def save_scan(serializer):
+    """Scan save करा आणि marks["Depression"] अपडेट करा (caller transaction उघडतो)."""
+    scan = serializer.save()
+    user = scan.user
+
+    # स्कोअर टक्केवारी कॅल्क्युलेशन (१२ पैकी)
+    percentage = DepressionScan.score_percentage(scan.total_score)
+
+    # जुने marks: score histogram मधून जुनी value काढण्यासाठी (PostgreSQL वर row lock)
+    old_marks = list(
+        ClientInformation.objects.select_for_update().filter(user=user).values_list('marks', flat=True)
+    )
+    if not old_marks:
+        # पहिल्यांदाच scan: placeholder ClientInformation तयार करा
+        placeholder_client_info(user, percentage).save()
+        return scan, percentage
+
+    # फक्त marks["Depression"] एकाच UPDATE मध्ये बदला (इतर marks सुरक्षित राहतात)
+    ClientInformation.objects.filter(user=user).update(
+        marks=JSONSetKey('marks', 'Depression', percentage),
+        updated_at=timezone.now(),  # update() auto_now लावत नाही
+    )
+    # update() post_save signal पाठवत नाही: histogram स्वतः हलवा; recent_clients मध्ये marks दिसतात
+    apply_deltas(set_mark_deltas(old_marks, 'Depression', percentage))
+    invalidate('dashboard')
+    return scan, percentage
+
+
 class DepressionScanView(APIView):
+    pagination_class = CreatedAtCursorPagination
+
     def get(self, request):
         user_id = request.query_params.get('user_id')
 
@@ -132,57 +218,179 @@ class DepressionScanView(APIView):
             scans = DepressionScan.objects.filter(user_id=user_id).order_by('-created_at')
         else:
             # २. जर user_id नसेल, तर सर्व स्कॅन्स द्या (Counsellor Dashboard साठी) ✅
-            scans = DepressionScan.objects.all().order_by('-created_at')
+            scans = DepressionScan.objects.all()
 
-        serializer = DepressionScanSerializer(scans, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginated_response(self, request, scans, DepressionScanSerializer)
     # २. डेटा सेव्ह करण्यासाठी (POST) - तुझा जुना कोड ✅
     def post(self, request):
         serializer = DepressionScanSerializer(data=request.data)
 
         if serializer.is_valid():
-            scan = serializer.save()
-            user = scan.user
-
-            # ClientInformation अपडेट किंवा तयार करा
-            client_info, created = ClientInformation.objects.get_or_create(
-                user=user,
-                defaults={
-                    'first_name': user.username,
-                    'last_name': 'Pending',
-                    'age': 0,
-                    'dob': date(2000, 1, 1),
-                    'email': user.email or "example@mail.com",
-                    'mobile': '0000000000',
-                    'marital_status': 'Single',
-                    'address': 'Pending',
-                    'pin_code': '000000',
-                    'state': 'Pending',
-                    'district': 'Pending',
-                    'marks': {}
-                }
-            )
-
-            # स्कोअर टक्केवारी कॅल्क्युलेशन (१२ पैकी)
-            percentage = round((scan.total_score / 12) * 100)
-
-            # JSONField मधील 'marks' अपडेट करा
-            marks = dict(client_info.marks) if client_info.marks else {}
-            marks["Depression"] = percentage
-            client_info.marks = marks
-            client_info.save()
+            # scan insert + marks update एकाच छोट्या transaction मध्ये
+            with transaction.atomic():
+                scan, percentage = save_scan(serializer)
 
             return Response({
                 "message": "Assessment saved successfully",
                 "total_score": scan.total_score,
-                "percentage": percentage
+                "percentage": percentage,
+                # सगळ्या clients मध्ये कुठे: maintained histogram मधून
+                "percentile_rank": percentile_rank('Depression', percentage),
             }, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+# -------------------------------
+# Bulk Depression Scan import
+# -------------------------------
+class DepressionScanBulkView(APIView):
+    """
+    Offline (camp/kiosk) scans ची batch एकाच request मध्ये.
+    Invalid rows चे errors index सह परत येतात, बाकीच्या rows save होतात.
+    """
+    max_batch_size = 5000
+
+    def post(self, request):
+        rows = request.data.get('scans') if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            return Response({"error": "Send a non-empty list of scans"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.max_batch_size:
+            return Response(
+                {"error": f"At most {self.max_batch_size} scans per batch"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # सगळे users एकाच query मध्ये
+        user_ids = set()
+        for row in rows:
+            try:
+                user_ids.add(int(row.get('user')))
+            except (AttributeError, TypeError, ValueError):
+                pass
+        users = CustomUser.objects.in_bulk(user_ids)
+
+        scans, errors = [], []
+        for index, row in enumerate(rows):
+            serializer = BulkDepressionScanSerializer(data=row, context={'users': users})
+            if serializer.is_valid():
+                scans.append(serializer.build_instance())
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+
+        if scans:
+            with transaction.atomic():
+                DepressionScan.objects.bulk_create(scans, batch_size=500)
+                # bulk_create signals पाठवत नाही: score rollups स्वतः पुढे ढकला
+                apply_deltas(created_deltas(scans))
+                self._update_marks(scans)
+
+        return Response({
+            "created": len(scans),
+            "failed": len(errors),
+            "errors": errors,
+        }, status=status.HTTP_201_CREATED if scans else status.HTTP_400_BAD_REQUEST)
+
+    def _update_marks(self, scans):
+        # प्रत्येक user साठी batch मधला शेवटचा scan च marks मध्ये जातो
+        latest = {}
+        for scan in scans:
+            latest[scan.user_id] = scan
+
+        existing = {}
+        rows = ClientInformation.objects.select_for_update().filter(user_id__in=latest).values_list('user_id', 'marks')
+        for user_id, marks in rows:
+            existing.setdefault(user_id, []).append(marks)
+
+        placeholders = []
+        deltas = Counter()
+        by_percentage = {}
+        for user_id, scan in latest.items():
+            percentage = DepressionScan.score_percentage(scan.total_score)
+            if user_id in existing:
+                by_percentage.setdefault(percentage, []).append(user_id)
+                deltas.update(set_mark_deltas(existing[user_id], 'Depression', percentage))
+            else:
+                placeholders.append(placeholder_client_info(scan.user, percentage))
+        if by_percentage:
+            # सगळ्या users साठी एकच UPDATE: percentage नुसार CASE (जास्तीत जास्त 13 branches)
+            value = Case(
+                *[When(user_id__in=user_ids, then=Value(percentage)) for percentage, user_ids in by_percentage.items()],
+                output_field=IntegerField(),
+            )
+            ClientInformation.objects.filter(user_id__in=[u for ids in by_percentage.values() for u in ids]).update(
+                marks=JSONSetKey('marks', 'Depression', value),
+                updated_at=timezone.now(),
+            )
+        ClientInformation.objects.bulk_create(placeholders, batch_size=500)
+        # update() आणि bulk_create signals पाठवत नाहीत: clients counter आणि score histogram
+        deltas.update(created_deltas(placeholders))
+        apply_deltas(deltas)
+        invalidate('dashboard')
+
+
+# -------------------------------
+# Depression score trends (rollups only)
+# -------------------------------
+class ScoreTrendView(APIView):
+    """
+    ?period=week|month[&user=<id>,<id>][&date_from=&date_to=]
+
+    Per-bucket and overall count/mean/std/min/max/p50/p90 for one user, a
+    cohort of users, or (no user) everybody. Reads only ScoreRollup.
+    """
+    default_span_days = {'week': 26 * 7, 'month': 365}
+    max_span_days = 5 * 365
+    max_cohort_size = 500
+
+    def get(self, request):
+        params = request.query_params
+        period = params.get('period', 'week')
+        if period not in PERIODS:
+            return Response({"error": "period must be 'week' or 'month'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # isdigit() '²' सारखे characters पण मानतो, int() नाही: थेट int() ने तपासा
+            user_ids = [int(value) for value in params.get('user', '').split(',') if value.strip()]
+        except ValueError:
+            user_ids = None
+        if user_ids is None or any(user_id < 0 for user_id in user_ids):
+            return Response({"error": "user must be a comma-separated list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(user_ids) > self.max_cohort_size:
+            return Response({"error": f"At most {self.max_cohort_size} users"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # 2026-02-30 सारखी अशक्य तारीख ValueError देते, चुकीचा format None
+            date_to = parse_date(params.get('date_to', '')) if params.get('date_to') else timezone.localdate()
+            date_from = parse_date(params.get('date_from', '')) if params.get('date_from') else None
+        except ValueError:
+            date_to = None
+        if date_to is None or (params.get('date_from') and date_from is None):
+            return Response({"error": "Use valid YYYY-MM-DD dates"}, status=status.HTTP_400_BAD_REQUEST)
+        date_from = date_from or date_to - timedelta(days=self.default_span_days[period])
+        if date_from > date_to or (date_to - date_from).days > self.max_span_days:
+            return Response(
+                {"error": f"date_from must be before date_to and at most {self.max_span_days} days apart"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # range मध्ये सुरू झालेल्या bucket पासून: date_from च्या week/month चा पहिला दिवस
+        date_from = period_start(period, date_from)
+        data = score_trends(period, date_from, date_to, user_ids or None)
+        return Response({
+            "period": period,
+            "date_from": date_from,
+            "date_to": date_to,
+            "users": [int(value) for value in user_ids] or None,
+            **data,
+        })
+
+
 # -------------------------------
 # Client Information API
 # -------------------------------
 class ClientInformationView(APIView):
+    pagination_class = CreatedAtCursorPagination
+
     # १. नवीन माहिती सेव्ह करण्यासाठी (POST)
     def post(self, request):
         serializer = ClientInformationSerializer(data=request.data)
@@ -198,20 +406,35 @@ class ClientInformationView(APIView):
     def get(self, request):
         user_id = request.query_params.get("user_id")
 
+        # percentile_ranks इतर clients च्या scans ने बदलतात, row न बदलता: histogram ETag मध्ये.
+        # त्याच कारणाने Last-Modified वर 304 नाही
+        percentiles = load_table()
         if user_id:
             # जर URL मध्ये ?user_id= असेल तर एका युजरचा डेटा द्या
             try:
-                info = ClientInformation.objects.filter(user_id=user_id).first()
-                if not info:
-                    return Response({"message": "No data found for this user"}, status=404)
-                return Response(ClientInformationSerializer(info).data, status=200)
+                infos = ClientInformation.objects.filter(user_id=user_id)
+                return conditional_get(
+                    request, infos, lambda: self._single_client_info(infos, percentiles),
+                    salt=percentiles.digest,
+                )
             except Exception as e:
                 return Response({"error": str(e)}, status=400)
         else:
             # जर user_id नसेल तर सर्व क्लायंटची लिस्ट द्या (डॅशबोर्डसाठी) ✅
-            all_clients = ClientInformation.objects.all().order_by('-created_at')
-            serializer = ClientInformationSerializer(all_clients, many=True)
-            return Response(serializer.data, status=200)
+            all_clients = ClientInformation.objects.all()
+            return conditional_get(
+                request, all_clients,
+                lambda: paginated_response(
+                    self, request, all_clients, ClientInformationSerializer, context={'percentiles': percentiles},
+                ),
+                salt=percentiles.digest,
+            )
+
+    def _single_client_info(self, infos, percentiles):
+        info = infos.first()
+        if not info:
+            return Response({"message": "No data found for this user"}, status=404)
+        return Response(ClientInformationSerializer(info, context={'percentiles': percentiles}).data, status=200)
 
 
 # -------------------------------
@@ -255,6 +478,7 @@ class AdminLoginView(APIView):
         if user and user.is_staff:
             return Response({
                 "message": "Admin login successful",
+                "token": issue_token(user),
                 "admin": UserSerializer(user).data
             })
 
@@ -268,15 +492,20 @@ class ProfileView(APIView):
     parser_classes = [MultiPartParser, FormParser]
 
     def get(self, request, user_id):
-        try:
-            user = CustomUser.objects.get(id=user_id)
-            return Response(UserSerializer(user, context={"request": request}).data)
-        except CustomUser.DoesNotExist:
+        users = CustomUser.objects.filter(id=user_id).select_related('profile_photo')
+        return conditional_get(
+            request, users, lambda: self._profile(request, users), check_last_modified=True,
+        )
+
+    def _profile(self, request, users):
+        user = users.first()
+        if user is None:
             return Response({"error": "User not found"}, status=404)
+        return Response(UserSerializer(user, context={"request": request}).data)
 
     def patch(self, request, user_id):
         try:
-            user = CustomUser.objects.get(id=user_id)
+            user = CustomUser.objects.select_related('profile_photo').get(id=user_id)
             serializer = UserSerializer(
                 user, data=request.data, partial=True,
                 context={"request": request}
@@ -332,7 +561,8 @@ class ForgotPasswordView(APIView):
 
             reset_link = f"http://localhost:3000/reset-password/{uid}/{token}"
 
-            send_mail(
+            # SMTP request मध्येच न करता outbox मध्ये टाका, send_outbox worker पाठवेल
+            enqueue_mail(
                 "MindSpace - Password Reset",
                 f"Reset link:\n{reset_link}",
                 "support@mindspace.com",
@@ -371,13 +601,22 @@ class ResetPasswordConfirmView(APIView):
 class AdminUserListView(APIView):
     # permission_classes = [IsAdminUser]  <-- हे कमेंट करा 🛑
     permission_classes = [] # <-- हे ॲड करा ✅ (सर्वांसाठी खुला करण्यासाठी)
+    pagination_class = UserCursorPagination
 
     def get(self, request):
-        users = CustomUser.objects.filter(is_staff=False)
+        paginator = self.pagination_class()
+        users = paginator.paginate_queryset(
+            CustomUser.objects.filter(is_staff=False), request, view=self
+        )
+        # प्रत्येक युजरसाठी वेगळी query न करता, सर्व Client एकाच query मध्ये (email नुसार)
+        clients_by_email = {
+            client.email: client
+            for client in Client.objects.filter(email__in={user.email for user in users})
+        }
         combined_data = []
 
         for user in users:
-            client_entry = Client.objects.filter(email=user.email).first()
+            client_entry = clients_by_email.get(user.email)
 
             combined_data.append({
                 "id": user.id,
@@ -393,16 +632,109 @@ class AdminUserListView(APIView):
                 "status": client_entry.status if client_entry else "Pending",
             })
 
-        return Response(combined_data)
+        return paginator.get_paginated_response(combined_data)
+# -------------------------------
+# Admin - streaming exports
+# -------------------------------
+class ExportView(APIView):
+    """
+    /api/export/<clients|scans>.<csv|ndjson>[?fields=a,b][&date_from=&date_to=]
+
+    Streams every matching row (created_at range, inclusive local dates)
+    in constant memory; AdminClientInfoListView stays the paginated view.
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [JSONRenderer, PassthroughRenderer]
+
+    def get(self, request, dataset, output):
+        if dataset not in DATASETS or output not in FORMATS:
+            return Response(
+                {"error": f"Export one of {sorted(DATASETS)} as one of {sorted(FORMATS)}"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        params = request.query_params
+        dates = {}
+        for name in ('date_from', 'date_to'):
+            if params.get(name):
+                try:
+                    dates[name] = parse_date(params[name])
+                except ValueError:
+                    # 2026-02-30: format बरोबर, तारीख अशक्य
+                    dates[name] = None
+                if dates[name] is None:
+                    return Response({"error": f"{name}: use YYYY-MM-DD format"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            columns = select_columns(dataset, params.get('fields'))
+        except ExportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = export_queryset(dataset, columns, **dates)
+        response = StreamingHttpResponse(stream_rows(queryset, columns, output), content_type=FORMATS[output])
+        response['Content-Disposition'] = f'attachment; filename="{dataset}-{timezone.localdate():%Y%m%d}.{output}"'
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+class ClientImportView(APIView):
+    """
+    POST /api/import/clients/ (multipart: file=<csv>[, batch_size][, dry_run])
+
+    Same columns as export/clients.csv. Valid rows are inserted batch by
+    batch (api/imports.py); rejected rows come back as {line, field, error}.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser, FormParser]
+    max_batch_size = 5000
+    # response मध्ये इतक्याच errors; पूर्ण report साठी manage.py import_clients --errors
+    max_reported_errors = 1000
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the CSV as 'file'"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            batch_size = int(request.data.get('batch_size') or settings.IMPORT_BATCH_SIZE)
+        except ValueError:
+            return Response({"error": "batch_size must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= batch_size <= self.max_batch_size:
+            return Response(
+                {"error": f"batch_size must be between 1 and {self.max_batch_size}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+
+        errors = []
+        try:
+            result = import_clients(
+                text_stream(upload.file), batch_size=batch_size, dry_run=dry_run, on_error=errors.extend,
+            )
+        except ImportFileError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except UnicodeDecodeError:
+            # आधीचे batches commit झाले असतील; ते counts नाहीत म्हणून स्पष्ट सांगा
+            return Response(
+                {"error": "File is not UTF-8 text; rows before the bad bytes may already be imported"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response({
+            **result,
+            "dry_run": dry_run,
+            "errors": errors[:self.max_reported_errors],
+            "errors_truncated": len(errors) > self.max_reported_errors,
+        }, status=status.HTTP_200_OK)
+
+
 # -------------------------------
 # Admin - Client Information
 # -------------------------------
 class AdminClientInfoListView(APIView):
     permission_classes = [IsAdminUser]
+    pagination_class = CreatedAtCursorPagination
 
     def get(self, request):
         data = ClientInformation.objects.all()
-        return Response(ClientInformationSerializer(data, many=True).data)
+        return paginated_response(self, request, data, ClientInformationSerializer)
 
 
 # -------------------------------
@@ -428,55 +760,292 @@ class AppointmentView(APIView):
 # -------------------------------
 # User Appointment Search
 # -------------------------------
-class AppointmentViewSet(viewsets.ModelViewSet):
+class AppointmentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Appointment.objects.all().order_by("-created_at")
     serializer_class = AppointmentSerializer
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+
+        params = self.request.query_params
+        # History.js अजूनही ?user= पाठवतो, तो client_id सारखाच आहे
+        client_id = params.get('client_id') or params.get('user')
+        if client_id:
+            queryset = queryset.filter(client_id=client_id)
+
+        date_from = self._parse_date_param('date_from')
+        date_to = self._parse_date_param('date_to')
+        if date_from:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(date__lte=date_to)
+
+        if params.get('status'):
+            queryset = queryset.filter(status=params['status'])
+        if params.get('mode'):
+            queryset = queryset.filter(mode=params['mode'])
+        if params.get('counsellor'):
+            queryset = queryset.filter(counsellor_id=params['counsellor'])
+        return queryset
+
+    # serializer ने slot तपासला, पण दोन requests एकाच वेळी आल्या तर DB constraint पकडतो
+    def perform_create(self, serializer):
+        self._save_slot(serializer)
+
+    def perform_update(self, serializer):
+        self._save_slot(serializer)
+
+    @staticmethod
+    def _save_slot(serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise SlotTaken()
+
+    def _parse_date_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            # '2026-02-30' सारखी अशक्य तारीख: parse_date None नाही, ValueError देतो
+            parsed = parse_date(value)
+        except ValueError:
+            raise ValidationError({name: "Not a valid date."})
+        if parsed is None:
+            raise ValidationError({name: "Use YYYY-MM-DD format."})
+        return parsed
 
 class DashboardSummaryView(APIView):
     # जर फक्त ॲडमिनला दाखवायचे असेल तर IsAdminUser वापरा
     # permission_classes = [IsAdminUser]
 
+    @cache_response('dashboard')
     def get(self, request):
         try:
-            # १. आकडेवारी (Stats) गोळा करा
-            total_counsellors = CustomUser.objects.filter(is_staff=True).count()
-            total_clients = ClientInformation.objects.count()
-            total_appointments = Appointment.objects.count()
+            # १. आकडेवारी (Stats): तीन COUNT(*) ऐवजी maintained counters (api/counters.py)
+            stats = read_stats()
 
             # २. टेबलसाठी अलीकडील १० क्लायंट्सची माहिती
             recent_clients = ClientInformation.objects.all().order_by('-created_at')[:10]
             client_serializer = ClientInformationSerializer(recent_clients, many=True)
 
             return Response({
-                "stats": {
-                    "counsellors": total_counsellors,
-                    "clients": total_clients,
-                    "appointments": total_appointments
-                },
+                "stats": stats,
                 "recent_clients": client_serializer.data
             }, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+# -------------------------------
+# Response cache hit/miss counters
+# -------------------------------
+class CacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+# -------------------------------
+# Counsellor Dashboard - merged client rows
+# -------------------------------
+class DashboardClientListView(APIView):
+    """
+    Client + latest DepressionScan + percentage + today's appointment count,
+    joined in the database so the dashboard doesn't have to pull every
+    client, scan and appointment to merge them in the browser.
+    """
+    pagination_class = DashboardClientPagination
+    # pie chart चे bands: latest scan percentage >= किमान % (scan नसेल तर 0 %)
+    severity_bands = (('Severe', 70), ('Moderate', 40), ('Healthy', 0))
+
+    def severity_counts(self, latest_scan):
+        """All clients per severity band, in one aggregate query (not just this page)."""
+        bands = {name: [] for name, _ in self.severity_bands}
+        for score in range(DepressionScan.MAX_SCORE + 1):
+            percentage = DepressionScan.score_percentage(score)
+            bands[next(name for name, minimum in self.severity_bands if percentage >= minimum)].append(score)
+        filters = {name: Q(latest_score__in=scores) for name, scores in bands.items()}
+        filters[self.severity_bands[-1][0]] |= Q(latest_score__isnull=True)
+        return ClientInformation.objects.annotate(
+            latest_score=Subquery(latest_scan.values('total_score')[:1]),
+        ).aggregate(**{name: Count('id', filter=condition) for name, condition in filters.items()})
+
+    def get(self, request):
+        today = timezone.localdate()
+
+        latest_scan = DepressionScan.objects.filter(
+            user_id=OuterRef('user_id')
+        ).order_by('-created_at', '-id')
+
+        # AppointmentPage.js stores the user id as a string in client_id
+        todays_appointments = Appointment.objects.filter(
+            client_id=Cast(OuterRef('user_id'), output_field=CharField()),
+            date=today,
+        ).order_by().values('client_id').annotate(c=Count('id')).values('c')
+
+        rows = ClientInformation.objects.annotate(
+            latest_score=Subquery(latest_scan.values('total_score')[:1]),
+            latest_scan_at=Subquery(latest_scan.values('created_at')[:1]),
+            today_appointments=Coalesce(
+                Subquery(todays_appointments, output_field=IntegerField()), Value(0)
+            ),
+        ).order_by('-created_at', '-id')
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(rows, request, view=self)
+        serializer = DashboardClientSerializer(page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+
+        response.data["stats"] = {
+            "counsellors": Counsellor.objects.count(),
+            "clients": paginator.page.paginator.count,
+            "today_appointments": Appointment.objects.filter(date=today).count(),
+            "severity": self.severity_counts(latest_scan),
+        }
+        return response
+
 # -------------------------------
 # Counsellor API (ViewSet) - ✅ हा स्वतंत्र असावा
 # -------------------------------
-class CounsellorViewSet(viewsets.ModelViewSet):
+class CounsellorViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Counsellor.objects.all()
     serializer_class = CounsellorSerializer
+    pagination_class = CreatedAtCursorPagination
+    max_free_slot_days = 31
+
+    # AppointmentPage.js आणि CounsellorList.js दोन्ही हीच list वापरतात
+    @cache_response('counsellors')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=True, methods=['get'], url_path='free-slots')
+    def free_slots(self, request, pk=None):
+        counsellor = self.get_object()
+        params = request.query_params
+        try:
+            date_from = parse_date(params.get('date_from', '')) if params.get('date_from') else timezone.localdate()
+            date_to = parse_date(params.get('date_to', '')) if params.get('date_to') else date_from
+        except ValueError:
+            # format बरोबर पण तारीख अशक्य (2026-02-30)
+            date_from = date_to = None
+        if date_from is None or date_to is None:
+            return Response({"error": "Use valid YYYY-MM-DD dates for date_from/date_to."}, status=400)
+        if date_to < date_from or (date_to - date_from).days >= self.max_free_slot_days:
+            return Response({"error": f"date range must be 1-{self.max_free_slot_days} days."}, status=400)
+
+        days = free_slots(counsellor.pk, date_from, date_to)
+        return Response({
+            "counsellor": counsellor.pk,
+            "slot_minutes": settings.APPOINTMENT_SLOT_MINUTES,
+            "days": [
+                {"date": day, "slots": [start.strftime('%H:%M:%S') for start in slots]}
+                for day, slots in days.items()
+            ],
+        })
 
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
+    pagination_class = IdCursorPagination
+
+    def perform_create(self, serializer):
+        client = serializer.save()
+        # नवीन client 'On Hold' असेल तर लगेच least-loaded counsellor
+        if settings.AUTO_ASSIGN_CLIENTS and client.counsellor == UNASSIGNED and not client.assigned_counsellor_id:
+            assign_client(client)
+
+    @action(detail=True, methods=['post'])
+    def assign(self, request, pk=None):
+        client = self.get_object()
+        counsellor = assign_client(client, need=request.data.get('need'))
+        if counsellor is None:
+            return Response({"error": "No active counsellor available"}, status=409)
+        return Response(self.get_serializer(client).data)
+
+    @action(detail=False, methods=['post'], url_path='assign-backlog', permission_classes=[IsAdminUser])
+    def assign_backlog(self, request):
+        limit = request.data.get('limit')
+        try:
+            limit = int(limit) if limit not in (None, '') else None
+        except (TypeError, ValueError):
+            return Response({"limit": "Must be an integer."}, status=400)
+        if limit is not None and limit < 1:
+            return Response({"limit": "Must be at least 1."}, status=400)
+        per_counsellor = assign_backlog(limit=limit)
+        return Response({
+            "assigned": sum(per_counsellor.values()),
+            "per_counsellor": per_counsellor,
+            "waiting": waiting_clients().count(),
+        })
 
 
 # -------------------------------
 # Notes API
 # -------------------------------
-class NoteViewSet(viewsets.ModelViewSet):
+class NoteViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Note.objects.all().order_by('-created_at') # नवीन नोट्स आधी दिसतील
     serializer_class = NoteSerializer
+    pagination_class = CreatedAtCursorPagination
+    # notes खाजगी: फक्त login केलेला user (login token, api/authentication.py), आणि त्याच्याच notes
+    # (list, detail, facets, search सगळीकडे). Token फक्त इथे: जुन्या "Bearer undefined" headers मुळे
+    # बाकीचे public endpoints 401 देऊ नयेत
+    authentication_classes = [BearerTokenAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+    search_page_size = 20
+    max_search_page_size = 100
+
+    def get_queryset(self):
+        # note_user_created_idx: फक्त या user च्या rows
+        queryset = super().get_queryset().filter(user=self.request.user)
+        tag = self.request.query_params.get('tag')
+        if tag and self.action == 'list':
+            queryset = queryset.filter(tag=tag)
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    # {"total": N, "tags": [{"tag": .., "count": ..}]}: एकच GROUP BY, ?tag= लागू होत नाही
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        rows = (
+            self.get_queryset().order_by()
+            .values('tag').annotate(count=Count('id'))
+            .order_by('-count', 'tag')
+        )
+        tags = list(rows)
+        return Response({"total": sum(row['count'] for row in tags), "tags": tags})
+
+    # ?q=<text>[&offset=N][&page_size=N]; स्वतःच्या notes मध्ये, rank नुसार, FTS5 (api/search.py)
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        params = request.query_params
+        try:
+            offset = max(int(params.get('offset', 0)), 0)
+            page_size = min(max(int(params.get('page_size', self.search_page_size)), 1), self.max_search_page_size)
+        except ValueError:
+            return Response({"error": "offset and page_size must be integers"}, status=400)
+        if not params.get('q', '').strip():
+            return Response({"error": "q is required"}, status=400)
+
+        notes, has_more, truncated = search_notes(params['q'], limit=page_size, offset=offset, user_id=self.request.user.pk)
+        next_url = None
+        if has_more:
+            query = params.copy()
+            query['offset'] = offset + page_size
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        return Response({
+            "next": next_url,
+            # true: फक्त सर्वात नवीन NOTE_SEARCH_WINDOW matches rank झाले, जुने matches वगळले
+            "truncated": truncated,
+            "results": NoteSearchResultSerializer(notes, many=True).data,
+        })
 
 class CounsellorSignupView(APIView):
     def post(self, request):
@@ -487,28 +1056,33 @@ class CounsellorSignupView(APIView):
                 return Response({"error": "हे युजरनेम आधीच वापरले आहे."}, status=400)
 
             # २. आधी 'CustomUser' तयार करा (हा लॉगिनसाठी लागतोच)
-            user = CustomUser.objects.create_user(
+            user = CustomUser(
                 username=data.get('username'),
-                email=data.get('email'),
-                password=data.get('password'),
+                email=CustomUser.objects.normalize_email(data.get('email')),
                 first_name=data.get('name', '').split(' ')[0],
                 is_staff=True # जेणेकरून तो कौन्सिलर पोर्टल वापरू शकेल
             )
+            # password hashing हळू असते, म्हणून ते transaction च्या बाहेर
+            user.set_password(data.get('password'))
 
             # ३. कौन्सिलर आयडी तयार करा
             random_id = f"CNSL{random.randint(100, 999)}"
 
-            # ४. ✅ सर्वात महत्त्वाचे: 'Counsellor' टेबलमध्ये डेटा साठवा
-            counsellor_profile = Counsellor.objects.create(
-                user=user,                     # हा युजरला कौन्सिलरशी जोडतो
-                counsellor_id=random_id,
-                name=data.get('name'),         # React मधून आलेले Full Name
-                email=data.get('email'),
-                specialization=data.get('specialization', 'General')
-            )
+            # user + counsellor + settings: तिन्ही एकत्र save होतील किंवा एकही नाही
+            with transaction.atomic():
+                user.save()
+
+                # ४. ✅ सर्वात महत्त्वाचे: 'Counsellor' टेबलमध्ये डेटा साठवा
+                counsellor_profile = Counsellor.objects.create(
+                    user=user,                     # हा युजरला कौन्सिलरशी जोडतो
+                    counsellor_id=random_id,
+                    name=data.get('name'),         # React मधून आलेले Full Name
+                    email=data.get('email'),
+                    specialization=data.get('specialization', 'General')
+                )
 
-            # ५. कौन्सिलरसाठी सेटिंग्स तयार करा (Settings पेज चालण्यासाठी)
-            UserSetting.objects.get_or_create(counsellor=counsellor_profile)
+                # ५. कौन्सिलरसाठी सेटिंग्स तयार करा (Settings पेज चालण्यासाठी)
+                UserSetting.objects.get_or_create(counsellor=counsellor_profile)
 
             return Response({
                 "message": "Counsellor registered successfully! 🎉",
@@ -558,7 +1132,7 @@ class UserSettingView(APIView):
 
             counsellor.specialization = data.get('specialization', counsellor.specialization)
             counsellor.phone = data.get('phone', counsellor.phone)
-            counsellor.save()
+            counsellor.save(update_fields=['name', 'specialization', 'phone', 'updated_at'])
 
             # २. User Preferences अपडेट
             setting.language = data.get('language', setting.language)
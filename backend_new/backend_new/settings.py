@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+import django
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # ======================
@@ -21,6 +24,8 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
+    'rest_framework.authtoken',  # login token (api/authentication.py)
+
     'api',  # ✅ your app
 ]
 
@@ -28,6 +33,7 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 # ======================
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -67,16 +73,43 @@ TEMPLATES = [
 # ======================
 WSGI_APPLICATION = 'backend_new.wsgi.application'
 
+# ======================
+# ASGI (api/async_views.py)
+# ======================
+# uvicorn backend_new.asgi:application
+ASYNC_HASH_WORKERS = 4   # password hashing साठी threads
+ASYNC_PAGE_SIZE = 50
+
 # ======================
 # DATABASE (SQLite – STABLE ✅)
 # ======================
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # benchmarks/load tests स्वतःची DB file MINDSPACE_DB_PATH ने देतात
+        'NAME': os.environ.get('MINDSPACE_DB_PATH', BASE_DIR / 'db.sqlite3'),
+        # in-memory test DB threads मध्ये "table is locked" देतो; ParallelScanSubmitTests (threads)
+        # आणि AsyncEndpointTests (sync_to_async threads) साठी file लागते. File .gitignore मध्ये आहे.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# Opt-in production profile: MINDSPACE_SQLITE_PROFILE=production
+# WAL मुळे readers writers ला block करत नाहीत; busy timeout मुळे "database is locked" ऐवजी थोडे थांबतो
+SQLITE_PROFILE = os.environ.get('MINDSPACE_SQLITE_PROFILE', 'default')
+SQLITE_PRAGMAS = {}
+if SQLITE_PROFILE == 'production':
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('MINDSPACE_SQLITE_BUSY_TIMEOUT', '20'))
+    DATABASES['default']['OPTIONS'] = {'timeout': SQLITE_BUSY_TIMEOUT}
+    if django.VERSION >= (5, 1):
+        # write transaction सुरुवातीलाच lock घेते, म्हणजे read->write upgrade वर deadlock होत नाही
+        DATABASES['default']['OPTIONS']['transaction_mode'] = 'IMMEDIATE'
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': SQLITE_BUSY_TIMEOUT * 1000,
+    }
+
 # ======================
 # CUSTOM USER MODEL
 # ======================
@@ -119,6 +152,16 @@ CORS_ALLOW_CREDENTIALS = True
 # ======================
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# api/media.py: Django स्वतः stream करतो, किंवा MEDIA_ACCEL=nginx|sendfile असल्यास proxy कडे सोपवतो
+SERVE_MEDIA = True
+MEDIA_ACCEL = os.environ.get('MINDSPACE_MEDIA_ACCEL') or None
+MEDIA_ACCEL_PREFIX = '/protected-media/'  # nginx: location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+MEDIA_CACHE_MAX_AGE = 3600  # hash नसलेल्या (जुन्या) फाइल्ससाठी
+PROFILE_IMAGE_MAX_BYTES = 5 * 1024 * 1024
+PROFILE_IMAGE_MAX_PIXELS = 40_000_000
+# square WebP thumbnails (px); api/images.py background pool मध्ये तयार होतात
+PROFILE_THUMBNAIL_SIZES = (64, 128, 256)
+THUMBNAIL_WORKERS = 2
 
 
 # settings.py
@@ -128,4 +171,83 @@ EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = 'vaibhavbawaskar995@gmail.com'
-EMAIL_HOST_PASSWORD = 'liiq fmuy wbti qgoa' # जो आता तयार केला तो
\ No newline at end of file
+EMAIL_HOST_PASSWORD = 'liiq fmuy wbti qgoa' # जो आता तयार केला तो
+# ======================
+# CACHE (read-heavy endpoints)
+# ======================
+# default local-memory; अनेक worker processes असतील तर MINDSPACE_CACHE_DIR देऊन file cache वापरा
+if os.environ.get('MINDSPACE_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['MINDSPACE_CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'mindspace',
+        }
+    }
+RESPONSE_CACHE_TIMEOUT = 300  # seconds
+# hit/miss counts process मध्ये जमा होतात; इतक्या lookups नंतर एकदाच cache मध्ये लिहितात
+RESPONSE_CACHE_STATS_FLUSH_EVERY = 100
+
+# ForgotPasswordView मेल्स outbox मध्ये टाकतो; `python manage.py send_outbox --loop` त्या पाठवतो
+OUTBOX_MAX_ATTEMPTS = 5
+# Sending मध्ये इतका वेळ अडकलेली मेल (worker crash) परत पाठवली जाते
+OUTBOX_LEASE_SECONDS = 300
+
+# ======================
+# REQUEST METRICS (api/middleware.py)
+# ======================
+# sampled requests ना Server-Timing header (SQL count/time, render, total)
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('MINDSPACE_METRICS_SAMPLE_RATE', '0.1'))
+# यापेक्षा हळू requests 'api.requests' logger वर JSON record म्हणून log होतात: query count/DB time
+# सगळ्यांचे, repeated SQL (top_sql) फक्त sampled requests चे. None = slow log बंद
+SLOW_REQUEST_MS = int(os.environ.get('MINDSPACE_SLOW_REQUEST_MS', '500'))
+SLOW_REQUEST_TOP_SQL = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.requests': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+# ======================
+# APPOINTMENT SLOTS (api/availability.py)
+# ======================
+# AppointmentPage.js मधले slots; प्रत्येक booking एक slot अडवते
+APPOINTMENT_SLOT_MINUTES = 60
+APPOINTMENT_SLOT_TIMES = ['10:00', '11:00', '12:00', '14:00', '17:00']
+
+# ======================
+# COUNSELLOR ASSIGNMENT (api/assignment.py)
+# ======================
+AUTO_ASSIGN_CLIENTS = True
+# यापेक्षा जास्त Depression % असलेल्या clients ना 'Depression' specialization ला प्राधान्य
+DEPRESSION_SPECIALIST_THRESHOLD = 50
+
+# ======================
+# NOTE SEARCH (api/search.py)
+# ======================
+# फक्त सर्वात नवीन इतके matches rank होतात: सामान्य शब्दांसाठी search ms मध्ये राहतो
+NOTE_SEARCH_WINDOW = int(os.environ.get('MINDSPACE_NOTE_SEARCH_WINDOW', '5000'))
+
+# ======================
+# EXPORTS (api/exports.py)
+# ======================
+# DB कडून एका वेळी इतक्या rows; response पण इतक्या rows चे chunks पाठवतो
+EXPORT_CHUNK_SIZE = 2000
+
+# ======================
+# IMPORTS (api/imports.py)
+# ======================
+# एका transaction मध्ये इतक्या rows validate + bulk_create; चूक असलेली row फक्त report मध्ये
+IMPORT_BATCH_SIZE = int(os.environ.get('MINDSPACE_IMPORT_BATCH_SIZE', '1000'))
@@ -1,14 +1,17 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 # ✅ हे दोन इम्पॉर्ट्स ॲड करा
 from django.conf import settings
-from django.conf.urls.static import static
+
+from api.media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
 ]
 
-# ✅ डेव्हलपमेंट मोडमध्ये मीडिया फाइल्स सर्व्ह करण्यासाठी हे जोडा
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# ✅ मीडिया फाइल्स (profile images): DEBUG बंद असतानाही; proxy असेल तर MEDIA_ACCEL
+if settings.SERVE_MEDIA:
+    urlpatterns += [
+        re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$", serve_media, name='media'),
+    ]
@@ -0,0 +1,122 @@
+"""
+WSGI vs ASGI throughput for the login and scan-submit endpoints.
+
+Starts `manage.py runserver` (threaded WSGI, sync DRF views) and uvicorn
+(ASGI, api/async_views.py) against the same throwaway SQLite database and
+drives both with the same number of concurrent keep-alive clients.
+
+    python benchmarks/bench_asgi.py --concurrency 32 --requests 400
+
+Needs uvicorn installed. db.sqlite3 is never touched.
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from harness import BASE_DIR, free_port, percentile, start_server
+
+SCENARIOS = {
+    # name: (WSGI path, ASGI path, body factory)
+    'login': ('/api/login/', '/api/async/login/',
+              lambda n: {'username': f'bench{n % 50}', 'password': 'bench-pass-123'}),
+    'scan submit': ('/api/depression-scan/', '/api/async/depression-scan/',
+                    lambda n: {'user': 1 + n % 50, 'q1': n % 4, 'q2': 1, 'q3': 2, 'q4': 0}),
+}
+
+
+def prepare_database(env):
+    script = (
+        "import django; django.setup()\n"
+        "from django.core.management import call_command\n"
+        "from api.models import CustomUser\n"
+        "call_command('migrate', verbosity=0)\n"
+        "for i in range(50):\n"
+        "    CustomUser.objects.create_user(username=f'bench{i}', email=f'bench{i}@mail.com', password='bench-pass-123')\n"
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=BASE_DIR, env=env, check=True)
+
+
+def drive(port, path, body_factory, total, concurrency):
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(n):
+        nonlocal errors
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        body = json.dumps(body_factory(n))
+        started = time.perf_counter()
+        try:
+            conn.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            local.conn = None
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'rps': total / wall,
+        'p50': percentile(latencies, 50) * 1000,
+        'p95': percentile(latencies, 95) * 1000,
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200, help="Requests per scenario per server.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'backend_new.settings',
+            'MINDSPACE_DB_PATH': str(Path(tmp) / 'bench.sqlite3'),
+            'MINDSPACE_SQLITE_PROFILE': 'production',
+        }
+        prepare_database(env)
+
+        results = {}
+        for kind in ('wsgi', 'asgi'):
+            port = free_port()
+            server = start_server(kind, port, env)
+            try:
+                for name, (wsgi_path, asgi_path, body) in SCENARIOS.items():
+                    path = wsgi_path if kind == 'wsgi' else asgi_path
+                    results[(name, kind)] = drive(port, path, body, args.requests, args.concurrency)
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f'concurrency={args.concurrency} requests={args.requests}')
+    print(f'{"scenario":<14}{"server":<8}{"req/s":>9}{"p50 ms":>10}{"p95 ms":>10}{"errors":>8}')
+    for (name, kind), r in results.items():
+        print(f'{name:<14}{kind:<8}{r["rps"]:>9.1f}{r["p50"]:>10.1f}{r["p95"]:>10.1f}{r["errors"]:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""
+Index benchmark for the hot lookup columns in api.models.
+
+Builds a throwaway SQLite database, drops the indexes added by the index
+migration, seeds it, and prints EXPLAIN QUERY PLAN + timings for each hot
+query. It then re-creates those indexes and runs the same queries again.
+
+    python benchmarks/bench_indexes.py --users 20000 --scans-per-user 5
+
+db.sqlite3 is never touched.
+"""
+import argparse
+import importlib
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+INDEX_MIGRATION = 'api.migrations.0016_hot_path_indexes'
+
+
+def setup_django(db_path):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_new.settings')
+    from django.conf import settings
+    import django
+
+    django.setup()
+    settings.DATABASES['default']['NAME'] = db_path
+
+
+def index_operations():
+    from django.db import migrations
+
+    module = importlib.import_module(INDEX_MIGRATION)
+    return [op for op in module.Migration.operations if isinstance(op, migrations.AddIndex)]
+
+
+def drop_indexes():
+    from django.apps import apps
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for op in index_operations():
+            editor.remove_index(apps.get_model('api', op.model_name), op.index)
+
+
+def create_indexes():
+    from django.apps import apps
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for op in index_operations():
+            editor.add_index(apps.get_model('api', op.model_name), op.index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def seed(users, scans_per_user, appointments, notes):
+    from django.utils import timezone
+    from api.models import CustomUser, DepressionScan, ClientInformation, Appointment, Note
+
+    now = timezone.now()
+    rng = random.Random(42)
+    batch = 2000
+
+    CustomUser.objects.bulk_create(
+        [CustomUser(username=f'bench{i}', email=f'bench{i}@mail.com', password='!') for i in range(users)],
+        batch_size=batch,
+    )
+    user_ids = list(CustomUser.objects.values_list('id', flat=True))
+
+    ClientInformation.objects.bulk_create(
+        [
+            ClientInformation(
+                user_id=uid, first_name='Bench', last_name='User', age=30, dob=date(1995, 1, 1),
+                email=f'bench{uid}@mail.com', mobile='9999999999', marital_status='Single',
+                address='Pune', pin_code='411001', state='MH', district='Pune',
+            )
+            for uid in user_ids
+        ],
+        batch_size=batch,
+    )
+
+    scans = []
+    for uid in user_ids:
+        for _ in range(scans_per_user):
+            answers = [rng.randint(0, 3) for _ in range(4)]
+            scans.append(DepressionScan(user_id=uid, q1=answers[0], q2=answers[1], q3=answers[2],
+                                        q4=answers[3], total_score=sum(answers)))
+    DepressionScan.objects.bulk_create(scans, batch_size=batch)
+
+    today = timezone.localdate()
+    Appointment.objects.bulk_create(
+        [
+            Appointment(
+                client_id=str(rng.choice(user_ids)), name='Bench',
+                date=today + timedelta(days=rng.randint(-180, 30)),
+                time=f'{rng.choice([10, 11, 12, 14, 17])}:00',
+                status=rng.choice(['Pending', 'Confirmed', 'Completed']),
+            )
+            for _ in range(appointments)
+        ],
+        batch_size=batch,
+    )
+    Note.objects.bulk_create(
+        [Note(title=f'Note {i}', content='...', tag=rng.choice(['General', 'Urgent', 'Follow-up']))
+         for i in range(notes)],
+        batch_size=batch,
+    )
+
+    # bulk_create मुळे सगळे created_at सारखे येतात, त्यामुळे पसरवून टाका
+    from django.db import connection
+    with connection.cursor() as cursor:
+        for table in ('api_depressionscan', 'api_clientinformation', 'api_appointment', 'api_note'):
+            cursor.execute(
+                f"UPDATE {table} SET created_at = datetime(%s, '-' || (abs(random()) %% 15552000) || ' seconds')",
+                [now.strftime('%Y-%m-%d %H:%M:%S')],
+            )
+        cursor.execute('ANALYZE')
+    return user_ids
+
+
+def hot_queries(user_ids):
+    from django.db.models import OuterRef, Subquery
+    from django.utils import timezone
+    from api.models import CustomUser, DepressionScan, ClientInformation, Appointment, Note
+
+    uid = user_ids[len(user_ids) // 2]
+    latest_scan = DepressionScan.objects.filter(user_id=OuterRef('user_id')).order_by('-created_at', '-id')
+    return {
+        'scans of one user': DepressionScan.objects.filter(user_id=uid).order_by('-created_at', '-id')[:50],
+        'latest scans page': DepressionScan.objects.order_by('-created_at', '-id')[:50],
+        'client info of one user': ClientInformation.objects.filter(user_id=uid).order_by('-created_at')[:1],
+        'client info page': ClientInformation.objects.order_by('-created_at', '-id')[:50],
+        'dashboard latest-scan join': ClientInformation.objects.annotate(
+            latest_score=Subquery(latest_scan.values('total_score')[:1])
+        ).order_by('-created_at', '-id')[:25],
+        'appointments page': Appointment.objects.order_by('-created_at', '-id')[:50],
+        "today's schedule": Appointment.objects.filter(date=timezone.localdate()).order_by('time'),
+        'notes page': Note.objects.order_by('-created_at', '-id')[:50],
+        'user by email': CustomUser.objects.filter(email=f'bench{uid}@mail.com'),
+    }
+
+
+def measure(label, user_ids, repeat):
+    from django.db import connection
+
+    print(f'\n=== {label} ===')
+    for name, queryset in hot_queries(user_ids).items():
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = [row[-1] for row in cursor.fetchall()]
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(f'{name:<28} median {timings[len(timings) // 2]:8.2f} ms')
+        for step in plan:
+            print(f'    {step}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--scans-per-user', type=int, default=5)
+    parser.add_argument('--appointments', type=int, default=50000)
+    parser.add_argument('--notes', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'bench.sqlite3'))
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        drop_indexes()
+        started = time.perf_counter()
+        user_ids = seed(args.users, args.scans_per_user, args.appointments, args.notes)
+        print(f'seeded in {time.perf_counter() - started:.1f}s')
+
+        measure('before: without hot-path indexes', user_ids, args.repeat)
+        create_indexes()
+        measure('after: ' + INDEX_MIGRATION.rsplit('.', 1)[-1], user_ids, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Localhost load test for the MindSpace API.
+
+By default it builds a throwaway SQLite database, fills it with
+`manage.py seed_data`, starts the app (threaded runserver or uvicorn) and
+drives a weighted mix of the real endpoints from api/urls.py with N
+concurrent keep-alive clients. Reports throughput and p50/p95/p99 latency
+per endpoint.
+
+    python benchmarks/load_test.py --users 5000 --concurrency 16 --duration 30
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --duration 10
+    python benchmarks/load_test.py --max-p95 250 --max-error-rate 0.01   # release gate
+
+Exits with status 1 when a --max-* gate is exceeded.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from harness import BASE_DIR, free_port, percentile, start_server
+
+
+# -------------------------------
+# Endpoint mix
+# -------------------------------
+# (name, weight, method, path(ctx, rng), body(ctx, rng) or None)
+def _scan_body(ctx, rng):
+    return {'user': rng.choice(ctx['user_ids']), **{f'q{n}': rng.randint(0, 3) for n in range(1, 5)}}
+
+
+def _appointment_body(ctx, rng):
+    return {
+        'client_id': str(rng.choice(ctx['user_ids'])), 'name': 'Load Test',
+        'date': (date.today() + timedelta(days=rng.randint(0, 30))).isoformat(),
+        'time': rng.choice(['10:00:00', '11:00:00', '12:00:00', '14:00:00', '17:00:00']),
+        'appointment_spec': 'Consultation',
+    }
+
+
+ENDPOINTS = [
+    ('GET counsellors', 10, 'GET', lambda c, r: '/api/counsellors/', None),
+    ('GET dashboard-summary', 5, 'GET', lambda c, r: '/api/dashboard-summary/', None),
+    ('GET dashboard-clients', 5, 'GET', lambda c, r: '/api/dashboard-clients/', None),
+    ('GET client-information', 4, 'GET', lambda c, r: '/api/client-information/', None),
+    ('GET client-information?user_id', 10, 'GET',
+     lambda c, r: f"/api/client-information/?user_id={r.choice(c['user_ids'])}", None),
+    ('GET depression-scan?user_id', 10, 'GET',
+     lambda c, r: f"/api/depression-scan/?user_id={r.choice(c['user_ids'])}", None),
+    ('POST depression-scan', 10, 'POST', lambda c, r: '/api/depression-scan/', _scan_body),
+    ('GET appointments?client_id', 10, 'GET',
+     lambda c, r: f"/api/appointments/?client_id={r.choice(c['user_ids'])}", None),
+    ('POST appointments', 5, 'POST', lambda c, r: '/api/appointments/', _appointment_body),
+    ('GET notes', 5, 'GET', lambda c, r: '/api/notes/', None),
+    ('POST notes', 3, 'POST', lambda c, r: '/api/notes/',
+     lambda c, r: {'title': 'Load test note', 'content': 'Generated by load_test.py', 'tag': 'General'}),
+    ('GET profile', 5, 'GET', lambda c, r: f"/api/profile/{r.choice(c['user_ids'])}/", None),
+    ('GET admin-users', 2, 'GET', lambda c, r: '/api/admin-users/', None),
+    # password hashing महाग आहे, त्यामुळे कमी weight
+    ('POST login', 1, 'POST', lambda c, r: '/api/login/',
+     lambda c, r: {'username': r.choice(c['usernames']), 'password': c['password']}),
+]
+
+
+# -------------------------------
+# Runner
+# -------------------------------
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name, seconds, ok):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+
+def discover(host, port):
+    """User ids/usernames for the request mix, via the API itself."""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    conn.request('GET', '/api/admin-users/?page_size=200')
+    response = conn.getresponse()
+    data = json.loads(response.read() or b'{}')
+    rows = data.get('results', data) if isinstance(data, dict) else data
+    if not rows:
+        raise SystemExit("No users found: seed the database first (manage.py seed_data).")
+    return {
+        'user_ids': [row['id'] for row in rows],
+        'usernames': [row['username'] for row in rows],
+    }
+
+
+def login(host, port, username, password):
+    """Token for the authenticated endpoints (notes), via /api/login/."""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    conn.request('POST', '/api/login/', json.dumps({'username': username, 'password': password}),
+                 {'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    data = json.loads(response.read() or b'{}')
+    conn.close()
+    if response.status != 200 or not data.get('token'):
+        raise SystemExit(f"Login as {username} failed ({response.status}): check --password.")
+    return data['token']
+
+
+def worker(host, port, ctx, recorder, deadline, remaining, seed):
+    rng = random.Random(seed)
+    weights = [endpoint[1] for endpoint in ENDPOINTS]
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    while time.perf_counter() < deadline:
+        if remaining is not None:
+            with remaining['lock']:
+                if remaining['count'] <= 0:
+                    break
+                remaining['count'] -= 1
+
+        name, _, method, path_for, body_for = rng.choices(ENDPOINTS, weights)[0]
+        body = json.dumps(body_for(ctx, rng)) if body_for else None
+        # token फक्त notes वापरतात; बाकीचे endpoints header कडे दुर्लक्ष करतात
+        headers = {'Authorization': f"Bearer {ctx['token']}"}
+        if body:
+            headers['Content-Type'] = 'application/json'
+        started = time.perf_counter()
+        try:
+            conn.request(method, path_for(ctx, rng), body, headers)
+            response = conn.getresponse()
+            response.read()
+            # ज्या users नी client form भरला नाही त्यांच्यासाठी 404 अपेक्षितच आहे
+            ok = response.status < 400 or (method == 'GET' and response.status == 404)
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            ok = False
+        recorder.record(name, time.perf_counter() - started, ok)
+    conn.close()
+
+
+def run_load(host, port, ctx, concurrency, duration, total_requests):
+    recorder = Recorder()
+    deadline = time.perf_counter() + (duration if duration else 10 ** 9)
+    remaining = {'count': total_requests, 'lock': threading.Lock()} if total_requests else None
+
+    threads = [
+        threading.Thread(target=worker, args=(host, port, ctx, recorder, deadline, remaining, n))
+        for n in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+
+def report(recorder, wall):
+    rows = []
+    for name, *_ in ENDPOINTS:
+        latencies = sorted(recorder.latencies.get(name, []))
+        if not latencies:
+            continue
+        rows.append({
+            'endpoint': name,
+            'requests': len(latencies),
+            'rps': len(latencies) / wall,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'errors': recorder.errors.get(name, 0),
+        })
+
+    print(f'{"endpoint":<34}{"reqs":>7}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"errors":>8}')
+    for row in rows:
+        print(f'{row["endpoint"]:<34}{row["requests"]:>7}{row["rps"]:>9.1f}{row["p50_ms"]:>9.1f}'
+              f'{row["p95_ms"]:>9.1f}{row["p99_ms"]:>9.1f}{row["errors"]:>8}')
+    total = sum(row['requests'] for row in rows)
+    errors = sum(row['errors'] for row in rows)
+    print(f'{"TOTAL":<34}{total:>7}{total / wall:>9.1f}{"":>27}{errors:>8}')
+    return rows
+
+
+def check_gates(rows, max_p95, max_error_rate):
+    failures = []
+    for row in rows:
+        if max_p95 is not None and row['p95_ms'] > max_p95:
+            failures.append(f"{row['endpoint']}: p95 {row['p95_ms']:.1f} ms > {max_p95} ms")
+        if max_error_rate is not None and row['errors'] / row['requests'] > max_error_rate:
+            failures.append(f"{row['endpoint']}: error rate {row['errors'] / row['requests']:.2%} > {max_error_rate:.2%}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help="Target an already running server instead of starting one.")
+    parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=15.0, help="Seconds to run (ignored with --requests).")
+    parser.add_argument('--requests', type=int, help="Stop after this many requests instead of a duration.")
+    parser.add_argument('--users', type=int, default=2000, help="seed_data --users for the throwaway database.")
+    parser.add_argument('--appointments', type=int, default=10000)
+    parser.add_argument('--notes', type=int, default=5000)
+    parser.add_argument('--password', default='mindspace123', help="Password of the seeded accounts.")
+    parser.add_argument('--max-p95', type=float, help="Fail if any endpoint's p95 (ms) exceeds this.")
+    parser.add_argument('--max-error-rate', type=float, help="Fail if any endpoint's error rate exceeds this (0-1).")
+    parser.add_argument('--json', help="Also write the per-endpoint results to this file.")
+    args = parser.parse_args()
+    duration = None if args.requests else args.duration
+
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            target = urlsplit(args.url)
+            host, port = target.hostname, target.port or 80
+        else:
+            env = {
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': 'backend_new.settings',
+                'MINDSPACE_DB_PATH': str(Path(tmp) / 'load.sqlite3'),
+                'MINDSPACE_SQLITE_PROFILE': 'production',
+            }
+            manage = [sys.executable, 'manage.py']
+            subprocess.run(manage + ['migrate', '-v0'], cwd=BASE_DIR, env=env, check=True)
+            subprocess.run(manage + ['seed_data', '--users', str(args.users), '--appointments',
+                                     str(args.appointments), '--notes', str(args.notes)],
+                           cwd=BASE_DIR, env=env, check=True)
+            host, port = '127.0.0.1', free_port()
+            server = start_server(args.server, port, env)
+
+        try:
+            ctx = {**discover(host, port), 'password': args.password}
+            ctx['token'] = login(host, port, ctx['usernames'][0], args.password)
+            recorder, wall = run_load(host, port, ctx, args.concurrency, duration, args.requests)
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+
+    print(f'\nserver={args.url or args.server} concurrency={args.concurrency} wall={wall:.1f}s')
+    rows = report(recorder, wall)
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+    failures = check_gates(rows, args.max_p95, args.max_error_rate)
+    for failure in failures:
+        print(f'GATE FAILED  {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
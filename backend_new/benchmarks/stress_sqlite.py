@@ -0,0 +1,179 @@
+"""
+Concurrent-writer stress test for the SQLite profiles.
+
+Spins up worker threads that submit depression scans, book appointments and
+save notes through the real API views against a throwaway SQLite file, while
+reader threads page through appointments. Reports write throughput and the
+"database is locked" error rate.
+
+    python benchmarks/stress_sqlite.py --profile production --writers 8
+    python benchmarks/stress_sqlite.py --compare
+
+db.sqlite3 is never touched.
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+PASSWORD = 'stress123'
+
+
+def setup_django(db_path, profile):
+    os.environ['MINDSPACE_SQLITE_PROFILE'] = profile
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_new.settings')
+    from django.conf import settings
+    import django
+
+    django.setup()
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.ALLOWED_HOSTS = ['*']
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ok = 0
+        self.locked = 0
+        self.other_errors = 0
+        self.reads = 0
+
+    def add(self, field):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+def login(username):
+    """Token from /api/login/, for the notes endpoint."""
+    from django.test import Client
+
+    response = Client().post('/api/login/', {'username': username, 'password': PASSWORD},
+                             content_type='application/json')
+    if response.status_code != 200:
+        raise SystemExit(f"Login as {username} failed ({response.status_code})")
+    return response.json()['token']
+
+
+def writer(user_ids, token, ops, stats, seed):
+    from django.db import OperationalError, connections
+    from django.test import Client
+
+    rng = random.Random(seed)
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+    try:
+        for i in range(ops):
+            uid = rng.choice(user_ids)
+            kind = rng.random()
+            try:
+                if kind < 0.5:
+                    answers = {f'q{n}': rng.randint(0, 3) for n in range(1, 5)}
+                    response = client.post('/api/depression-scan/', {'user': uid, **answers},
+                                           content_type='application/json')
+                elif kind < 0.75:
+                    response = client.post('/api/appointments/', {
+                        'client_id': str(uid), 'name': 'Stress', 'date': '2026-01-15',
+                        'time': rng.choice(['10:00:00', '11:00:00', '14:00:00']),
+                    }, content_type='application/json')
+                else:
+                    response = client.post('/api/notes/', {
+                        'title': f'Stress {seed}-{i}', 'content': '...', 'tag': 'General',
+                    }, content_type='application/json')
+            except OperationalError as exc:
+                stats.add('locked' if 'locked' in str(exc) else 'other_errors')
+                continue
+            stats.add('ok' if response.status_code < 400 else 'other_errors')
+    finally:
+        connections.close_all()
+
+
+def reader(stop, stats):
+    from django.db import OperationalError, connections
+    from django.test import Client
+
+    client = Client()
+    try:
+        while not stop.is_set():
+            try:
+                client.get('/api/appointments/')
+                stats.add('reads')
+            except OperationalError as exc:
+                stats.add('locked' if 'locked' in str(exc) else 'other_errors')
+    finally:
+        connections.close_all()
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'stress.sqlite3'), args.profile)
+        from django.contrib.auth.hashers import make_password
+        from django.core.management import call_command
+        from django.db import connection, connections
+        from api.models import CustomUser
+
+        call_command('migrate', verbosity=0)
+        # hash एकदाच: प्रत्येक user साठी PBKDF2 खूप वेळ घेतो
+        password = make_password(PASSWORD)
+        CustomUser.objects.bulk_create(
+            [CustomUser(username=f'stress{i}', email=f'stress{i}@mail.com', password=password) for i in range(args.users)]
+        )
+        user_ids = list(CustomUser.objects.values_list('id', flat=True))
+        # notes ला login लागतो: प्रत्येक writer एका user म्हणून, timing सुरू होण्याआधी
+        tokens = [login(f'stress{n % args.users}') for n in range(args.writers)]
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        connections.close_all()
+
+        stats = Stats()
+        stop = threading.Event()
+        readers = [threading.Thread(target=reader, args=(stop, stats)) for _ in range(args.readers)]
+        writers = [threading.Thread(target=writer, args=(user_ids, tokens[n], args.ops, stats, n)) for n in range(args.writers)]
+
+        started = time.perf_counter()
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        attempted = args.writers * args.ops
+        print(f'profile={args.profile} journal_mode={journal_mode} writers={args.writers} readers={args.readers}')
+        print(f'  writes ok      {stats.ok}/{attempted}')
+        print(f'  throughput     {stats.ok / elapsed:8.1f} writes/s ({stats.reads / elapsed:.1f} reads/s)')
+        print(f'  lock errors    {stats.locked} ({100 * stats.locked / attempted:.1f}%)')
+        print(f'  other errors   {stats.other_errors}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', choices=['default', 'production'], default='production')
+    parser.add_argument('--compare', action='store_true', help="Run the default and production profiles back to back.")
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--ops', type=int, default=100, help="Writes per writer thread.")
+    parser.add_argument('--users', type=int, default=200)
+    args = parser.parse_args()
+
+    if args.compare:
+        # settings profile import वेळीच ठरतो, म्हणून प्रत्येक profile वेगळ्या process मध्ये
+        base = [sys.executable, __file__, '--writers', str(args.writers), '--readers', str(args.readers),
+                '--ops', str(args.ops), '--users', str(args.users)]
+        for profile in ('default', 'production'):
+            subprocess.run(base + ['--profile', profile], check=True)
+        return
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
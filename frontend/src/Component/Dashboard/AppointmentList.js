@@ -20,7 +20,7 @@ const AppointmentList = () => {
     try {
       const response = await fetch('http://127.0.0.1:8000/api/appointments/');
       const data = await response.json();
-      setAppointments(Array.isArray(data) ? data : []);
+      setAppointments(Array.isArray(data) ? data : (data.results || []));
     } catch (err) {
       console.error("Error fetching appointments:", err);
     } finally {
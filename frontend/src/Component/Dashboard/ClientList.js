@@ -25,7 +25,7 @@ const ClientList = () => {
         }
       });
       const data = await response.json();
-      setUsers(Array.isArray(data) ? data : []);
+      setUsers(Array.isArray(data) ? data : (data.results || []));
     } catch (err) {
       console.error("Error:", err);
     } finally {
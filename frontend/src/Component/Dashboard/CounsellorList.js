@@ -23,7 +23,7 @@ const CounsellorList = () => {
         headers: { 'Authorization': `Bearer ${token}` }
       });
       const data = await response.json();
-      setCounsellors(Array.isArray(data) ? data : []);
+      setCounsellors(Array.isArray(data) ? data : (data.results || []));
     } catch (err) {
       console.error("Error:", err);
     } finally {
@@ -32,55 +32,36 @@ const MindSpaceDashboard = () => {
     const token = localStorage.getItem('access_token');
     try {
       const headers = { 'Authorization': `Bearer ${token}`, 'Accept': 'application/json' };
-      const [clientsRes, scansRes, counsellorsRes, appointmentsRes] = await Promise.all([
-        fetch('http://127.0.0.1:8000/api/client-information/', { headers }),
-        fetch('http://127.0.0.1:8000/api/depression-scan/', { headers }),
-        fetch('http://127.0.0.1:8000/api/counsellors/', { headers }),
-        fetch('http://127.0.0.1:8000/api/appointments/', { headers })
-      ]);
-
-      const infoData = await clientsRes.json();
-      const scansData = await scansRes.json();
-      const counsellorsData = await counsellorsRes.json();
-      const appointmentsData = await appointmentsRes.json();
+      // ✅ बॅकएंडकडून आधीच merge केलेला डेटा (client + latest scan)
+      const res = await fetch('http://127.0.0.1:8000/api/dashboard-clients/', { headers });
+      const data = await res.json();
+      const rows = Array.isArray(data.results) ? data.results : [];
 
-      // डेटा मॅपिंग आणि मर्चिंग
-      const integrated = infoData.map((client, index) => {
-        const scan = scansData.find(s => s.user === client.user);
-        return {
-          ...client,
-          id_no: `MS-${1000 + (client.id || index)}`,
-          score: scan ? Math.round((scan.total_score / 12) * 100) : 0,
-          label: scan ? scan.result : 'Normal',
-          status: scan ? 'Analyzed' : 'Pending',
-          date: scan ? new Date(scan.created_at).toLocaleDateString('en-IN', {month: 'short', day: 'numeric'}) : 'N/A'
-        };
-      });
+      const integrated = rows.map((client, index) => ({
+        ...client,
+        id_no: `MS-${1000 + (client.id || index)}`,
+        score: client.percentage || 0,
+        date: client.latest_scan_at ? new Date(client.latest_scan_at).toLocaleDateString('en-IN', {month: 'short', day: 'numeric'}) : 'N/A'
+      }));
 
+      // टेबल आणि trend फक्त या page च्या rows वरून
       setMergedClients(integrated);
       setAnalyticsData(integrated.slice(0, 7).reverse());
 
-      // Pie Chart कॅल्क्युलेशन
-      const severityCounts = {
-        Severe: integrated.filter(c => c.score >= 70).length,
-        Moderate: integrated.filter(c => c.score >= 40 && c.score < 70).length,
-        Healthy: integrated.filter(c => c.score < 40).length,
-      };
+      // Pie Chart: सर्व clients चे counts server वर मोजलेले (फक्त पहिल्या page चे नाही)
+      const summary = data.stats || {};
+      const severityCounts = summary.severity || {};
 
       setPieData([
-        { name: 'Severe', value: severityCounts.Severe, color: '#ef4444' },
-        { name: 'Moderate', value: severityCounts.Moderate, color: '#f59e0b' },
-        { name: 'Healthy', value: severityCounts.Healthy, color: '#10b981' },
+        { name: 'Severe', value: severityCounts.Severe || 0, color: '#ef4444' },
+        { name: 'Moderate', value: severityCounts.Moderate || 0, color: '#f59e0b' },
+        { name: 'Healthy', value: severityCounts.Healthy || 0, color: '#10b981' },
       ]);
 
-      // ✅ आजच्या तारखेनुसार अपॉइंटमेंट फिल्टर करणे
-      const todayStr = new Date().toISOString().split('T')[0]; // YYYY-MM-DD फॉरमॅट
-      const todayAppsCount = appointmentsData.filter(app => app.date === todayStr).length;
-
       setStats({
-        total_counsellors: Array.isArray(counsellorsData) ? counsellorsData.length : 0,
-        total_clients: infoData.length || 0,
-        today_appointments: todayAppsCount, // आता इथे फक्त आजची संख्या दिसेल
+        total_counsellors: summary.counsellors || 0,
+        total_clients: summary.clients || 0,
+        today_appointments: summary.today_appointments || 0,
       });
     } catch (e) {
       console.error("Fetch Error:", e);
@@ -2,8 +2,16 @@ import React, { useState, useEffect } from 'react';
 // Trash2 आयकॉन आता खाली वापरला आहे, त्यामुळे वॉर्निंग येणार नाही
 import { Trash2, Plus, Loader2 } from 'lucide-react';
 
+// नोट्स खाजगी: server login केलेल्या user च्याच नोट्स देतो. admin-login/ ने दिलेला token
+// (CounsellorAuth.js तो access_token म्हणून ठेवतो) प्रत्येक request सोबत पाठवा
+const authOptions = () => ({
+    headers: { 'Authorization': `Bearer ${localStorage.getItem('access_token')}` },
+});
+
 const TaskSession = () => {
     const [notes, setNotes] = useState([]);
+    const [facets, setFacets] = useState({ total: 0, tags: [] });
+    const [activeTag, setActiveTag] = useState(null);
     const [loading, setLoading] = useState(true);
     const [showForm, setShowForm] = useState(false);
 
@@ -11,16 +19,28 @@ const TaskSession = () => {
     const [title, setTitle] = useState("");
     const [content, setContent] = useState("");
 
+    // Search: server-side FTS, results मधले highlight HTML server ने escape केलेले असतात
+    const [query, setQuery] = useState("");
+    const [results, setResults] = useState(null);
+    // server ने फक्त नवीन matches rank केले: जुन्या नोट्ससाठी search अजून नेमका करायला सांगा
+    const [truncated, setTruncated] = useState(false);
+
     // १. बॅकएंडवरून नोट्स मिळवणे
     useEffect(() => {
-        fetchNotes();
+        fetchNotes(activeTag);
+    }, [activeTag]);
+
+    useEffect(() => {
+        fetchFacets();
     }, []);
 
-    const fetchNotes = async () => {
+    const fetchNotes = async (tag) => {
+        const params = new URLSearchParams();
+        if (tag) params.set('tag', tag);
         try {
-            const response = await fetch('http://127.0.0.1:8000/api/notes/');
+            const response = await fetch(`http://127.0.0.1:8000/api/notes/?${params}`, authOptions());
             const data = await response.json();
-            setNotes(Array.isArray(data) ? data : []);
+            setNotes(Array.isArray(data) ? data : (data.results || []));
         } catch (err) {
             console.error("Error fetching notes:", err);
         } finally {
@@ -28,6 +48,44 @@ const TaskSession = () => {
         }
     };
 
+    // tag नुसार counts: server वर एकच GROUP BY
+    const fetchFacets = async () => {
+        try {
+            const response = await fetch('http://127.0.0.1:8000/api/notes/facets/', authOptions());
+            if (response.ok) setFacets(await response.json());
+        } catch (err) {
+            console.error("Error fetching tag counts:", err);
+        }
+    };
+
+    // टायपिंग थांबल्यावर 250ms नी search
+    useEffect(() => {
+        if (!query.trim()) {
+            setResults(null);
+            setTruncated(false);
+            return;
+        }
+        const controller = new AbortController();
+        const timer = setTimeout(async () => {
+            try {
+                const response = await fetch(`http://127.0.0.1:8000/api/notes/search/?q=${encodeURIComponent(query)}`, { ...authOptions(), signal: controller.signal });
+                if (response.ok) {
+                    const data = await response.json();
+                    setResults(data.results || []);
+                    setTruncated(Boolean(data.truncated));
+                }
+            } catch (err) {
+                if (err.name !== 'AbortError') console.error("Search failed:", err);
+            }
+        }, 250);
+        return () => {
+            clearTimeout(timer);
+            controller.abort();
+        };
+    }, [query]);
+
+    const shownNotes = results || notes;
+
     // २. नवीन नोट बॅकएंडला सेव्ह करणे
     const handleSaveNote = async () => {
         if (!title || !content) {
@@ -36,9 +94,11 @@ const TaskSession = () => {
         }
 
         try {
+            const options = authOptions();
             const response = await fetch('http://127.0.0.1:8000/api/notes/', {
+                ...options,
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { ...options.headers, 'Content-Type': 'application/json' },
                 body: JSON.stringify({ title, content })
             });
 
@@ -46,7 +106,8 @@ const TaskSession = () => {
                 setTitle("");
                 setContent("");
                 setShowForm(false);
-                fetchNotes();
+                fetchNotes(activeTag);
+                fetchFacets();
             }
         } catch (err) {
             console.error("Failed to save note:", err);
@@ -58,10 +119,13 @@ const TaskSession = () => {
         if (!window.confirm("Are you sure you want to delete this note?")) return;
         try {
             const response = await fetch(`http://127.0.0.1:8000/api/notes/${id}/`, {
+                ...authOptions(),
                 method: 'DELETE'
             });
             if (response.ok) {
                 setNotes(notes.filter(n => n.id !== id));
+                if (results) setResults(results.filter(n => n.id !== id));
+                fetchFacets();
             }
         } catch (err) {
             console.error("Delete failed:", err);
@@ -79,7 +143,7 @@ const TaskSession = () => {
                 <div className="stat-card" style={statCardStyle}>
                     <div className="stat-content">
                         <p className="stat-title" style={{ margin: 0, color: '#64748B' }}>Total Notes</p>
-                        <p className="stat-number" style={{ fontSize: '24px', fontWeight: '800', margin: 0 }}>{notes.length}</p>
+                        <p className="stat-number" style={{ fontSize: '24px', fontWeight: '800', margin: 0 }}>{facets.total}</p>
                     </div>
                     <div className="stat-icon" style={{ ...iconCircle, background: 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)' }}>
                         <Plus size={20} color="white" />
@@ -104,6 +168,28 @@ const TaskSession = () => {
                     </button>
                 </div>
 
+                <input
+                    type="search"
+                    placeholder="Search notes..."
+                    style={{ ...inputStyle, marginBottom: '20px' }}
+                    value={query}
+                    onChange={(e) => setQuery(e.target.value)}
+                />
+                {results && truncated && (
+                    <p style={{ color: '#94A3B8', fontSize: '13px', marginTop: '-12px', marginBottom: '20px' }}>
+                        Showing best matches among your most recent notes. Add more words to find older ones.
+                    </p>
+                )}
+
+                <div style={{ display: 'flex', flexWrap: 'wrap', gap: '8px', marginBottom: '20px' }}>
+                    <button onClick={() => setActiveTag(null)} style={activeTag ? chipStyle : activeChipStyle}>All ({facets.total})</button>
+                    {facets.tags.map(({ tag, count }) => (
+                        <button key={tag} onClick={() => setActiveTag(tag)} style={activeTag === tag ? activeChipStyle : chipStyle}>
+                            {tag} ({count})
+                        </button>
+                    ))}
+                </div>
+
                 {showForm && (
                     <div className="add-note-form" style={{ marginBottom: '30px', padding: '20px', background: '#F8FAFC', borderRadius: '15px', border: '1px solid #E2E8F0' }}>
                         <input
@@ -131,10 +217,14 @@ const TaskSession = () => {
                     <div style={{ textAlign: 'center', padding: '40px' }}><Loader2 className="animate-spin" size={32} color="#6366F1" /></div>
                 ) : (
                     <div className="notes-grid" style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fill, minmax(300px, 1fr))', gap: '20px' }}>
-                        {notes.map((note) => (
+                        {shownNotes.map((note) => (
                             <div key={note.id} style={noteCardStyle}>
                                 <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'flex-start' }}>
-                                    <h3 style={{ margin: 0, fontSize: '18px', color: '#1E293B', fontWeight: '700' }}>{note.title}</h3>
+                                    {note.title_highlight ? (
+                                        <h3 style={{ margin: 0, fontSize: '18px', color: '#1E293B', fontWeight: '700' }} dangerouslySetInnerHTML={{ __html: note.title_highlight }} />
+                                    ) : (
+                                        <h3 style={{ margin: 0, fontSize: '18px', color: '#1E293B', fontWeight: '700' }}>{note.title}</h3>
+                                    )}
                                     {/* इथे आता Trash2 आयकॉन वापरला आहे */}
                                     <button
                                         onClick={() => handleDelete(note.id)}
@@ -145,21 +235,25 @@ const TaskSession = () => {
                                         <Trash2 size={18} />
                                     </button>
                                 </div>
-                                <p style={{ color: '#475569', fontSize: '14px', margin: '15px 0', lineHeight: '1.6' }}>{note.content}</p>
+                                {note.snippet ? (
+                                    <p style={{ color: '#475569', fontSize: '14px', margin: '15px 0', lineHeight: '1.6' }} dangerouslySetInnerHTML={{ __html: note.snippet }} />
+                                ) : (
+                                    <p style={{ color: '#475569', fontSize: '14px', margin: '15px 0', lineHeight: '1.6' }}>{note.content}</p>
+                                )}
                                 <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginTop: 'auto', paddingTop: '15px', borderTop: '1px solid #F1F5F9' }}>
                                     <span style={{ fontSize: '12px', color: '#94A3B8', fontWeight: '500' }}>
                                         {note.created_at ? new Date(note.created_at).toLocaleDateString('en-IN', { day: 'numeric', month: 'short', year: 'numeric' }) : 'Today'}
                                     </span>
-                                    <span style={tagStyle}>Note</span>
+                                    <span style={tagStyle}>{note.tag || 'Note'}</span>
                                 </div>
                             </div>
                         ))}
                     </div>
                 )}
 
-                {!loading && notes.length === 0 && (
+                {!loading && shownNotes.length === 0 && (
                     <div style={{ textAlign: 'center', padding: '60px' }}>
-                        <p style={{ color: '#94A3B8', fontSize: '16px' }}>No notes found. Click '+ Add New Note' to start.</p>
+                        <p style={{ color: '#94A3B8', fontSize: '16px' }}>{results ? 'No matching notes.' : "No notes found. Click '+ Add New Note' to start."}</p>
                     </div>
                 )}
             </div>
@@ -174,5 +268,7 @@ const btnStyle = { padding: '10px 22px', borderRadius: '12px', border: 'none', b
 const inputStyle = { width: '100%', padding: '14px', borderRadius: '12px', border: '1px solid #E2E8F0', outline: 'none', boxSizing: 'border-box', fontSize: '14px', transition: '0.2s' };
 const noteCardStyle = { background: '#fff', padding: '20px', borderRadius: '20px', border: '1px solid #E2E8F0', display: 'flex', flexDirection: 'column', transition: 'all 0.3s ease', boxShadow: '0 2px 8px rgba(0,0,0,0.02)' };
 const tagStyle = { backgroundColor: '#EEF2FF', padding: '4px 12px', borderRadius: '8px', fontSize: '10px', fontWeight: '800', color: '#4F46E5', textTransform: 'uppercase', letterSpacing: '0.5px' };
+const chipStyle = { padding: '6px 14px', borderRadius: '999px', border: '1px solid #E2E8F0', background: '#fff', color: '#475569', fontSize: '12px', fontWeight: '600', cursor: 'pointer' };
+const activeChipStyle = { ...chipStyle, background: '#6366F1', borderColor: '#6366F1', color: '#fff' };
 
 export default TaskSession;
\ No newline at end of file
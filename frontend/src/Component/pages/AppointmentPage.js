@@ -14,8 +14,10 @@ const AppointmentPage = () => {
   const [loadingDoctors, setLoadingDoctors] = useState(true);
 
   const [appointmentData, setAppointmentData] = useState({
-    name: '', date: '', time: '', reason: ''
+    counsellor: '', name: '', date: '', time: '', reason: ''
   });
+  // backend ने दिलेले मोकळे slots (null = अजून counsellor/date निवडले नाहीत)
+  const [freeSlots, setFreeSlots] = useState(null);
 
   useEffect(() => {
     const fetchCounsellors = async () => {
@@ -25,8 +27,9 @@ const AppointmentPage = () => {
           headers: { 'Authorization': `Bearer ${token}` }
         });
         const data = await response.json();
-        if (Array.isArray(data)) {
-          setDoctors(data);
+        const list = Array.isArray(data) ? data : data.results;
+        if (Array.isArray(list)) {
+          setDoctors(list);
         } else {
           console.error("Data is not an array:", data);
         }
@@ -40,6 +43,24 @@ const AppointmentPage = () => {
     fetchCounsellors();
   }, []);
 
+  useEffect(() => {
+    const { counsellor, date } = appointmentData;
+    if (!counsellor || !date) {
+      setFreeSlots(null);
+      return;
+    }
+    const token = localStorage.getItem('access_token');
+    fetch(`http://127.0.0.1:8000/api/counsellors/${counsellor}/free-slots/?date_from=${date}&date_to=${date}`, {
+      headers: { 'Authorization': `Bearer ${token}` }
+    })
+      .then((response) => response.json())
+      .then((data) => setFreeSlots(data.days && data.days.length ? data.days[0].slots : []))
+      .catch((error) => {
+        console.error("Error loading free slots:", error);
+        setFreeSlots(null);
+      });
+  }, [appointmentData.counsellor, appointmentData.date]);
+
   const timeSlots = [
     { label: "10:00 AM", value: "10:00:00" },
     { label: "11:00 AM", value: "11:00:00" },
@@ -57,6 +78,7 @@ const AppointmentPage = () => {
 
     const payload = {
       client_id: clientId,
+      counsellor: appointmentData.counsellor,
       name: appointmentData.name,
       date: appointmentData.date,
       time: appointmentData.time,
@@ -75,6 +97,8 @@ const AppointmentPage = () => {
       if (response.ok) {
         setBooked(true);
         setTimeout(() => navigate('/dashboard'), 2000);
+      } else if (response.status === 409) {
+        throw new Error("हा slot आत्ताच बुक झाला आहे, दुसरा निवडा.");
       } else {
         throw new Error("माहिती भरताना काहीतरी चूक झाली.");
       }
@@ -125,14 +149,17 @@ const AppointmentPage = () => {
             <select
               required
               className="styled-input"
-              value={appointmentData.name}
-              onChange={(e) => setAppointmentData({...appointmentData, name: e.target.value})}
+              value={appointmentData.counsellor}
+              onChange={(e) => {
+                const doctor = doctors.find(d => String(d.id) === e.target.value);
+                setAppointmentData({...appointmentData, counsellor: e.target.value, name: doctor ? doctor.name : '', time: ''});
+              }}
               disabled={loadingDoctors}
             >
               <option value="">{loadingDoctors ? "Loading..." : "Select a Doctor"}</option>
               {doctors.map(d => (
-                <option key={d.id} value={`${d.first_name} ${d.last_name}`}>
-                  Dr. {d.first_name} {d.last_name} {d.specialization ? `(${d.specialization})` : ""}
+                <option key={d.id} value={d.id}>
+                  {d.name} {d.specialization ? `(${d.specialization})` : ""}
                 </option>
               ))}
             </select>
@@ -143,7 +170,7 @@ const AppointmentPage = () => {
             <input
               type="date" required className="styled-input"
               min={new Date().toISOString().split('T')[0]}
-              onChange={(e) => setAppointmentData({...appointmentData, date: e.target.value})}
+              onChange={(e) => setAppointmentData({...appointmentData, date: e.target.value, time: ''})}
             />
           </div>
 
@@ -153,6 +180,7 @@ const AppointmentPage = () => {
               {timeSlots.map((slot) => (
                 <button
                   key={slot.value} type="button"
+                  disabled={freeSlots !== null && !freeSlots.includes(slot.value)}
                   className={`slot-pill ${appointmentData.time === slot.value ? 'selected' : ''}`}
                   onClick={() => setAppointmentData({...appointmentData, time: slot.value})}
                 >
@@ -290,6 +318,7 @@ const AppointmentPage = () => {
         }
 
         .slot-pill:hover { border-color: #cbd5e1; }
+        .slot-pill:disabled { opacity: 0.4; cursor: not-allowed; text-decoration: line-through; }
 
         .slot-pill.selected {
           background: #6366f1;
@@ -38,7 +38,7 @@ const History = () => {
         fetch(`http://127.0.0.1:8000/api/client-information/?user_id=${userId}`, {
           headers: { 'Authorization': `Bearer ${token}` }
         }),
-        fetch(`http://127.0.0.1:8000/api/appointments/?user=${userId}`, {
+        fetch(`http://127.0.0.1:8000/api/appointments/?client_id=${userId}`, {
           headers: { 'Authorization': `Bearer ${token}` }
         })
       ]);
@@ -48,7 +48,7 @@ const History = () => {
 
       // डेटा व्यवस्थित सेट करणे
       setTestHistory(Array.isArray(testData) ? testData : (testData.id ? [testData] : []));
-      setAppointmentHistory(Array.isArray(appData) ? appData : []);
+      setAppointmentHistory(Array.isArray(appData) ? appData : (appData.results || []));
     } catch (error) {
       console.error("Error fetching history:", error);
     } finally {
@@ -41,7 +41,8 @@ const Profile = () => {
         email: data.email || '',
         phone: data.phone || '',
         location: data.location || '',
-        profile_image: data.profile_image || null,
+        // thumbnail तयार झाला असेल तर तोच (original पेक्षा खूप लहान)
+        profile_image: data.profile_thumbnails?.['256'] || data.profile_image || null,
         date_joined: data.date_joined || ''
       });
     } catch (error) {